@@ -0,0 +1,181 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+Performance benchmarks for the netaddr library.
+
+Run them from the command line with ``python -m netaddr.benchmarks``
+(use ``--help`` for options), or call `run_benchmarks` directly.
+Results can be saved as JSON and compared against earlier runs.
+"""
+import gc as _gc
+import json as _json
+import platform as _platform
+import random as _random
+import time as _time
+
+import netaddr
+from netaddr.benchmarks.suite import BENCHMARKS
+
+try:
+    import tracemalloc as _tracemalloc
+except ImportError:
+    #   Python < 3.4.
+    _tracemalloc = None
+
+try:
+    _timer = _time.perf_counter
+except AttributeError:
+    #   Python < 3.3.
+    _timer = _time.time
+
+#: Dataset sizes available, smallest first.
+SCALES = (1000, 10000, 100000, 1000000, 10000000)
+
+#: The version of the JSON result format.
+RESULT_FORMAT = 1
+
+
+def _measure_time(run, repeat):
+    best = None
+    gc_enabled = _gc.isenabled()
+    _gc.disable()
+    try:
+        for _ in range(repeat):
+            start = _timer()
+            run()
+            elapsed = _timer() - start
+            if best is None or elapsed < best:
+                best = elapsed
+    finally:
+        if gc_enabled:
+            _gc.enable()
+    return best
+
+
+def _measure_memory(run):
+    _tracemalloc.start()
+    try:
+        run()
+        return _tracemalloc.get_traced_memory()[1]
+    finally:
+        _tracemalloc.stop()
+
+
+def run_benchmarks(names=None, scales=(1000, 10000), repeat=3, memory=True,
+        seed=0, report=None):
+    """
+    Runs benchmarks at one or more scales.
+
+    :param names: (optional) the names of the benchmarks to run.
+        Default: all of them.
+
+    :param scales: (optional) the numbers of items to process.
+
+    :param repeat: (optional) the number of timed runs per benchmark, of
+        which the fastest is reported.
+
+    :param memory: (optional) if ``True``, run each benchmark once more
+        to record the peak memory allocated, where supported (Python 3.4+).
+
+    :param seed: (optional) the random seed used to build datasets.
+
+    :param report: (optional) a callable invoked with each result as it
+        becomes available.
+
+    :return: a dictionary holding the results and details of the
+        environment, suitable for saving as JSON.
+    """
+    selected = BENCHMARKS
+    if names is not None:
+        known = dict(BENCHMARKS)
+        for name in names:
+            if name not in known:
+                raise ValueError('unknown benchmark %r!' % name)
+        selected = [(name, func) for (name, func) in BENCHMARKS
+            if name in names]
+
+    results = []
+    for scale in scales:
+        for name, func in selected:
+            run, ops = func(_random.Random('%s-%d-%d' % (name, scale, seed)),
+                scale)
+            seconds = _measure_time(run, repeat)
+            peak_memory = None
+            if memory and _tracemalloc is not None:
+                peak_memory = _measure_memory(run)
+            result = {
+                'name': name,
+                'scale': scale,
+                'ops': ops,
+                'seconds': seconds,
+                'ops_per_sec': seconds and ops / seconds or None,
+                'peak_memory_bytes': peak_memory,
+            }
+            results.append(result)
+            if report is not None:
+                report(result)
+
+    return {
+        'format': RESULT_FORMAT,
+        'netaddr_version': netaddr.__version__,
+        'python': _platform.python_version(),
+        'implementation': _platform.python_implementation(),
+        'platform': _platform.platform(),
+        'timestamp': _time.strftime('%Y-%m-%dT%H:%M:%SZ', _time.gmtime()),
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def save_results(results, path):
+    """Writes results returned by `run_benchmarks` to a JSON file."""
+    fh = open(path, 'w')
+    try:
+        _json.dump(results, fh, indent=2, sort_keys=True)
+    finally:
+        fh.close()
+
+
+def load_results(path):
+    """:return: results previously saved with `save_results`."""
+    fh = open(path)
+    try:
+        return _json.load(fh)
+    finally:
+        fh.close()
+
+
+def compare_results(baseline, current):
+    """
+    Compares two sets of results returned by `run_benchmarks`.
+
+    :return: a list of (name, scale, baseline ops/sec, current ops/sec,
+        speedup) tuples for each benchmark found in both. A speedup above 1
+        means the current run is faster.
+    """
+    previous = {}
+    for result in baseline['results']:
+        previous[result['name'], result['scale']] = result
+
+    comparison = []
+    for result in current['results']:
+        old = previous.get((result['name'], result['scale']))
+        if old is None or not old['ops_per_sec'] or not result['ops_per_sec']:
+            continue
+        comparison.append((result['name'], result['scale'],
+            old['ops_per_sec'], result['ops_per_sec'],
+            result['ops_per_sec'] / old['ops_per_sec']))
+    return comparison
+
+
+def format_result(result):
+    """:return: a one line, human readable summary of a result."""
+    line = '%-24s %10d %14.1f ops/s' % (result['name'], result['scale'],
+        result['ops_per_sec'] or 0)
+    if result['peak_memory_bytes'] is not None:
+        line += ' %10.1f KiB peak' % (result['peak_memory_bytes'] / 1024.0)
+    return line
@@ -0,0 +1,67 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""Command line interface for the netaddr benchmarks."""
+import sys
+from optparse import OptionParser
+
+from netaddr.benchmarks import (BENCHMARKS, SCALES, run_benchmarks,
+    save_results, load_results, compare_results, format_result)
+
+
+def main(argv=None):
+    parser = OptionParser(usage='python -m netaddr.benchmarks [options] '
+        '[benchmark ...]')
+    parser.add_option('-s', '--scales', default='1000,10000',
+        help='comma separated dataset sizes (available: %s)'
+            % ','.join([str(scale) for scale in SCALES]))
+    parser.add_option('-r', '--repeat', type='int', default=3,
+        help='timed runs per benchmark, the fastest is reported')
+    parser.add_option('--seed', type='int', default=0,
+        help='random seed used to build datasets')
+    parser.add_option('--no-memory', action='store_false', dest='memory',
+        default=True, help='skip peak memory measurements')
+    parser.add_option('-o', '--output', help='save results as JSON')
+    parser.add_option('-c', '--compare',
+        help='compare with results saved in a JSON file')
+    parser.add_option('-l', '--list', action='store_true',
+        help='list the available benchmarks and exit')
+    options, names = parser.parse_args(argv)
+
+    if options.list:
+        for name, func in BENCHMARKS:
+            sys.stdout.write('%s\n' % name)
+        return 0
+
+    try:
+        scales = [int(scale) for scale in options.scales.split(',')]
+    except ValueError:
+        parser.error('invalid scales %r' % options.scales)
+
+    def report(result):
+        sys.stdout.write('%s\n' % format_result(result))
+        sys.stdout.flush()
+
+    try:
+        results = run_benchmarks(names or None, scales, options.repeat,
+            options.memory, options.seed, report)
+    except ValueError:
+        parser.error(str(sys.exc_info()[1]))
+
+    if options.output:
+        save_results(results, options.output)
+
+    if options.compare:
+        sys.stdout.write('\n%-24s %10s %14s %14s %8s\n' % ('benchmark',
+            'scale', 'baseline', 'current', 'speedup'))
+        for name, scale, old, new, speedup in compare_results(
+                load_results(options.compare), results):
+            sys.stdout.write('%-24s %10d %14.1f %14.1f %7.2fx\n'
+                % (name, scale, old, new, speedup))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+Reproducible synthetic datasets for benchmarks.
+
+Every function takes a ``random.Random`` instance so the same seed always
+produces the same data.
+"""
+from netaddr.compat import _iter_range
+from netaddr.strategy import ipv4 as _ipv4, ipv6 as _ipv6
+from netaddr.eui import ieee as _ieee
+
+
+def ipv4_ints(rng, count):
+    """:return: a list of random IPv4 addresses as integers."""
+    return [rng.randrange(_ipv4.max_int + 1) for _ in _iter_range(count)]
+
+
+def ipv6_ints(rng, count):
+    """:return: a list of random IPv6 addresses as integers."""
+    return [rng.randrange(_ipv6.max_int + 1) for _ in _iter_range(count)]
+
+
+def ipv4_strings(rng, count):
+    """:return: a list of random IPv4 addresses in dotted decimal form."""
+    return [_ipv4.int_to_str(value) for value in ipv4_ints(rng, count)]
+
+
+def ipv6_strings(rng, count):
+    """
+    :return: a list of random IPv6 addresses in compact form. Most have
+        runs of zero words so that '::' compression is exercised.
+    """
+    strings = []
+    for _ in _iter_range(count):
+        value = 0x20010db8 << 96 | rng.randrange(1 << 16) << 64 \
+            | rng.randrange(1 << 16)
+        if rng.random() < 0.25:
+            value = rng.randrange(_ipv6.max_int + 1)
+        strings.append(_ipv6.int_to_str(value))
+    return strings
+
+
+def cidr_strings(rng, count, version=4, min_prefixlen=16):
+    """
+    :return: a list of random subnets in CIDR form. Subnets are clustered
+        within a few supernets so that many of them overlap or are adjacent,
+        as with real world routing tables and access lists.
+    """
+    module = _ipv4 if version == 4 else _ipv6
+    width = module.width
+    cluster_bits = width - min_prefixlen
+    clusters = [rng.randrange(1 << min_prefixlen) << cluster_bits
+        for _ in _iter_range(8)]
+    strings = []
+    for _ in _iter_range(count):
+        prefixlen = rng.randint(min_prefixlen + 4, width)
+        hostbits = width - prefixlen
+        value = rng.choice(clusters) \
+            | (rng.randrange(1 << cluster_bits) >> hostbits << hostbits)
+        strings.append('%s/%d' % (module.int_to_str(value), prefixlen))
+    return strings
+
+
+def mac_strings(rng, count):
+    """:return: a list of random MAC addresses in IEEE EUI-48 form."""
+    return ['-'.join(['%02X' % rng.randrange(256) for _ in _iter_range(6)])
+        for _ in _iter_range(count)]
+
+
+def registered_ouis(rng, count):
+    """
+    :return: a list of OUI values (as integers) found in the IEEE registry
+        index, sampled with replacement.
+    """
+    ouis = sorted(_ieee.OUI_INDEX)
+    return [rng.choice(ouis) for _ in _iter_range(count)]
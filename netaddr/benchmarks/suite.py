@@ -0,0 +1,136 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+Benchmark definitions.
+
+Each benchmark is a function accepting a ``random.Random`` instance and a
+scale (the number of items to process). It builds its dataset and returns
+a callable performing the operation being measured, together with the
+number of operations that callable performs.
+"""
+from netaddr import (IPAddress, IPNetwork, IPSet, EUI, OUI, cidr_merge,
+    NotRegisteredError)
+from netaddr.benchmarks import datasets
+
+#: Registered benchmarks as (name, function) tuples in running order.
+BENCHMARKS = []
+
+
+def benchmark(func):
+    """A decorator registering a benchmark function."""
+    BENCHMARKS.append((func.__name__, func))
+    return func
+
+
+@benchmark
+def ipaddress_parse_ipv4(rng, scale):
+    strings = datasets.ipv4_strings(rng, scale)
+    def run():
+        for string in strings:
+            IPAddress(string)
+    return run, scale
+
+
+@benchmark
+def ipaddress_parse_ipv6(rng, scale):
+    strings = datasets.ipv6_strings(rng, scale)
+    def run():
+        for string in strings:
+            IPAddress(string)
+    return run, scale
+
+
+@benchmark
+def ipaddress_format_ipv4(rng, scale):
+    addrs = [IPAddress(value, 4) for value in datasets.ipv4_ints(rng, scale)]
+    def run():
+        for addr in addrs:
+            str(addr)
+    return run, scale
+
+
+@benchmark
+def ipaddress_format_ipv6(rng, scale):
+    addrs = [IPAddress(value, 6) for value in datasets.ipv6_ints(rng, scale)]
+    def run():
+        for addr in addrs:
+            str(addr)
+    return run, scale
+
+
+@benchmark
+def ipnetwork_parse(rng, scale):
+    strings = datasets.cidr_strings(rng, scale)
+    def run():
+        for string in strings:
+            IPNetwork(string)
+    return run, scale
+
+
+@benchmark
+def ipnetwork_contains(rng, scale):
+    network = IPNetwork('128.0.0.0/1')
+    addrs = [IPAddress(value, 4) for value in datasets.ipv4_ints(rng, scale)]
+    def run():
+        for addr in addrs:
+            addr in network
+    return run, scale
+
+
+@benchmark
+def cidr_merge_ipv4(rng, scale):
+    strings = datasets.cidr_strings(rng, scale)
+    def run():
+        cidr_merge(strings)
+    return run, scale
+
+
+@benchmark
+def ipset_build(rng, scale):
+    strings = datasets.cidr_strings(rng, scale)
+    def run():
+        IPSet(strings)
+    return run, scale
+
+
+@benchmark
+def ipset_contains(rng, scale):
+    ipset = IPSet(datasets.cidr_strings(rng, max(scale // 10, 1)))
+    addrs = [IPAddress(value, 4) for value in datasets.ipv4_ints(rng, scale)]
+    def run():
+        for addr in addrs:
+            addr in ipset
+    return run, scale
+
+
+@benchmark
+def ipset_difference(rng, scale):
+    ipset1 = IPSet(datasets.cidr_strings(rng, scale))
+    ipset2 = IPSet(datasets.cidr_strings(rng, scale))
+    def run():
+        ipset1 - ipset2
+    return run, scale
+
+
+@benchmark
+def eui_parse(rng, scale):
+    strings = datasets.mac_strings(rng, scale)
+    def run():
+        for string in strings:
+            EUI(string)
+    return run, scale
+
+
+@benchmark
+def oui_lookup(rng, scale):
+    values = datasets.registered_ouis(rng, scale)
+    def run():
+        for value in values:
+            try:
+                OUI(value).registration()
+            except NotRegisteredError:
+                pass
+    return run, scale
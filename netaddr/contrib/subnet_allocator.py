@@ -0,0 +1,278 @@
+import heapq as _heapq
+
+from netaddr.core import num_bits
+from netaddr.ip import IPNetwork
+
+
+class SubnetAllocator(object):
+    """
+    An IP address management engine that hands out subnets of a single
+    (large) subnet using a buddy system.
+
+    Free address space is kept in one free list per CIDR prefix. Allocating
+    a subnet splits the smallest suitable free block in half repeatedly,
+    and freeing a subnet merges it with its free "buddy" (the other half of
+    its parent block) repeatedly, so allocations and releases only ever
+    touch one block per prefix length between the base subnet and the
+    requested size.
+
+    Subnets are carved out of the smallest free block able to hold them,
+    at the lowest address among free blocks of that size.
+    """
+    def __init__(self, base_cidr):
+        """
+        Constructor.
+
+        :param base_cidr: an IPv4 or IPv6 address with a CIDR prefix.
+            (see IPNetwork.__init__ for full details).
+        """
+        self._base = IPNetwork(base_cidr).cidr
+        width = self._base._module.width
+        #   Per prefix: a set of free block values and a min-heap of the
+        #   same values (possibly holding stale entries) for ordering.
+        self._free = [set() for _ in range(width + 1)]
+        self._heaps = [[] for _ in range(width + 1)]
+        self._allocated = {}
+        self._add_free(self._base.first, self._base.prefixlen)
+
+    @property
+    def base(self):
+        """The subnet managed by this allocator."""
+        return self._base
+
+    def _add_free(self, value, prefixlen):
+        free = self._free[prefixlen]
+        heap = self._heaps[prefixlen]
+        free.add(value)
+        if len(heap) > 2 * len(free) + 16:
+            #   Too many stale entries, rebuild the heap from scratch.
+            heap[:] = free
+            _heapq.heapify(heap)
+        else:
+            _heapq.heappush(heap, value)
+
+    def _pop_free(self, prefixlen):
+        #   Remove and return the lowest free block value for a prefix.
+        free = self._free[prefixlen]
+        heap = self._heaps[prefixlen]
+        while True:
+            value = _heapq.heappop(heap)
+            if value in free:
+                free.remove(value)
+                return value
+
+    def _smallest_free_prefix(self, prefixlen):
+        #   The longest prefix not exceeding prefixlen with a free block, or
+        #   None if there are no free blocks of that size or larger.
+        for candidate in range(prefixlen, self._base.prefixlen - 1, -1):
+            if self._free[candidate]:
+                return candidate
+        return None
+
+    def _subnet(self, value, prefixlen):
+        return IPNetwork((value, prefixlen), version=self._base.version)
+
+    def _check_prefix(self, prefixlen):
+        if not self._base.prefixlen <= prefixlen <= self._base._module.width:
+            raise ValueError('CIDR prefix /%d invalid for base subnet %s!'
+                % (prefixlen, self._base))
+
+    def allocate(self, prefixlen):
+        """
+        Allocate a subnet of size specified by CIDR prefix.
+
+        Raises ``ValueError`` if no space of the required size is available.
+
+        :param prefixlen: the CIDR prefix of the subnet required.
+
+        :return: the allocated `IPNetwork` subnet.
+        """
+        self._check_prefix(prefixlen)
+
+        block_prefixlen = self._smallest_free_prefix(prefixlen)
+        if block_prefixlen is None:
+            raise ValueError('no /%d subnet available in %s!'
+                % (prefixlen, self._base))
+
+        value = self._pop_free(block_prefixlen)
+        width = self._base._module.width
+        #   Split the block, keeping the lower half and freeing the upper.
+        while block_prefixlen < prefixlen:
+            block_prefixlen += 1
+            self._add_free(value + (1 << (width - block_prefixlen)),
+                block_prefixlen)
+
+        self._allocated[value] = prefixlen
+        return self._subnet(value, prefixlen)
+
+    def allocate_many(self, prefixlen, count=None):
+        """
+        Allocate consecutive subnets of size specified by CIDR prefix, all
+        carved out of the smallest free block able to hold them.
+
+        Raises ``ValueError`` if no space of the required size is available.
+
+        :param prefixlen: the CIDR prefix of the subnets required.
+
+        :param count: (optional) the number of subnets required. Default:
+            as many as the smallest free block able to hold one of them
+            holds.
+
+        :return: a list of the allocated `IPNetwork` subnets, in order.
+        """
+        self._check_prefix(prefixlen)
+        if count is None:
+            needed_prefixlen = prefixlen
+        elif count < 1:
+            raise ValueError('cannot allocate %r subnets!' % (count,))
+        else:
+            needed_prefixlen = prefixlen - num_bits(count - 1)
+
+        block_prefixlen = None
+        if needed_prefixlen >= self._base.prefixlen:
+            block_prefixlen = self._smallest_free_prefix(needed_prefixlen)
+        if block_prefixlen is None:
+            raise ValueError('no space for %s /%d subnets available in %s!'
+                % (count or 'any', prefixlen, self._base))
+        if count is None:
+            count = 1 << (prefixlen - block_prefixlen)
+
+        value = self._pop_free(block_prefixlen)
+        width = self._base._module.width
+        size = 1 << (width - prefixlen)
+        subnets = []
+        for _ in range(count):
+            self._allocated[value] = prefixlen
+            subnets.append(self._subnet(value, prefixlen))
+            value += size
+
+        #   Free the rest of the block as the largest aligned blocks it
+        #   holds.
+        end = self._subnet(subnets[0].first, block_prefixlen).last
+        while value <= end:
+            numbits = min(num_bits(value & -value),
+                num_bits(end - value + 1)) - 1
+            self._add_free(value, width - numbits)
+            value += 1 << numbits
+        return subnets
+
+    def allocate_specific(self, cidr):
+        """
+        Allocate a given subnet.
+
+        Raises ``ValueError`` if any part of it is outside of the base
+        subnet or has already been allocated.
+
+        :param cidr: the IP subnet to be allocated.
+
+        :return: the allocated `IPNetwork` subnet.
+        """
+        subnet = IPNetwork(cidr).cidr
+        if subnet not in self._base:
+            raise ValueError('%s is not within %s!' % (subnet, self._base))
+
+        value = subnet.first
+        prefixlen = subnet.prefixlen
+        width = self._base._module.width
+
+        #   Find the free block containing the subnet.
+        block_prefixlen = prefixlen
+        while block_prefixlen >= self._base.prefixlen:
+            hostmask = (1 << (width - block_prefixlen)) - 1
+            block_value = value & ~hostmask
+            if block_value in self._free[block_prefixlen]:
+                break
+            block_prefixlen -= 1
+        else:
+            raise ValueError('%s is not available for allocation!' % subnet)
+
+        self._free[block_prefixlen].remove(block_value)
+        #   Split the block down to the subnet, freeing the other halves.
+        while block_prefixlen < prefixlen:
+            block_prefixlen += 1
+            half = 1 << (width - block_prefixlen)
+            if value & half:
+                self._add_free(block_value, block_prefixlen)
+                block_value += half
+            else:
+                self._add_free(block_value + half, block_prefixlen)
+
+        self._allocated[value] = prefixlen
+        return subnet
+
+    def free(self, cidr):
+        """
+        Release a previously allocated subnet, merging it with any adjacent
+        free space.
+
+        Raises ``ValueError`` if the subnet is not currently allocated.
+
+        :param cidr: an IP subnet returned by `allocate` or
+            `allocate_specific`.
+        """
+        subnet = IPNetwork(cidr).cidr
+        value = subnet.first
+        prefixlen = subnet.prefixlen
+        if (subnet.version != self._base.version
+                or self._allocated.get(value) != prefixlen):
+            raise ValueError('%s is not allocated!' % subnet)
+        del self._allocated[value]
+
+        width = self._base._module.width
+        while prefixlen > self._base.prefixlen:
+            buddy = value ^ (1 << (width - prefixlen))
+            free = self._free[prefixlen]
+            if buddy not in free:
+                break
+            free.remove(buddy)
+            value &= buddy
+            prefixlen -= 1
+        self._add_free(value, prefixlen)
+
+    def allocated_subnets(self):
+        """:return: a sorted list of the currently allocated subnets."""
+        return [self._subnet(value, self._allocated[value])
+            for value in sorted(self._allocated)]
+
+    def available_subnets(self):
+        """:return: a sorted list of the currently free subnets."""
+        subnets = []
+        for prefixlen, free in enumerate(self._free):
+            subnets.extend([(value, prefixlen) for value in free])
+        subnets.sort()
+        return [self._subnet(value, prefixlen)
+            for value, prefixlen in subnets]
+
+    @property
+    def free_size(self):
+        """The total number of IP addresses not currently allocated."""
+        width = self._base._module.width
+        return sum([len(free) << (width - prefixlen)
+            for prefixlen, free in enumerate(self._free)])
+
+    def snapshot(self):
+        """
+        :return: a plain dictionary (suitable for JSON or pickle
+            serialization) recording the state of this allocator.
+        """
+        return {
+            'base': str(self._base),
+            'allocated': [str(subnet) for subnet in self.allocated_subnets()],
+        }
+
+    @classmethod
+    def restore(cls, snapshot):
+        """
+        :param snapshot: a dictionary previously returned by `snapshot`.
+
+        :return: a new `SubnetAllocator` with the recorded state.
+        """
+        allocator = cls(snapshot['base'])
+        for cidr in snapshot['allocated']:
+            allocator.allocate_specific(cidr)
+        return allocator
+
+    def __repr__(self):
+        """:return: a summary of this allocator."""
+        return '<%s %s (%d allocated)>' % (self.__class__.__name__,
+            self._base, len(self._allocated))
@@ -1,4 +1,6 @@
-from netaddr.ip import IPNetwork, cidr_exclude, cidr_merge
+from netaddr.core import num_bits
+from netaddr.ip import IPNetwork
+from netaddr.contrib.subnet_allocator import SubnetAllocator
 
 
 class SubnetSplitter(object):
@@ -15,27 +17,41 @@ class SubnetSplitter(object):
         :param base_cidr: an IPv4 or IPv6 address with a CIDR prefix.
             (see IPNetwork.__init__ for full details).
         """
-        self._subnets = set([IPNetwork(base_cidr)])
+        self._allocator = SubnetAllocator(base_cidr)
 
     def extract_subnet(self, prefix, count=None):
         """Extract 1 or more subnets of size specified by CIDR prefix."""
-        for cidr in self.available_subnets():
-            subnets = list(cidr.subnet(prefix, count=count))
-            if not subnets:
-                continue
-            self.remove_subnet(cidr)
-            self._subnets = self._subnets.union(
-                set(
-                    cidr_exclude(cidr, cidr_merge(subnets)[0])
-                )
-            )
-            return subnets
-        return []
+        allocator = self._allocator
+        if prefix > allocator.base._module.width:
+            raise ValueError('CIDR prefix /%d invalid for IPv%d!'
+                % (prefix, allocator.base.version))
+        if prefix < allocator.base.prefixlen:
+            return []
+
+        if count is not None:
+            if count < 1:
+                raise ValueError('count outside of current IP subnet boundary!')
+            if prefix - num_bits(count - 1) < allocator.base.prefixlen:
+                raise ValueError('count outside of current IP subnet boundary!')
+        try:
+            return allocator.allocate_many(prefix, count)
+        except ValueError:
+            if count is None:
+                return []
+            raise ValueError('count outside of available IP subnet space!')
 
     def available_subnets(self):
         """Returns a list of the currently available subnets."""
-        return sorted(self._subnets, key=lambda x: x.prefixlen, reverse=True)
+        return sorted(self._allocator.available_subnets(),
+            key=lambda x: x.prefixlen, reverse=True)
 
     def remove_subnet(self, ip_network):
-        """Remove a specified IPNetwork from available address space."""
-        self._subnets.remove(ip_network)
+        """
+        Remove a specified IPNetwork from available address space.
+
+        Raises ``KeyError`` if it is not available.
+        """
+        try:
+            self._allocator.allocate_specific(IPNetwork(ip_network))
+        except ValueError:
+            raise KeyError(ip_network)
@@ -12,9 +12,11 @@ from netaddr.core import NotRegisteredError, AddrFormatError, DictDotLookup
 from netaddr.strategy import eui48 as _eui48, eui64 as _eui64
 from netaddr.strategy.eui48 import mac_eui48
 from netaddr.strategy.eui64 import eui64_base
-from netaddr.ip import IPAddress
+from netaddr.ip import IPAddress, IPNetwork
 from netaddr.compat import _is_int, _is_str
 
+import netaddr.stats as _stats
+
 
 class BaseIdentifier(object):
     """Base class for all IEEE identifiers."""
@@ -71,6 +73,9 @@ class OUI(BaseIdentifier):
         """
         super(OUI, self).__init__()
 
+        if _stats.ENABLED:
+            _stats.incr('eui', 'OUI')
+
         #   Lazy loading of IEEE data structures.
         from netaddr.eui import ieee
 
@@ -92,9 +97,14 @@ class OUI(BaseIdentifier):
         #   Discover offsets.
         if self._value in ieee.OUI_INDEX:
             fh = open(ieee.OUI_REGISTRY)
+            if _stats.ENABLED:
+                _stats.incr('eui', 'registry_opens')
             for (offset, size) in ieee.OUI_INDEX[self._value]:
                 fh.seek(offset)
                 data = fh.read(size)
+                if _stats.ENABLED:
+                    _stats.incr('eui', 'registry_reads')
+                    _stats.incr('eui', 'registry_bytes', size)
                 self._parse_data(data, offset, size)
             fh.close()
         else:
@@ -229,6 +239,9 @@ class IAB(BaseIdentifier):
         """
         super(IAB, self).__init__()
 
+        if _stats.ENABLED:
+            _stats.incr('eui', 'IAB')
+
         #   Lazy loading of IEEE data structures.
         from netaddr.eui import ieee
 
@@ -262,6 +275,10 @@ class IAB(BaseIdentifier):
             self.record['size'] = size
             fh.seek(offset)
             data = fh.read(size)
+            if _stats.ENABLED:
+                _stats.incr('eui', 'registry_opens')
+                _stats.incr('eui', 'registry_reads')
+                _stats.incr('eui', 'registry_bytes', size)
             self._parse_data(data, offset, size)
             fh.close()
         else:
@@ -356,6 +373,9 @@ class EUI(BaseIdentifier):
         """
         super(EUI, self).__init__()
 
+        if _stats.ENABLED:
+            _stats.incr('eui', 'EUI')
+
         self._module = None
 
         if isinstance(addr, EUI):
@@ -729,3 +749,97 @@ class EUI(BaseIdentifier):
         """:return: executable Python string to recreate equivalent object."""
         return "EUI('%s')" % self
 
+
+
+#   Characters allowed in the fast path of MAC address string parsing.
+_HEX_CHARS = frozenset('0123456789abcdefABCDEF')
+
+#   The "u" (universal/local) bit inverted in modified EUI-64 identifiers.
+_EUI64_U_BIT = 0x0200000000000000
+
+_IID_MASK = 0xffffffffffffffff
+
+_ipv6_max_int = 0xffffffffffffffffffffffffffffffff
+
+
+def _mac_to_int(mac):
+    #   Converts a MAC (EUI-48 or EUI-64) address into an integer and its
+    #   EUI version, avoiding the regular expressions used by the EUI
+    #   constructor for the most common string formats.
+    if _is_int(mac):
+        if 0 <= mac <= 0xffffffffffff:
+            return mac, 48
+        elif 0xffffffffffff < mac <= 0xffffffffffffffff:
+            return mac, 64
+    elif isinstance(mac, EUI):
+        return mac._value, mac._module.version
+    elif _is_str(mac):
+        if len(mac) == 17 and mac[2] in ':-':
+            digits = mac[0:2] + mac[3:5] + mac[6:8] + mac[9:11] \
+                + mac[12:14] + mac[15:17]
+            if (mac[5] == mac[8] == mac[11] == mac[14] == mac[2]
+                    and _HEX_CHARS.issuperset(digits)):
+                return int(digits, 16), 48
+        elif len(mac) == 12 and _HEX_CHARS.issuperset(mac):
+            return int(mac, 16), 48
+        eui = EUI(mac)
+        return eui._value, eui._module.version
+    raise AddrFormatError('invalid MAC address: %r' % (mac,))
+
+
+def _prefix_to_int(prefix):
+    if _is_int(prefix):
+        value = prefix
+    else:
+        value = IPNetwork(prefix, version=6).first
+    if not 0 <= value <= _ipv6_max_int or value & _IID_MASK:
+        raise ValueError('%r is not a valid IPv6 /64 prefix!' % (prefix,))
+    return value
+
+
+def slaac_ipv6(macs, prefixes=None, as_int=False):
+    """
+    Derives the IPv6 addresses assigned by stateless address
+    autoconfiguration (SLAAC) for many MAC addresses and prefixes in a
+    single pass.
+
+    The results are equivalent to calling `EUI.ipv6` (or
+    `EUI.ipv6_link_local`) for each MAC address and prefix, but no
+    intermediate `EUI` objects are created.
+
+    .. note:: This poses security risks in certain scenarios. \
+        Please read RFC 4941 for details. Reference: RFCs 4291 and 4941.
+
+    :param macs: an iterable of EUI-48 or EUI-64 addresses as integers,
+        strings or `EUI` objects.
+
+    :param prefixes: (optional) a sequence of IPv6 prefixes (integers,
+        strings or `IPNetwork` objects) with no bits set in their lower 64
+        bits. Default: the link local prefix fe80::/64 only.
+
+    :param as_int: (optional) if True, IPv6 addresses are returned as
+        integers rather than `IPAddress` objects. Default: False
+
+    :return: a list with a tuple for each MAC address holding its IPv6
+        address within each prefix, in the order the prefixes are given.
+    """
+    if prefixes is None:
+        prefixes = [0xfe800000000000000000000000000000]
+    elif _is_int(prefixes) or _is_str(prefixes) \
+            or isinstance(prefixes, (IPAddress, IPNetwork)):
+        raise TypeError('prefixes must be a sequence of IPv6 prefixes!')
+    prefixes = [_prefix_to_int(prefix) for prefix in prefixes]
+
+    results = []
+    for mac in macs:
+        value, version = _mac_to_int(mac)
+        if version == 48:
+            # Convert 11:22:33:44:55:66 into 11:22:33:FF:FE:44:55:66.
+            value = ((value >> 24) << 40) | 0xfffe000000 | (value & 0xffffff)
+        iid = value ^ _EUI64_U_BIT
+        if as_int:
+            results.append(tuple([prefix | iid for prefix in prefixes]))
+        else:
+            results.append(tuple([IPAddress(prefix | iid, 6)
+                for prefix in prefixes]))
+    return results
@@ -15,6 +15,18 @@ from netaddr.strategy import ipv4 as _ipv4, ipv6 as _ipv6
 from netaddr.compat import _sys_maxint, _iter_range, _is_str, _int_type, \
     _str_type
 
+from netaddr.ip.permute import KeyedPermutation, PermutedIterator
+
+#   Characters allowed in integer CIDR prefixes.
+_DIGITS = frozenset('0123456789')
+
+#   Used to parse plain IPv4 address strings directly.
+_ipv4_inet_aton = _ipv4._inet_aton
+_ipv4_unpack_int = _ipv4._unpack_int
+
+import netaddr.stats as _stats
+from netaddr.ip import cache as _cache
+
 
 class BaseIP(object):
     """
@@ -228,6 +240,45 @@ class BaseIP(object):
         return self._module.version
 
 
+def _detect_address_str(addr, flags):
+    #   Only IPv6 addresses contain colons, so there is no need to try
+    #   parsing them as IPv4 first.
+    if ':' in addr:
+        value = _ipv6.parse_str(addr, flags)
+        if value is not None:
+            return value, _ipv6
+        #   inet_aton() ignores anything after whitespace.
+        if _stats.ENABLED:
+            _stats.incr('ip', 'version_fallback')
+    value = _ipv4.parse_str(addr, flags)
+    if value is not None:
+        return value, _ipv4
+    return None, None
+
+
+def _parse_address_str(addr, module, flags):
+    """
+    Parse an IP address string, detecting its IP version if module is None.
+
+    :return: a (value, module) tuple or (None, None) if addr is invalid.
+    """
+    cache = _cache.PARSE_CACHE
+    if cache is not None:
+        key = (addr, module and module.version, flags, None)
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    if module is None:
+        result = _detect_address_str(addr, flags)
+    else:
+        result = module.parse_str(addr, flags), module
+
+    if cache is not None and result[0] is not None:
+        cache.put(key, result)
+    return result
+
+
 class IPAddress(BaseIP):
     """
     An individual IPv4 or IPv6 address without a net mask or subnet prefix.
@@ -257,6 +308,9 @@ class IPAddress(BaseIP):
         """
         super(IPAddress, self).__init__()
 
+        if _stats.ENABLED:
+            _stats.incr('ip', 'IPAddress')
+
         if isinstance(addr, BaseIP):
             #   Copy constructor.
             if version is not None and version != addr._module.version:
@@ -291,15 +345,23 @@ class IPAddress(BaseIP):
                             self._module = _ipv6
                     except ValueError:
                         pass
-                else:
-                    for module in _ipv4, _ipv6:
+                elif _is_str(addr):
+                    value = None
+                    if not flags and ':' not in addr \
+                            and _cache.PARSE_CACHE is None:
+                        #   Fast path for plain IPv4 addresses, skipping
+                        #   version detection. inet_aton() rejects every
+                        #   string ipv4.parse_str() screens out.
                         try:
-                            self._value = module.str_to_int(addr, flags)
-                        except:
-                            continue
-                        else:
-                            self._module = module
-                            break
+                            value = _ipv4_unpack_int(_ipv4_inet_aton(addr))[0]
+                            module = _ipv4
+                        except Exception:
+                            pass
+                    if value is None:
+                        value, module = _parse_address_str(addr, None, flags)
+                    if value is not None:
+                        self._value = value
+                        self._module = module
 
                 if self._module is None:
                     raise AddrFormatError('failed to detect a valid IP ' \
@@ -307,11 +369,11 @@ class IPAddress(BaseIP):
             else:
                 #   IP version is explicit.
                 if _is_str(addr):
-                    try:
-                        self._value = self._module.str_to_int(addr, flags)
-                    except AddrFormatError:
+                    value = _parse_address_str(addr, self._module, flags)[0]
+                    if value is None:
                         raise AddrFormatError('base address %r is not IPv%d'
                             % (addr, self._module.version))
+                    self._value = value
                 else:
                     if 0 <= int(addr) <= self._module.max_int:
                         self._value = int(addr)
@@ -700,23 +762,13 @@ class IPListMixin(object):
         """
         :return: The IP address(es) in this `IPNetwork` object referenced by
             index or slice. As slicing can produce large sequences of objects
-            an iterator is returned instead of the more usual `list`.
+            a lazy `AddressView` is returned instead of the more usual `list`.
         """
         item = None
 
         if hasattr(index, 'indices'):
-            if self._module.version == 6:
-                raise TypeError('IPv6 slices are not supported!')
-
-            (start, stop, step) = index.indices(self.size)
-
-            if (start + step < 0) or (step > stop):
-                #   step value exceeds start and stop boundaries.
-                item = iter([IPAddress(self.first, self._module.version)])
-            else:
-                start_ip = IPAddress(self.first + start, self._module.version)
-                end_ip = IPAddress(self.first + stop - step, self._module.version)
-                item = iter_iprange(start_ip, end_ip, step)
+            view = AddressView(self._module, self.first, self.last + 1)
+            item = view[index]
         else:
             try:
                 index = int(index)
@@ -761,6 +813,84 @@ class IPListMixin(object):
 
     __bool__ = __nonzero__  #   Python 3.x.
 
+    def iter_permuted(self, key=None, start=0):
+        """
+        Visits every IP address in this ranged IP object exactly once, in a
+        pseudo-random order selected by a key, using constant memory.
+
+        :param key: (optional) a non-negative integer selecting the order.
+            Default: a random key.
+
+        :param start: (optional) the number of IP addresses to skip, used
+            with the key of an earlier iterator to resume from its
+            position. Default: 0
+
+        :return: a `PermutedIterator` of `IPAddress` objects.
+        """
+        first = self.first
+        version = self._module.version
+        return PermutedIterator(KeyedPermutation(self.size, key),
+            lambda index: IPAddress(first + index, version), start)
+
+    def split(self, n):
+        """
+        Divides this ranged IP object into disjoint IP sets of (almost)
+        equal size.
+
+        :param n: the number of IP sets to produce.
+
+        :return: a list of n `IPSet` objects holding consecutive IP
+            addresses, whose sizes differ by at most one.
+        """
+        from netaddr.ip.sets import IPSet
+        return IPSet(self).split(n)
+
+
+def _parse_network_str(module, addr, implicit_prefix):
+    #   Parse a CIDR-like string subnet, returning a (value, prefixlen) tuple.
+    if implicit_prefix:
+        #TODO: deprecate this option in netaddr 0.8.x
+        addr = cidr_abbrev_to_verbose(addr)
+
+    val1, separator, val2 = addr.partition('/')
+
+    value = module.parse_str(val1, INET_PTON)
+    if value is None:
+        if module.version == 4:
+            #   Try a partial IPv4 network address...
+            if _stats.ENABLED:
+                _stats.incr('ip', 'partial_address_fallback')
+            value = _ipv4.parse_partial_str(val1)
+        if value is None:
+            raise AddrFormatError('invalid IPNetwork address %s!' % addr)
+
+    if not separator:
+        #   No prefix was specified.
+        prefixlen = module.width
+    elif val2 and _DIGITS.issuperset(val2):
+        #   Integer CIDR prefix.
+        prefixlen = int(val2)
+    else:
+        #   Not an integer prefix, try a netmask/hostmask prefix.
+        mask = module.parse_str(val2, INET_PTON)
+        if mask in module.netmask_to_prefix:
+            prefixlen = module.netmask_to_prefix[mask]
+        elif mask in module.hostmask_to_prefix:
+            prefixlen = module.hostmask_to_prefix[mask]
+        else:
+            #   Integers int() accepts with whitespace, signs etc.
+            try:
+                prefixlen = int(val2)
+            except ValueError:
+                raise AddrFormatError('addr %r is not a valid IPNetwork!' \
+                    % addr)
+
+    if not 0 <= prefixlen <= module.width:
+        raise AddrFormatError('invalid prefix for %s address!' \
+            % module.family_name)
+
+    return value, prefixlen
+
 
 def parse_ip_network(module, addr, implicit_prefix=False, flags=0):
     if isinstance(addr, tuple):
@@ -777,48 +907,17 @@ def parse_ip_network(module, addr, implicit_prefix=False, flags=0):
                 % module.family_name)
     elif isinstance(addr, _str_type):
         #   CIDR-like string subnet
-        if implicit_prefix:
-            #TODO: deprecate this option in netaddr 0.8.x
-            addr = cidr_abbrev_to_verbose(addr)
-
-        if '/' in addr:
-            val1, val2 = addr.split('/', 1)
+        cache = _cache.PARSE_CACHE
+        if cache is None:
+            value, prefixlen = _parse_network_str(module, addr,
+                implicit_prefix)
         else:
-            val1 = addr
-            val2 = None
-
-        try:
-            ip = IPAddress(val1, module.version, flags=INET_PTON)
-        except AddrFormatError:
-            if module.version == 4:
-                #   Try a partial IPv4 network address...
-                expanded_addr = _ipv4.expand_partial_address(val1)
-                ip = IPAddress(expanded_addr, module.version, flags=INET_PTON)
-            else:
-                raise AddrFormatError('invalid IPNetwork address %s!' % addr)
-        value = ip._value
-
-        try:
-            #   Integer CIDR prefix.
-            prefixlen = int(val2)
-        except TypeError:
-            if val2 is None:
-                #   No prefix was specified.
-                prefixlen = module.width
-        except ValueError:
-            #   Not an integer prefix, try a netmask/hostmask prefix.
-            mask = IPAddress(val2, module.version, flags=INET_PTON)
-            if mask.is_netmask():
-                prefixlen = module.netmask_to_prefix[mask._value]
-            elif mask.is_hostmask():
-                prefixlen = module.hostmask_to_prefix[mask._value]
-            else:
-                raise AddrFormatError('addr %r is not a valid IPNetwork!' \
-                    % addr)
-
-        if not 0 <= prefixlen <= module.width:
-            raise AddrFormatError('invalid prefix for %s address!' \
-                % module.family_name)
+            key = (addr, module.version, flags, implicit_prefix)
+            result = cache.get(key)
+            if result is None:
+                result = _parse_network_str(module, addr, implicit_prefix)
+                cache.put(key, result)
+            value, prefixlen = result
     else:
         raise TypeError('unexpected type %s for addr arg' % type(addr))
 
@@ -830,6 +929,48 @@ def parse_ip_network(module, addr, implicit_prefix=False, flags=0):
     return value, prefixlen
 
 
+#   Reverse DNS labels for the lowest 8 bits of an address, keyed by IP
+#   version, and the number of labels each of them holds.
+_ARPA_LOW_LABELS = {
+    4: (['%d.' % i for i in _iter_range(256)], 1),
+    6: (['%x.%x.' % (i & 0xf, i >> 4) for i in _iter_range(256)], 2),
+}
+
+#   The number of address bits in each reverse DNS label, by IP version.
+_ARPA_LABEL_BITS = {4: 8, 6: 4}
+
+
+def _arpa_zone(module, value, prefixlen):
+    #   The reverse DNS zone name for a subnet on a label boundary.
+    label_bits = _ARPA_LABEL_BITS[module.version]
+    total = module.width // label_bits
+    return module.int_to_arpa(value).split('.',
+        total - prefixlen // label_bits)[-1]
+
+
+def _classless_arpa_zone(module, value, prefixlen):
+    #   The RFC 2317 classless delegation zone name for an IPv4 subnet
+    #   longer than /24.
+    return '%d/%d.%s' % (value & 0xff, prefixlen,
+        _arpa_zone(module, value, 24))
+
+
+def _iter_arpa_names(module, first, last, suffix=None):
+    #   Generates reverse DNS names for the addresses first to last, in
+    #   blocks of 256 sharing all but their lowest labels. If given, suffix
+    #   replaces the shared part of every name.
+    low_labels, count = _ARPA_LOW_LABELS[module.version]
+    value = first
+    while value <= last:
+        block_suffix = suffix
+        if block_suffix is None:
+            block_suffix = module.int_to_arpa(value).split('.', count)[-1]
+        block_last = min(last, value | 0xff)
+        for low in _iter_range(value & 0xff, (block_last & 0xff) + 1):
+            yield low_labels[low] + block_suffix
+        value = block_last + 1
+
+
 class IPNetwork(BaseIP, IPListMixin):
     """
     An IPv4 or IPv6 network or subnet.
@@ -899,6 +1040,9 @@ class IPNetwork(BaseIP, IPListMixin):
         """
         super(IPNetwork, self).__init__()
 
+        if _stats.ENABLED:
+            _stats.incr('ip', self.__class__.__name__)
+
         value, prefixlen, module = None, None, None
 
         if hasattr(addr, '_prefixlen'):
@@ -922,20 +1066,22 @@ class IPNetwork(BaseIP, IPListMixin):
         else:
             if version is not None:
                 raise ValueError('%r is an invalid IP version!' % version)
+            #   Pick the IP version up front rather than trying both. Only
+            #   IPv6 network strings contain colons and only IPv6 tuples
+            #   hold values or prefixes too large for IPv4.
+            module = _ipv4
+            if _is_str(addr):
+                if ':' in addr:
+                    module = _ipv6
+            elif isinstance(addr, tuple) and len(addr) == 2:
+                if not (0 <= addr[0] <= _ipv4.max_int
+                        and 0 <= addr[1] <= _ipv4.width):
+                    module = _ipv6
             try:
-                module = _ipv4
                 value, prefixlen = parse_ip_network(module, addr,
                     implicit_prefix, flags)
             except AddrFormatError:
-                try:
-                    module = _ipv6
-                    value, prefixlen = parse_ip_network(module, addr,
-                        implicit_prefix, flags)
-                except AddrFormatError:
-                    pass
-
-                if value is None:
-                    raise AddrFormatError('invalid IPNetwork %s' % addr)
+                raise AddrFormatError('invalid IPNetwork %s' % addr)
 
         self._value = value
         self._prefixlen = prefixlen
@@ -1252,13 +1398,13 @@ class IPNetwork(BaseIP, IPListMixin):
 
         :return: an iterator containing IPNetwork subnet objects.
         """
-        if not 0 <= self.prefixlen <= self._module.width:
+        if not 0 <= prefixlen <= self._module.width:
             raise ValueError('CIDR prefix /%d invalid for IPv%d!' \
                 % (prefixlen, self._module.version))
 
         if not self.prefixlen <= prefixlen:
             #   Don't return anything.
-            raise StopIteration
+            return
 
         #   Calculate number of subnets to be returned.
         width = self._module.width
@@ -1270,16 +1416,43 @@ class IPNetwork(BaseIP, IPListMixin):
         if not 1 <= count <= max_subnets:
             raise ValueError('count outside of current IP subnet boundary!')
 
-        base_subnet = self._module.int_to_str(self.first)
+        base_subnet = self.first
+        subnet_size = 2 ** (width - prefixlen)
+        version = self._module.version
         i = 0
         while(i < count):
-            subnet = self.__class__('%s/%d' % (base_subnet, prefixlen),
-                self._module.version)
-            subnet.value += (subnet.size * i)
-            subnet.prefixlen = prefixlen
+            subnet = self.__class__((base_subnet + (subnet_size * i),
+                prefixlen), version=version)
             i += 1
             yield subnet
 
+    def subnet_view(self, prefixlen):
+        """
+        Divides up this IPNetwork's subnet into smaller subnets based on a
+        specified CIDR prefix, without creating any of them up front.
+
+        Unlike `subnet`, the result supports ``len()``, indexing, slicing,
+        membership tests and ``index()`` in constant time, so it is
+        practical even for very large address spaces (e.g. all /64s within
+        an IPv6 /32).
+
+        :param prefixlen: a CIDR prefix indicating size of subnets to be
+            returned.
+
+        :return: a `SubnetView` object.
+        """
+        if not 0 <= prefixlen <= self._module.width:
+            raise ValueError('CIDR prefix /%d invalid for IPv%d!' \
+                % (prefixlen, self._module.version))
+
+        if self._prefixlen <= prefixlen:
+            count = 1 << (prefixlen - self._prefixlen)
+        else:
+            count = 0
+
+        return SubnetView(self._module, self.first, prefixlen, 0, count, 1,
+            self.__class__)
+
     def iter_hosts(self):
         """
         A generator that provides all the IP addresses that can be assigned
@@ -1317,6 +1490,55 @@ class IPNetwork(BaseIP, IPListMixin):
                     IPAddress(self.last, self._module.version))
         return it_hosts
 
+    def reverse_zones(self):
+        """
+        The reverse DNS zones covering this IPNetwork's subnet.
+
+        Zones are delegated on label boundaries (octets for IPv4, nibbles
+        for IPv6), so subnets between boundaries are covered by several
+        zones. IPv4 subnets longer than /24 are named as RFC 2317 classless
+        delegation zones (e.g. ``0/26.2.0.192.in-addr.arpa.``).
+
+        :return: a list of reverse DNS zone names.
+        """
+        module = self._module
+        prefixlen = self._prefixlen
+        first = self.first
+        if module.version == 4 and prefixlen > 24:
+            return [_classless_arpa_zone(module, first, prefixlen)]
+
+        label_bits = _ARPA_LABEL_BITS[module.version]
+        boundary = -(-prefixlen // label_bits) * label_bits
+        step = 1 << (module.width - boundary)
+        zones = []
+        value = first
+        while value <= self.last:
+            zones.append(_arpa_zone(module, value, boundary))
+            value += step
+        return zones
+
+    def iter_reverse_dns(self, classless=False):
+        """
+        A generator of the reverse DNS (PTR record owner) names of all the
+        IP addresses in this IPNetwork's subnet, in address order.
+
+        Names are built incrementally from a suffix shared between blocks of
+        256 addresses, which is much faster than using the `reverse_dns`
+        property of each address.
+
+        :param classless: (optional) if True, names for IPv4 subnets longer
+            than /24 are placed within the RFC 2317 classless delegation
+            zone (e.g. ``1.0/26.2.0.192.in-addr.arpa.``), as targets for
+            CNAME records in the parent zone. Default: False
+
+        :return: an iterator over reverse DNS names.
+        """
+        module = self._module
+        suffix = None
+        if classless and module.version == 4 and self._prefixlen > 24:
+            suffix = _classless_arpa_zone(module, self.first, self._prefixlen)
+        return _iter_arpa_names(module, self.first, self.last, suffix)
+
     def __str__(self):
         """:return: this IPNetwork in CIDR format"""
         addr = self._module.int_to_str(self._value)
@@ -1327,6 +1549,463 @@ class IPNetwork(BaseIP, IPListMixin):
         return "%s('%s')" % (self.__class__.__name__, self)
 
 
+class FrozenIPNetwork(IPNetwork):
+    """
+    An immutable IPv4 or IPv6 network or subnet.
+
+    Accepts the same constructor arguments as `IPNetwork` and provides the
+    same API, except that the ``value`` and ``prefixlen`` properties are
+    read-only and in-place arithmetic returns new objects.
+
+    As instances never change, the network boundaries, hash value and sort
+    key are calculated once at construction time. This makes them a better
+    choice than `IPNetwork` for dictionary keys, set members and large
+    sorting operations.
+
+    """
+    __slots__ = ('_first', '_last', '_hash', '_sort_key')
+
+    def __init__(self, addr, implicit_prefix=False, version=None, flags=0):
+        """
+        Constructor.
+
+        See `IPNetwork.__init__` for details of the supported arguments.
+        """
+        super(FrozenIPNetwork, self).__init__(addr, implicit_prefix,
+            version, flags)
+        self._freeze()
+
+    def _freeze(self):
+        #   Pre-calculate everything derived from the value and prefix.
+        hostmask = (1 << (self._module.width - self._prefixlen)) - 1
+        first = self._value & (self._module.max_int ^ hostmask)
+        self._first = first
+        self._last = self._value | hostmask
+        self._hash = hash((self._module.version, first, self._last))
+        self._sort_key = (self._module.version, first, self._prefixlen - 1,
+            self._value - first)
+
+    def __setstate__(self, state):
+        """
+        :param state: data used to unpickle a pickled `FrozenIPNetwork`
+            object.
+
+        """
+        super(FrozenIPNetwork, self).__setstate__(state)
+        self._freeze()
+
+    value = property(lambda self: self._value,
+        doc='a positive integer representing the value of IP subnet '
+            '(read-only).')
+
+    prefixlen = property(lambda self: self._prefixlen,
+        doc='size of the bitmask used to separate the network from the host '
+            'bits (read-only).')
+
+    first = property(lambda self: self._first,
+        doc='The integer value of first IP address found within this '
+            '`FrozenIPNetwork` object.')
+
+    last = property(lambda self: self._last,
+        doc='The integer value of last IP address found within this '
+            '`FrozenIPNetwork` object.')
+
+    @property
+    def _hostmask_int(self):
+        """Same as self.hostmask, but in integer format"""
+        return self._last - self._first
+
+    @property
+    def _netmask_int(self):
+        """Same as self.netmask, but in integer format"""
+        return self._module.max_int ^ (self._last - self._first)
+
+    @property
+    def size(self):
+        """
+        The total number of IP addresses within this `FrozenIPNetwork`
+        object.
+        """
+        return self._last - self._first + 1
+
+    def __iadd__(self, num):
+        """
+        :param num: number of `FrozenIPNetwork` blocks to increment by.
+
+        :return: a new `FrozenIPNetwork` object whose value is increased by
+            the current size multiplied by ``num``.
+        """
+        size = self._last - self._first + 1
+        new_value = self._first + (size * num)
+
+        if (new_value + (size - 1)) > self._module.max_int:
+            raise IndexError('increment exceeds address boundary!')
+        if new_value < 0:
+            raise IndexError('increment is less than zero!')
+
+        return self.__class__((new_value, self._prefixlen),
+            version=self._module.version)
+
+    def __isub__(self, num):
+        """
+        :param num: number of `FrozenIPNetwork` blocks to decrement by.
+
+        :return: a new `FrozenIPNetwork` object whose value is decreased by
+            the current size multiplied by ``num``.
+        """
+        size = self._last - self._first + 1
+        new_value = self._first - (size * num)
+
+        if new_value < 0:
+            raise IndexError('decrement is less than zero!')
+        if (new_value + (size - 1)) > self._module.max_int:
+            raise IndexError('decrement exceeds address boundary!')
+
+        return self.__class__((new_value, self._prefixlen),
+            version=self._module.version)
+
+    def previous(self, step=1):
+        """
+        :param step: the number of IP subnets between this `FrozenIPNetwork`
+            object and the expected subnet. Default: 1 (the previous IP
+            subnet).
+
+        :return: The adjacent subnet preceding this `FrozenIPNetwork` object.
+        """
+        return self.__isub__(step)
+
+    def next(self, step=1):
+        """
+        :param step: the number of IP subnets between this `FrozenIPNetwork`
+            object and the expected subnet. Default: 1 (the next IP subnet).
+
+        :return: The adjacent subnet succeeding this `FrozenIPNetwork` object.
+        """
+        return self.__iadd__(step)
+
+    def key(self):
+        """
+        :return: A key tuple used to uniquely identify this `FrozenIPNetwork`.
+        """
+        return self._module.version, self._first, self._last
+
+    def sort_key(self):
+        """
+        :return: A key tuple used to compare and sort this `FrozenIPNetwork`
+            correctly.
+        """
+        return self._sort_key
+
+    def __hash__(self):
+        """
+        :return: A hash value uniquely indentifying this IP object.
+        """
+        return self._hash
+
+
+def _slice_indices(index, size):
+    """
+    Same as slice.indices(), which only accepts sizes up to sys.maxint on
+    Python 2.x, for sequences of any size.
+
+    :return: a (start, stop, step) tuple of non-negative start and stop
+        indices (or -1 for the stop of a reversed slice) and the step.
+    """
+    step = index.step
+    if step is None:
+        step = 1
+    else:
+        step = int(step)
+        if step == 0:
+            raise ValueError('slice step cannot be zero')
+
+    if step < 0:
+        lower, upper = -1, size - 1
+        default_start, default_stop = upper, lower
+    else:
+        lower, upper = 0, size
+        default_start, default_stop = lower, upper
+
+    bounds = []
+    for value, default in ((index.start, default_start),
+            (index.stop, default_stop)):
+        if value is None:
+            value = default
+        else:
+            value = int(value)
+            if value < 0:
+                value += size
+            if value < lower:
+                value = lower
+            elif value > upper:
+                value = upper
+        bounds.append(value)
+    return bounds[0], bounds[1], step
+
+
+class _IPSequenceView(object):
+    """
+    An abstract base class for lazy, read-only sequences whose items are
+    evenly spaced along an integer number line.
+
+    Only start, stop and step integers are stored (with the same meaning as
+    the arguments to the builtin range()). Subclasses map between these
+    numbers and IP objects.
+
+    """
+    __slots__ = ('_module', '_start', '_stop', '_step')
+
+    def __init__(self, module, start, stop, step=1):
+        if step == 0:
+            raise ValueError('step argument cannot be zero')
+        self._module = module
+        self._start = start
+        self._stop = stop
+        self._step = step
+
+    def _item(self, number):
+        #   Returns the object found at a given number.
+        raise NotImplementedError('cannot invoke virtual method!')
+
+    def _number(self, item):
+        #   Returns the number of a given object, raising ValueError if it
+        #   has no valid number in this view.
+        raise NotImplementedError('cannot invoke virtual method!')
+
+    def _replace(self, start, stop, step):
+        #   Returns a new view of the same kind with new boundaries.
+        raise NotImplementedError('cannot invoke virtual method!')
+
+    @property
+    def size(self):
+        """The number of items in this view."""
+        start, stop, step = self._start, self._stop, self._step
+        if step > 0:
+            if stop <= start:
+                return 0
+            return (stop - start - 1) // step + 1
+        if start <= stop:
+            return 0
+        return (start - stop - 1) // -step + 1
+
+    def __len__(self):
+        """
+        :return: the number of items in this view. Raises an `IndexError`
+            if size > system max int (a Python 2.x limitation). Use the
+            .size property for views of any size.
+        """
+        size = self.size
+        if size > _sys_maxint:
+            raise IndexError(("view contains more than %d (sys.maxint) "
+               "items! Use the .size property instead." % _sys_maxint))
+        return size
+
+    def __nonzero__(self):
+        """:return: ``True`` if this view contains at least one item."""
+        #   Python 2.x.
+        return self.size > 0
+
+    __bool__ = __nonzero__  #   Python 3.x.
+
+    def _iter_numbers(self, reverse=False):
+        #   Generates the numbers of all items in this view.
+        size = self.size
+        step = self._step
+        number = self._start
+        if reverse:
+            number += (size - 1) * step
+            step = -step
+        #   A while loop, as IPv6 sizes are too big for xrange() on
+        #   Python 2.x.
+        while size > 0:
+            yield number
+            number += step
+            size -= 1
+
+    def __iter__(self):
+        """:return: an iterator over the items in this view."""
+        for number in self._iter_numbers():
+            yield self._item(number)
+
+    def __reversed__(self):
+        """:return: an iterator over the items in this view, backwards."""
+        for number in self._iter_numbers(reverse=True):
+            yield self._item(number)
+
+    def __getitem__(self, index):
+        """
+        :return: The item referenced by index or a new view of the same
+            type for a slice.
+        """
+        size = self.size
+        if isinstance(index, slice):
+            (start, stop, step) = _slice_indices(index, size)
+            return self._replace(self._start + start * self._step,
+                self._start + stop * self._step, self._step * step)
+
+        try:
+            index = int(index)
+        except ValueError:
+            raise TypeError('unsupported index type %r!' % index)
+
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('index out range for view size!')
+        return self._item(self._start + index * self._step)
+
+    def index(self, item):
+        """
+        :param item: an object that may be found in this view.
+
+        :return: the position of ``item`` within this view. Raises a
+            `ValueError` if it is not present.
+        """
+        try:
+            number = self._number(item)
+        except (AddrFormatError, TypeError):
+            number = None
+        if number is not None:
+            position, remainder = divmod(number - self._start, self._step)
+            if not remainder and 0 <= position < self.size:
+                return position
+        raise ValueError('%s is not in %s' % (item, self.__class__.__name__))
+
+    def __contains__(self, item):
+        """
+        :param item: an object that may be found in this view.
+
+        :return: ``True`` if ``item`` is in this view, ``False`` otherwise.
+        """
+        try:
+            self.index(item)
+        except ValueError:
+            return False
+        return True
+
+    def __repr__(self):
+        """:return: a summary of this view."""
+        size = self.size
+        if size == 0:
+            return '<%s (empty)>' % self.__class__.__name__
+        return '<%s %s ... %s (%d items)>' % (self.__class__.__name__,
+            self[0], self[-1], size)
+
+
+class AddressView(_IPSequenceView):
+    """
+    A lazy, read-only sequence of evenly spaced IP addresses.
+
+    Only integer boundaries are stored. `IPAddress` objects are created on
+    demand as items are accessed. Instances are normally obtained by
+    slicing an `IPNetwork` or `IPRange` rather than constructed directly.
+
+    """
+    __slots__ = ()
+
+    def __init__(self, module, start, stop, step=1):
+        """
+        Constructor.
+
+        :param module: the address strategy module (ipv4 or ipv6).
+
+        :param start: integer value of the first address.
+
+        :param stop: integer value at which the view stops (exclusive).
+
+        :param step: (optional) distance between addresses. Default: 1
+        """
+        super(AddressView, self).__init__(module, start, stop, step)
+
+    def _item(self, number):
+        return IPAddress(number, self._module.version)
+
+    def _number(self, item):
+        if isinstance(item, _int_type):
+            return item
+        item = IPAddress(item, self._module.version)
+        return item._value
+
+    def _replace(self, start, stop, step):
+        return self.__class__(self._module, start, stop, step)
+
+    def iter_ints(self, reverse=False):
+        """
+        :param reverse: (optional) if ``True`` addresses are produced in
+            reverse order. Default: False
+
+        :return: an iterator over the addresses in this view as unsigned
+            integers rather than `IPAddress` objects.
+        """
+        return self._iter_numbers(reverse)
+
+
+class SubnetView(_IPSequenceView):
+    """
+    A lazy, read-only sequence of equally sized, evenly spaced subnets.
+
+    Only integer boundaries are stored. `IPNetwork` objects are created on
+    demand as items are accessed. Instances are normally obtained via
+    `IPNetwork.subnet_view` rather than constructed directly.
+
+    """
+    __slots__ = ('_base', '_prefixlen', '_klass')
+
+    def __init__(self, module, base, prefixlen, start, stop, step=1,
+                 klass=None):
+        """
+        Constructor.
+
+        :param module: the address strategy module (ipv4 or ipv6).
+
+        :param base: integer value of the first address of the subnet at
+            index zero.
+
+        :param prefixlen: CIDR prefix of each subnet in the view.
+
+        :param start: subnet number (relative to base) of the first item.
+
+        :param stop: subnet number (relative to base) at which the view
+            stops (exclusive).
+
+        :param step: (optional) distance in subnets between items.
+            Default: 1
+
+        :param klass: (optional) the class of objects returned.
+            Default: `IPNetwork`
+        """
+        super(SubnetView, self).__init__(module, start, stop, step)
+        self._base = base
+        self._prefixlen = prefixlen
+        if klass is None:
+            klass = IPNetwork
+        self._klass = klass
+
+    @property
+    def prefixlen(self):
+        """The CIDR prefix of each subnet in this view."""
+        return self._prefixlen
+
+    def _item(self, number):
+        shift = self._module.width - self._prefixlen
+        return self._klass((self._base + (number << shift), self._prefixlen),
+            version=self._module.version)
+
+    def _number(self, item):
+        subnet = IPNetwork(item)
+        if (subnet._module is not self._module
+                or subnet._prefixlen != self._prefixlen):
+            return None
+        offset = subnet.first - self._base
+        if offset < 0:
+            return None
+        return offset >> (self._module.width - self._prefixlen)
+
+    def _replace(self, start, stop, step):
+        return self.__class__(self._module, self._base, self._prefixlen,
+            start, stop, step, self._klass)
+
+
 class IPRange(BaseIP, IPListMixin):
     """
     An arbitrary IPv4 or IPv6 address range.
@@ -1354,6 +2033,8 @@ class IPRange(BaseIP, IPListMixin):
             details.
 
         """
+        if _stats.ENABLED:
+            _stats.incr('ip', 'IPRange')
         self._start = IPAddress(start, flags=flags)
         self._module = self._start._module
         self._end = IPAddress(end, self._module.version, flags=flags)
@@ -1576,6 +2257,187 @@ def cidr_merge(ip_addrs):
     return merged
 
 
+#   The cost of an impossible CIDR summary.
+_INFINITY = float('inf')
+
+
+def _combine_aggregate_costs(costs1, costs2, limit):
+    #   Combines the fewest additional IP addresses covered by at most k
+    #   CIDRs (costs[k - 1]) summarizing two disjoint groups of CIDRs, into
+    #   those for both groups with at most limit CIDRs. Summaries of both
+    #   groups in a single CIDR are not possible and cost _INFINITY.
+    size = min(len(costs1) + len(costs2), limit)
+    combined = [_INFINITY] * size
+    for index1, cost1 in enumerate(costs1[:size - 1]):
+        index = index1 + 1
+        for cost2 in costs2[:size - index]:
+            cost = cost1 + cost2
+            if cost < combined[index]:
+                combined[index] = cost
+            index += 1
+    return combined
+
+
+def cidr_aggregate(ip_addrs, max_prefixes):
+    """
+    A function that accepts an iterable sequence of IP addresses and subnets
+    and summarizes them into at most max_prefixes CIDRs, covering as few
+    additional IP addresses as possible. Useful for devices that only accept
+    a limited number of prefixes.
+
+    The exact summary from `cidr_merge` is placed in a prefix tree whose
+    branches are the smallest supernets of neighbouring CIDRs. The fewest
+    additional IP addresses covered by at most k CIDRs within each branch
+    are then worked out from those of its children, for every k up to
+    max_prefixes, taking O(n * max_prefixes) time for n CIDRs.
+
+    :param ip_addrs: an iterable sequence of IP addresses and subnets.
+
+    :param max_prefixes: the maximum number of CIDRs to return. It must be
+        at least the number of IP versions present in ip_addrs.
+
+    :return: a (cidrs, extra) tuple of a sorted list of `IPNetwork` objects
+        and the number of IP addresses they cover which were not in
+        ip_addrs.
+    """
+    cidrs = sorted(cidr_merge(ip_addrs))
+    if len(cidrs) <= max_prefixes:
+        return cidrs, 0
+
+    #   Tree nodes, the CIDRs first, followed by the branches. A node covers
+    #   firsts[i] to firsts[i] + 2 ** hostbits[i] - 1.
+    modules = [cidr._module for cidr in cidrs]
+    firsts = [cidr.first for cidr in cidrs]
+    hostbits = [cidr._module.width - cidr._prefixlen for cidr in cidrs]
+    parents = [-1] * len(cidrs)
+
+    def add_branch(module, first, numbits):
+        modules.append(module)
+        firsts.append(first)
+        hostbits.append(numbits)
+        parents.append(-1)
+        return len(firsts) - 1
+
+    stack = []
+    roots = 0
+    for node in _iter_range(len(cidrs)):
+        if stack and modules[stack[-1]] is modules[node]:
+            prev = node - 1
+            numbits = num_bits(firsts[prev] ^ (firsts[node] +
+                (1 << hostbits[node]) - 1))
+            child = -1
+            while stack and hostbits[stack[-1]] < numbits:
+                popped = stack.pop()
+                if child >= 0:
+                    parents[child] = popped
+                child = popped
+            if not (stack and hostbits[stack[-1]] == numbits):
+                stack.append(add_branch(modules[node],
+                    (firsts[prev] >> numbits) << numbits, numbits))
+            parents[child] = stack[-1]
+        else:
+            #   The first CIDR of an IP version starts a new tree.
+            while len(stack) > 1:
+                child = stack.pop()
+                parents[child] = stack[-1]
+            stack = []
+            roots += 1
+        stack.append(node)
+    while len(stack) > 1:
+        child = stack.pop()
+        parents[child] = stack[-1]
+
+    if max_prefixes < roots:
+        raise ValueError('cannot aggregate IPv4 and IPv6 subnets into less '
+            'than %d prefixes!' % roots)
+
+    #   The addresses covered by the CIDRs within each node, and the
+    #   children of each branch.
+    covered = [1 << numbits for numbits in hostbits]
+    children = [[] for _ in firsts]
+    for node in _iter_range(len(cidrs), len(firsts)):
+        covered[node] = 0
+    order = sorted(_iter_range(len(firsts)), key=hostbits.__getitem__)
+    for node in order:
+        parent = parents[node]
+        if parent >= 0:
+            covered[parent] += covered[node]
+            children[parent].append(node)
+    tree_roots = [node for node in order if parents[node] < 0]
+
+    #   best[node][k - 1] is the fewest additional IP addresses covered when
+    #   summarizing the CIDRs within a node into at most k CIDRs, found
+    #   bottom up. Collapsing a branch into a single CIDR is its only one
+    #   CIDR summary; any more CIDRs are shared out among its children.
+    best = [None] * len(firsts)
+    for node in order:
+        if node < len(cidrs):
+            best[node] = [0]
+            continue
+        costs = best[children[node][0]]
+        for child in children[node][1:]:
+            costs = _combine_aggregate_costs(costs, best[child], max_prefixes)
+        costs[0] = (1 << hostbits[node]) - covered[node]
+        best[node] = costs
+
+    def share_out(nodes, budget):
+        #   :return: the number of CIDRs for each node giving the fewest
+        #       additional IP addresses with at most budget CIDRs in all.
+        folded = [best[nodes[0]]]
+        for node in nodes[1:]:
+            folded.append(_combine_aggregate_costs(folded[-1], best[node],
+                max_prefixes))
+        budgets = []
+        for index in _iter_range(len(nodes) - 1, 0, -1):
+            budget = min(budget, len(folded[index]))
+            target = folded[index][budget - 1]
+            costs = best[nodes[index]]
+            previous = folded[index - 1]
+            for numcidrs in _iter_range(1, min(len(costs), budget - 1) + 1):
+                rest = budget - numcidrs
+                if (rest <= len(previous)
+                        and previous[rest - 1] + costs[numcidrs - 1] == target):
+                    break
+            budgets.append(numcidrs)
+            budget = rest
+        budgets.append(budget)
+        budgets.reverse()
+        return budgets
+
+    #   Walk back down the tree, collapsing the branches of a best summary.
+    collapsed = [False] * len(firsts)
+    extra = 0
+    pending = list(zip(tree_roots, share_out(tree_roots, max_prefixes)))
+    while pending:
+        node, budget = pending.pop()
+        if node < len(cidrs):
+            continue
+        costs = best[node]
+        budget = min(budget, len(costs))
+        if costs[0] == costs[budget - 1]:
+            collapsed[node] = True
+            extra += costs[0]
+            continue
+        pending.extend(zip(children[node], share_out(children[node], budget)))
+
+    #   The result holds the collapsed branches and the CIDRs outside them.
+    hidden = [False] * len(firsts)
+    result = []
+    for node in sorted(_iter_range(len(firsts)),
+            key=lambda node: -hostbits[node]):
+        parent = parents[node]
+        if parent >= 0 and (hidden[parent] or collapsed[parent]):
+            hidden[node] = True
+        elif node < len(cidrs):
+            result.append(cidrs[node])
+        elif collapsed[node]:
+            module = modules[node]
+            result.append(IPNetwork((firsts[node],
+                module.width - hostbits[node]), version=module.version))
+    result.sort()
+    return result, extra
+
+
 def cidr_exclude(target, exclude):
     """
     Removes an exclude IP address or subnet from target IP subnet.
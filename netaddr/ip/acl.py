@@ -0,0 +1,389 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+First-match access control lists (ACLs) of IP address and port rules.
+"""
+from bisect import bisect_right as _bisect_right
+
+from netaddr.core import AddrFormatError, num_bits
+from netaddr.ip import IPAddress, IPNetwork, IPRange
+from netaddr.strategy import ipv4 as _ipv4, ipv6 as _ipv6
+from netaddr.compat import _is_int, _is_str
+
+#: The actions an ACL rule can take.
+ACTIONS = ('permit', 'deny')
+
+_MAX_PORT = 65535
+
+#   Packets without a destination or port are matched using this value,
+#   which only rules accepting any destination or port cover.
+_UNSPECIFIED = -1
+
+
+def _parse_address_spec(spec):
+    """
+    :return: None for any IP address, otherwise a (version, first, last)
+        tuple.
+    """
+    if spec is None:
+        return None
+    if isinstance(spec, (IPNetwork, IPRange)):
+        return spec._module.version, spec.first, spec.last
+    if isinstance(spec, IPAddress):
+        return spec._module.version, spec._value, spec._value
+    if not _is_str(spec):
+        raise TypeError('unexpected type %s for ACL address!' % type(spec))
+
+    words = spec.split()
+    if words == ['any']:
+        return None
+    if len(words) == 2 and words[0] == 'host':
+        return _parse_address_spec(IPAddress(words[1]))
+    if len(words) == 2:
+        #   Cisco style address and wildcard (host) mask. Only contiguous
+        #   wildcard masks are supported; a netmask here is a mistake, not
+        #   another way of writing the prefix length.
+        address = IPAddress(words[0])
+        try:
+            mask = IPAddress(words[1], address._module.version)
+        except AddrFormatError:
+            mask = None
+        if mask is None or not mask.is_hostmask():
+            raise AddrFormatError('invalid ACL wildcard mask %r!' % words[1])
+        prefixlen = address._module.width - num_bits(mask._value)
+        return _parse_address_spec(IPNetwork((address._value, prefixlen),
+            address._module.version))
+    elif len(words) != 1:
+        raise AddrFormatError('invalid ACL address %r!' % spec)
+    if '-' in spec:
+        start, end = spec.split('-', 1)
+        return _parse_address_spec(IPRange(start.strip(), end.strip()))
+    return _parse_address_spec(IPNetwork(spec))
+
+
+def _format_address_spec(bounds):
+    if bounds is None:
+        return 'any'
+    version, first, last = bounds
+    iprange = IPRange(IPAddress(first, version), IPAddress(last, version))
+    cidrs = iprange.cidrs()
+    if len(cidrs) == 1:
+        return str(cidrs[0])
+    return str(iprange)
+
+
+def _parse_ports(ports):
+    """:return: None for any port, otherwise a (first, last) tuple."""
+    if ports is None:
+        return None
+    if _is_int(ports):
+        ports = (ports, ports)
+    first, last = ports
+    if not 0 <= first <= last <= _MAX_PORT:
+        raise ValueError('invalid ACL port range %r!' % (ports,))
+    return first, last
+
+
+class ACLRule(object):
+    """
+    A single rule of an access control list, permitting or denying packets
+    between groups of IP addresses and (optionally) to a range of ports.
+    """
+    __slots__ = ('_action', '_source', '_destination', '_ports')
+
+    def __init__(self, action, source='any', destination='any', ports=None):
+        """
+        Constructor.
+
+        :param action: either 'permit' or 'deny'.
+
+        :param source: (optional) the source IP addresses matched. Either
+            'any', 'host <address>', a Cisco style address and wildcard mask
+            ('10.0.0.0 0.0.0.255'), a CIDR or 'start-end' range string or
+            an `IPNetwork`, `IPRange` or `IPAddress` object. Default: 'any'
+
+        :param destination: (optional) the destination IP addresses matched,
+            in the same forms as source. Default: 'any'
+
+        :param ports: (optional) the destination port or (first, last) range
+            of ports matched. Default: None (any port).
+        """
+        if action not in ACTIONS:
+            raise ValueError('ACL action must be one of %r!' % (ACTIONS,))
+        self._action = action
+        self._source = _parse_address_spec(source)
+        self._destination = _parse_address_spec(destination)
+        if (self._source is not None and self._destination is not None
+                and self._source[0] != self._destination[0]):
+            raise ValueError('ACL rule source and destination must be of '
+                'the same IP version!')
+        self._ports = _parse_ports(ports)
+
+    @property
+    def action(self):
+        """The action taken for packets matching this rule."""
+        return self._action
+
+    @property
+    def source(self):
+        """The source IP addresses matched, as a string."""
+        return _format_address_spec(self._source)
+
+    @property
+    def destination(self):
+        """The destination IP addresses matched, as a string."""
+        return _format_address_spec(self._destination)
+
+    @property
+    def ports(self):
+        """The (first, last) range of ports matched, or None for any."""
+        return self._ports
+
+    def _applies_to(self, version):
+        for bounds in (self._source, self._destination):
+            if bounds is not None and bounds[0] != version:
+                return False
+        return True
+
+    def __repr__(self):
+        """:return: Python statement to create an equivalent object"""
+        text = '%s(%r, %r, %r' % (self.__class__.__name__, self._action,
+            self.source, self.destination)
+        if self._ports is not None:
+            text += ', ports=%r' % (self._ports,)
+        return text + ')'
+
+
+def _partition(intervals, low):
+    """
+    Splits a dimension into disjoint elementary intervals.
+
+    :param intervals: a list of (first, last, rule_index) tuples.
+
+    :param low: the lowest value of the dimension.
+
+    :return: a list of (start, rule_indices) tuples, sorted by start, each
+        giving the (sorted) indices of the rules covering the values from
+        start to the next start.
+    """
+    events = {low: ([], [])}
+    for first, last, index in intervals:
+        events.setdefault(first, ([], []))[0].append(index)
+        events.setdefault(last + 1, ([], []))[1].append(index)
+
+    active = set()
+    cells = []
+    for start in sorted(events):
+        added, removed = events[start]
+        active.difference_update(removed)
+        active.update(added)
+        rules = tuple(sorted(active))
+        if not cells or cells[-1][1] != rules:
+            cells.append((start, rules))
+    return cells
+
+
+class ACL(object):
+    """
+    An ordered list of `ACLRule` objects, where the first rule matching a
+    packet decides whether it is permitted or denied.
+
+    The rules are compiled into a decision table of disjoint source
+    address, destination address and port intervals, so finding the rule
+    deciding a packet takes three binary searches no matter how many rules
+    there are.
+
+    Rules that never decide any packet because earlier rules match
+    everything they do are reported by the `shadowed` attribute.
+    """
+    __slots__ = ('_rules', '_default', '_tables', '_shadowed')
+
+    def __init__(self, rules=None, default='deny'):
+        """
+        Constructor.
+
+        :param rules: (optional) an iterable of `ACLRule` objects or tuples
+            of `ACLRule` constructor arguments, in order of precedence.
+
+        :param default: (optional) the action for packets not matching any
+            rule. Default: 'deny'
+        """
+        if default not in ACTIONS:
+            raise ValueError('ACL action must be one of %r!' % (ACTIONS,))
+        self._default = default
+        self._rules = []
+        if rules is not None:
+            for rule in rules:
+                if not isinstance(rule, ACLRule):
+                    rule = ACLRule(*rule)
+                self._rules.append(rule)
+        self._compile()
+
+    def _compile(self):
+        self._tables = {}
+        #   Per rule: the set of earlier rules deciding the packets it
+        #   matches, or None if it decides some packets itself.
+        shadowed_by = [set() for _ in self._rules]
+        port_tables = {}
+        dst_tables = {}
+
+        def port_table(rule_indices):
+            table = port_tables.get(rule_indices)
+            if table is None:
+                intervals = []
+                for index in rule_indices:
+                    ports = self._rules[index]._ports or (_UNSPECIFIED,
+                        _MAX_PORT)
+                    intervals.append((ports[0], ports[1], index))
+                starts = []
+                decisions = []
+                for start, cell in _partition(intervals, _UNSPECIFIED):
+                    decision = -1
+                    if cell:
+                        decision = cell[0]
+                        shadowed_by[decision] = None
+                        for index in cell[1:]:
+                            if shadowed_by[index] is not None:
+                                shadowed_by[index].add(decision)
+                    if not decisions or decisions[-1] != decision:
+                        starts.append(start)
+                        decisions.append(decision)
+                table = port_tables[rule_indices] = (starts, decisions)
+            return table
+
+        def dst_table(rule_indices):
+            table = dst_tables.get((version, rule_indices))
+            if table is None:
+                intervals = []
+                for index in rule_indices:
+                    bounds = self._rules[index]._destination
+                    if bounds is None:
+                        intervals.append((_UNSPECIFIED, max_int, index))
+                    else:
+                        intervals.append((bounds[1], bounds[2], index))
+                starts = []
+                tables = []
+                for start, cell in _partition(intervals, _UNSPECIFIED):
+                    table = port_table(cell)
+                    if not tables or tables[-1] is not table:
+                        starts.append(start)
+                        tables.append(table)
+                table = dst_tables[(version, rule_indices)] = (starts, tables)
+            return table
+
+        for module in (_ipv4, _ipv6):
+            version = module.version
+            max_int = module.max_int
+            intervals = []
+            for index, rule in enumerate(self._rules):
+                if not rule._applies_to(version):
+                    continue
+                bounds = rule._source
+                if bounds is None:
+                    intervals.append((0, max_int, index))
+                else:
+                    intervals.append((bounds[1], bounds[2], index))
+            if not intervals:
+                continue
+            starts = []
+            tables = []
+            for start, cell in _partition(intervals, 0):
+                table = dst_table(cell)
+                if not tables or tables[-1] is not table:
+                    starts.append(start)
+                    tables.append(table)
+            self._tables[version] = (starts, tables)
+
+        self._shadowed = []
+        for index, rules in enumerate(shadowed_by):
+            if rules is not None:
+                self._shadowed.append((index, sorted(rules)))
+
+    @property
+    def rules(self):
+        """A list of the rules of this ACL, in order of precedence."""
+        return list(self._rules)
+
+    @property
+    def default(self):
+        """The action for packets not matching any rule."""
+        return self._default
+
+    @property
+    def shadowed(self):
+        """
+        A list of (rule index, [shadowing rule indices]) tuples for the
+        rules which can never decide a packet, because the earlier rules
+        listed match every packet they do.
+        """
+        return list(self._shadowed)
+
+    def _match_index(self, source, destination, port):
+        source = IPAddress(source)
+        version = source._module.version
+        if destination is None:
+            destination = _UNSPECIFIED
+        else:
+            destination = IPAddress(destination)
+            if destination._module.version != version:
+                raise ValueError('source and destination addresses must be '
+                    'of the same IP version!')
+            destination = destination._value
+        if port is None:
+            port = _UNSPECIFIED
+        elif not 0 <= port <= _MAX_PORT:
+            raise ValueError('invalid port %r!' % (port,))
+
+        table = self._tables.get(version)
+        if table is None:
+            return -1
+        starts, tables = table
+        starts, tables = tables[_bisect_right(starts, source._value) - 1]
+        starts, decisions = tables[_bisect_right(starts, destination) - 1]
+        return decisions[_bisect_right(starts, port) - 1]
+
+    def match(self, source, destination=None, port=None):
+        """
+        :param source: the source IP address of a packet.
+
+        :param destination: (optional) the destination IP address of the
+            packet. If None, only rules for any destination can match.
+
+        :param port: (optional) the destination port of the packet. If None,
+            only rules for any port can match.
+
+        :return: the first `ACLRule` matching the packet, or None.
+        """
+        index = self._match_index(source, destination, port)
+        if index < 0:
+            return None
+        return self._rules[index]
+
+    def check(self, source, destination=None, port=None):
+        """
+        :param source: the source IP address of a packet.
+
+        :param destination: (optional) the destination IP address of the
+            packet. If None, only rules for any destination can match.
+
+        :param port: (optional) the destination port of the packet. If None,
+            only rules for any port can match.
+
+        :return: the action ('permit' or 'deny') for the packet.
+        """
+        index = self._match_index(source, destination, port)
+        if index < 0:
+            return self._default
+        return self._rules[index]._action
+
+    def __len__(self):
+        """:return: the number of rules in this ACL."""
+        return len(self._rules)
+
+    def __repr__(self):
+        """:return: a summary of this ACL."""
+        return '<%s %d rules, default %s>' % (self.__class__.__name__,
+            len(self._rules), self._default)
@@ -0,0 +1,145 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+An opt-in, size bounded cache of IP address and network string parsing
+results.
+
+Applications that parse the same strings over and over again (e.g. rules
+from configuration files evaluated per request) can enable it with
+`enable_parse_cache`. Only integer results are cached, so new `IPAddress`
+and `IPNetwork` objects are still returned each time.
+"""
+try:
+    from collections import OrderedDict as _OrderedDict
+except ImportError:
+    #   Python < 2.7, entries are evicted in arbitrary order.
+    _OrderedDict = dict
+
+#: The default maximum number of cached parsing results.
+DEFAULT_MAXSIZE = 4096
+
+#: The active `ParseCache`, or ``None`` if parse caching is disabled.
+PARSE_CACHE = None
+
+
+class ParseCache(object):
+    """
+    A least recently used (LRU) mapping of parser inputs to results, with
+    hit and miss counts.
+    """
+    __slots__ = ('_maxsize', '_entries', 'hits', 'misses')
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """
+        Constructor.
+
+        :param maxsize: the maximum number of results to keep.
+        """
+        if maxsize < 1:
+            raise ValueError('parse cache size must be a positive integer!')
+        self._maxsize = maxsize
+        self._entries = _OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        """The maximum number of results kept."""
+        return self._maxsize
+
+    def get(self, key):
+        """
+        :param key: a tuple describing the parser input.
+
+        :return: the cached result for key, or ``None``.
+        """
+        try:
+            #   Re-insert the entry to mark it as most recently used. This
+            #   is safe without locking; a concurrent lookup of the same key
+            #   simply counts as a miss.
+            result = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries[key] = result
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """
+        Stores a result, evicting the least recently used one if full.
+
+        :param key: a tuple describing the parser input.
+
+        :param result: the (immutable) parser output.
+        """
+        entries = self._entries
+        while len(entries) >= self._maxsize:
+            try:
+                if _OrderedDict is dict:
+                    entries.popitem()
+                else:
+                    entries.popitem(last=False)
+            except KeyError:
+                break
+        entries[key] = result
+
+    def clear(self):
+        """Removes all results and resets the hit and miss counts."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """:return: the number of results cached."""
+        return len(self._entries)
+
+    def info(self):
+        """
+        :return: a dictionary of cache statistics with keys ``hits``,
+            ``misses``, ``hit_rate``, ``size`` and ``maxsize``.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': lookups and float(self.hits) / lookups or 0.0,
+            'size': len(self._entries),
+            'maxsize': self._maxsize,
+        }
+
+
+def enable_parse_cache(maxsize=DEFAULT_MAXSIZE):
+    """
+    Starts caching the results of IP address and network string parsing.
+    Any previously cached results are discarded.
+
+    :param maxsize: (optional) the maximum number of results to keep.
+    """
+    global PARSE_CACHE
+    PARSE_CACHE = ParseCache(maxsize)
+
+
+def disable_parse_cache():
+    """Stops caching parsing results and discards any cached results."""
+    global PARSE_CACHE
+    PARSE_CACHE = None
+
+
+def clear_parse_cache():
+    """Discards cached parsing results and resets the statistics."""
+    if PARSE_CACHE is not None:
+        PARSE_CACHE.clear()
+
+
+def parse_cache_info():
+    """
+    :return: a dictionary of statistics for the parse cache (see
+        `ParseCache.info`), or ``None`` if parse caching is disabled.
+    """
+    if PARSE_CACHE is None:
+        return None
+    return PARSE_CACHE.info()
@@ -0,0 +1,304 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""Approximate counting of the busiest subnets in streams of IP addresses."""
+
+import heapq as _heapq
+from itertools import islice as _islice
+from operator import itemgetter as _itemgetter
+
+from netaddr.ip import IPAddress, IPNetwork
+from netaddr.strategy import ipv4 as _ipv4, ipv6 as _ipv6
+from netaddr.compat import _int_type, _iter_range
+
+#   The prefix lengths counted by default for each IP version.
+_DEFAULT_PREFIXLENS = {4: (8, 32), 6: (16, 64)}
+
+#   update() counts addresses in chunks of this many times the capacity (but
+#   at least _MIN_CHUNK_SIZE), trading memory for fewer, larger merges.
+_CHUNK_FACTOR = 4
+_MIN_CHUNK_SIZE = 4096
+
+
+class _SpaceSaving(object):
+    """
+    The space-saving algorithm's summary of the most frequent keys of a
+    stream, holding a bounded number of counters.
+
+    When all counters are in use, a new key takes over the counter of the
+    key with the lowest count, inheriting that count as its error. Counts
+    are exact until that first happens and never underestimate afterwards.
+    """
+    __slots__ = ('capacity', 'counts', 'errors', '_heap')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        #   A (count, key) entry per key, where count may lag behind the
+        #   key's current count (never ahead).
+        self._heap = []
+
+    def add(self, key, weight):
+        counts = self.counts
+        if key in counts:
+            counts[key] += weight
+            return
+        heap = self._heap
+        if len(counts) < self.capacity:
+            counts[key] = weight
+            self.errors[key] = 0
+            _heapq.heappush(heap, (weight, key))
+            return
+
+        #   Find the key with the lowest count, refreshing lagging entries.
+        while True:
+            count, smallest = heap[0]
+            current = counts[smallest]
+            if current == count:
+                break
+            _heapq.heapreplace(heap, (current, smallest))
+        del counts[smallest], self.errors[smallest]
+        counts[key] = count + weight
+        self.errors[key] = count
+        _heapq.heapreplace(heap, (count + weight, key))
+
+    def merge(self, batch):
+        """
+        Adds the exact counts of a batch of keys, much faster than adding
+        keys one at a time once all counters are in use.
+
+        :param batch: a dict of keys to counts.
+        """
+        counts = self.counts
+        errors = self.errors
+        #   Keys not tracked by a full summary were seen at most this often.
+        floor = 0
+        if len(counts) >= self.capacity:
+            floor = min(counts.values())
+        merged = dict(counts)
+        for key, count in batch.items():
+            if key in merged:
+                merged[key] += count
+            else:
+                merged[key] = floor + count
+        if len(merged) > self.capacity:
+            merged = dict(_heapq.nlargest(self.capacity, merged.items(),
+                key=_itemgetter(1)))
+        self.errors = dict([(key, errors.get(key, floor)) for key in merged])
+        self.counts = merged
+        self._heap = [(count, key) for key, count in merged.items()]
+        _heapq.heapify(self._heap)
+
+
+class PrefixCounter(object):
+    """
+    Counts the IP addresses of a stream (e.g. the sources of packets or
+    flows) within their subnets at several prefix lengths, to find the
+    busiest subnets at each level of the address hierarchy.
+
+    Memory is bounded by tracking at most `capacity` subnets per prefix
+    length with the space-saving algorithm, both when adding addresses one
+    at a time and when counting a stream of them with `update`. Counts are exact while a prefix
+    length has seen no more subnets than that, and otherwise overestimate
+    by at most the number of addresses counted divided by capacity.
+
+    Addresses are handled as integers, and the counts of a batch passed to
+    `update` are rolled up from the longest prefix length to the shortest,
+    so no `IPNetwork` objects are created until results are requested.
+    """
+    __slots__ = ('_module', '_prefixlens', '_capacity', '_levels', '_total')
+
+    def __init__(self, prefixlens=None, version=4, capacity=1024):
+        """
+        Constructor.
+
+        :param prefixlens: (optional) the prefix lengths to count subnets
+            at. Default: /8 to /32 for IPv4 and /16 to /64 for IPv6.
+
+        :param version: (optional) the IP version of the addresses counted.
+            Default: 4
+
+        :param capacity: (optional) the maximum number of subnets tracked
+            per prefix length. Default: 1024
+        """
+        if version == 4:
+            self._module = _ipv4
+        elif version == 6:
+            self._module = _ipv6
+        else:
+            raise ValueError('%r is an invalid IP version!' % version)
+        if prefixlens is None:
+            low, high = _DEFAULT_PREFIXLENS[version]
+            prefixlens = _iter_range(low, high + 1)
+        prefixlens = sorted(set(prefixlens), reverse=True)
+        if not prefixlens:
+            raise ValueError('at least one prefix length is required!')
+        for prefixlen in prefixlens:
+            if not 0 <= prefixlen <= self._module.width:
+                raise ValueError('%r is an invalid IPv%d prefix length!'
+                    % (prefixlen, version))
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1!')
+        #   Longest prefix lengths first, the order counts are rolled up in.
+        self._prefixlens = prefixlens
+        self._capacity = capacity
+        self.clear()
+
+    @property
+    def version(self):
+        """The IP version of the addresses counted."""
+        return self._module.version
+
+    @property
+    def prefixlens(self):
+        """A sorted list of the prefix lengths subnets are counted at."""
+        return sorted(self._prefixlens)
+
+    @property
+    def capacity(self):
+        """The maximum number of subnets tracked per prefix length."""
+        return self._capacity
+
+    @property
+    def total(self):
+        """The number of IP addresses counted."""
+        return self._total
+
+    def clear(self):
+        """Resets all counts."""
+        self._levels = dict([(prefixlen, _SpaceSaving(self._capacity))
+            for prefixlen in self._prefixlens])
+        self._total = 0
+
+    def _to_int(self, addr):
+        if isinstance(addr, _int_type):
+            if not 0 <= addr <= self._module.max_int:
+                raise ValueError('%r is not a valid IPv%d address!'
+                    % (addr, self._module.version))
+            return addr
+        return IPAddress(addr, self._module.version)._value
+
+    def add(self, addr, count=1):
+        """
+        Counts a single IP address.
+
+        :param addr: an unsigned integer, `IPAddress` or string.
+
+        :param count: (optional) the number of times to count it. Default: 1
+        """
+        if count < 1:
+            raise ValueError('count must be positive!')
+        value = self._to_int(addr)
+        width = self._module.width
+        levels = self._levels
+        for prefixlen in self._prefixlens:
+            levels[prefixlen].add(value >> (width - prefixlen), count)
+        self._total += count
+
+    def update(self, addrs):
+        """
+        Counts many IP addresses. This is much faster than calling `add`
+        for each of them.
+
+        The addresses are read and counted in chunks of a few times the
+        capacity, so memory stays bounded for streams of any length. If an
+        invalid address is found, the chunks before its own have already
+        been counted.
+
+        :param addrs: an iterable of unsigned integers, `IPAddress` objects
+            or strings.
+        """
+        addrs = iter(addrs)
+        chunk_size = max(self._capacity * _CHUNK_FACTOR, _MIN_CHUNK_SIZE)
+        while True:
+            #   Exact counts for the chunk, of whole addresses at first.
+            batch = {}
+            get = batch.get
+            to_int = self._to_int
+            for addr in _islice(addrs, chunk_size):
+                if not isinstance(addr, _int_type):
+                    addr = to_int(addr)
+                batch[addr] = get(addr, 0) + 1
+            if not batch:
+                return
+            self._merge_batch(batch)
+
+    def _merge_batch(self, batch):
+        if min(batch) < 0 or max(batch) > self._module.max_int:
+            raise ValueError('batch holds invalid IPv%d addresses!'
+                % self._module.version)
+
+        batch_prefixlen = self._module.width
+        for prefixlen in self._prefixlens:
+            shift = batch_prefixlen - prefixlen
+            if shift:
+                rolled_up = {}
+                get = rolled_up.get
+                for key, count in batch.items():
+                    key >>= shift
+                    rolled_up[key] = get(key, 0) + count
+                batch = rolled_up
+                batch_prefixlen = prefixlen
+            self._levels[prefixlen].merge(batch)
+        self._total += sum(batch.values())
+
+    def _level(self, prefixlen):
+        level = self._levels.get(prefixlen)
+        if level is None:
+            raise ValueError('subnets are not counted at prefix length %r!'
+                % (prefixlen,))
+        return level
+
+    def most_common(self, prefixlen, n=None):
+        """
+        :param prefixlen: one of the prefix lengths counted.
+
+        :param n: (optional) the number of subnets to return. Default: all
+            subnets tracked.
+
+        :return: a list of (`IPNetwork`, count) tuples for the subnets with
+            the highest counts, in descending order of count.
+        """
+        level = self._level(prefixlen)
+        items = sorted(level.counts.items(),
+            key=lambda item: (-item[1], item[0]))
+        if n is not None:
+            items = items[:n]
+        shift = self._module.width - prefixlen
+        version = self._module.version
+        return [(IPNetwork((key << shift, prefixlen), version=version), count)
+            for key, count in items]
+
+    def _key(self, network):
+        network = IPNetwork(network, version=self._module.version)
+        level = self._level(network.prefixlen)
+        return level, network.first >> (self._module.width - network.prefixlen)
+
+    def __getitem__(self, network):
+        """
+        :param network: a subnet at one of the prefix lengths counted.
+
+        :return: the (estimated) number of IP addresses counted within the
+            subnet, or 0 if it is not tracked.
+        """
+        level, key = self._key(network)
+        return level.counts.get(key, 0)
+
+    def error(self, network):
+        """
+        :param network: a subnet at one of the prefix lengths counted.
+
+        :return: the largest amount by which the count for the subnet may
+            exceed the number of IP addresses counted within it.
+        """
+        level, key = self._key(network)
+        return level.errors.get(key, 0)
+
+    def __repr__(self):
+        """:return: a summary of this counter."""
+        return '<%s IPv%d /%d-/%d, %d addresses>' % (
+            self.__class__.__name__, self._module.version,
+            self._prefixlens[-1], self._prefixlens[0], self._total)
@@ -8,9 +8,9 @@ Routines and classes for supporting and expressing IP address ranges using a
 glob style syntax.
 
 """
-from netaddr.core import AddrFormatError, AddrConversionError
+from netaddr.core import AddrFormatError, AddrConversionError, num_bits
 from netaddr.ip import IPRange, IPAddress, IPNetwork, iprange_to_cidrs
-from netaddr.compat import _is_str
+from netaddr.compat import _is_str, _int_type, _iter_range
 
 
 def valid_glob(ipglob):
@@ -146,8 +146,8 @@ def iprange_to_globs(start, end):
 
     def _iprange_to_glob(lb, ub):
         #   Internal function to process individual IP globs.
-        t1 = [int(_) for _ in str(lb).split('.')]
-        t2 = [int(_) for _ in str(ub).split('.')]
+        t1 = lb.words
+        t2 = ub.words
 
         tokens = []
 
@@ -310,3 +310,158 @@ class IPGlob(IPRange):
     def __repr__(self):
         """:return: Python statement to create an equivalent object"""
         return "%s('%s')" % (self.__class__.__name__, self.glob)
+
+
+def _glob_octet_bounds(octet, ipglob):
+    #   Returns the (low, high) values matched by a single glob octet.
+    try:
+        if octet == '*':
+            return 0, 255
+        elif '-' in octet:
+            low, high = [int(i) for i in octet.split('-')]
+        else:
+            low = high = int(octet)
+    except ValueError:
+        raise AddrFormatError('not a recognised IP glob range: %r!' % ipglob)
+    if not 0 <= low <= high <= 255:
+        raise AddrFormatError('not a recognised IP glob range: %r!' % ipglob)
+    return low, high
+
+
+class GlobMatcher(object):
+    """
+    Matches IPv4 addresses against many glob-style rules at once.
+
+    Each octet of a rule may be a value ``x``, a range ``x-y`` or an
+    asterisk. Unlike `IPGlob`, octets are interpreted independently, so
+    legacy rules such as ``10.*.3-9.*`` that do not describe a contiguous
+    address range are accepted.
+
+    Rules are compiled into per-octet lookup tables holding a bitmask of
+    the rules matching each octet value. Matching an address against all
+    rules therefore takes a constant number of table lookups, regardless
+    of how many rules there are.
+
+    """
+    __slots__ = ('_globs', '_ids', '_wildcards', '_tables')
+
+    def __init__(self, globs=None):
+        """
+        Constructor.
+
+        :param globs: (optional) an iterable of glob rules, each either a
+            glob string or a ``(glob, rule_id)`` tuple.
+        """
+        self._globs = []
+        self._ids = []
+        self._wildcards = [0, 0, 0, 0]
+        self._tables = [{}, {}, {}, {}]
+        if globs is not None:
+            for ipglob in globs:
+                if isinstance(ipglob, tuple):
+                    self.add(*ipglob)
+                else:
+                    self.add(ipglob)
+
+    def add(self, ipglob, rule_id=None):
+        """
+        Adds a glob rule to this matcher.
+
+        :param ipglob: an IPv4 address range in a glob-style format.
+
+        :param rule_id: (optional) an identifier reported by `match` when
+            this rule matches. Default: the glob string itself.
+        """
+        if not _is_str(ipglob):
+            raise TypeError('string expected, not %s' % type(ipglob))
+        octets = ipglob.split('.')
+        if len(octets) != 4:
+            raise AddrFormatError('not a recognised IP glob range: %r!'
+                % ipglob)
+        bounds = [_glob_octet_bounds(octet, ipglob) for octet in octets]
+
+        bit = 1 << len(self._globs)
+        for i, (low, high) in enumerate(bounds):
+            if (low, high) == (0, 255):
+                self._wildcards[i] |= bit
+            else:
+                table = self._tables[i]
+                for value in _iter_range(low, high + 1):
+                    table[value] = table.get(value, 0) | bit
+
+        self._globs.append(ipglob)
+        if rule_id is None:
+            rule_id = ipglob
+        self._ids.append(rule_id)
+
+    def __len__(self):
+        """:return: the number of rules in this matcher."""
+        return len(self._globs)
+
+    def _match_mask(self, addr):
+        #   Returns a bitmask of all the rules matching addr.
+        if isinstance(addr, _int_type):
+            value = addr
+            if not 0 <= value <= 0xffffffff:
+                return 0
+        else:
+            addr = IPAddress(addr)
+            if addr.version != 4:
+                return 0
+            value = addr.value
+
+        tables = self._tables
+        wildcards = self._wildcards
+        mask = tables[0].get(value >> 24, 0) | wildcards[0]
+        if mask:
+            mask &= tables[1].get((value >> 16) & 0xff, 0) | wildcards[1]
+        if mask:
+            mask &= tables[2].get((value >> 8) & 0xff, 0) | wildcards[2]
+        if mask:
+            mask &= tables[3].get(value & 0xff, 0) | wildcards[3]
+        return mask
+
+    def match(self, addr):
+        """
+        :param addr: an IPv4 address, either as an `IPAddress`, a string or
+            an unsigned integer.
+
+        :return: a list of the ids of all rules matching ``addr``, in the
+            order they were added.
+        """
+        mask = self._match_mask(addr)
+        ids = self._ids
+        matches = []
+        while mask:
+            lowest = mask & -mask
+            matches.append(ids[num_bits(lowest) - 1])
+            mask ^= lowest
+        return matches
+
+    def first_match(self, addr):
+        """
+        :param addr: an IPv4 address, either as an `IPAddress`, a string or
+            an unsigned integer.
+
+        :return: the id of the earliest added rule matching ``addr``, None
+            if no rule matches.
+        """
+        mask = self._match_mask(addr)
+        if not mask:
+            return None
+        return self._ids[num_bits(mask & -mask) - 1]
+
+    def __contains__(self, addr):
+        """
+        :param addr: an IPv4 address.
+
+        :return: ``True`` if at least one rule matches ``addr``, ``False``
+            otherwise.
+        """
+        return bool(self._match_mask(addr))
+
+    def __repr__(self):
+        """:return: Python statement to create an equivalent object"""
+        return '%s(%r)' % (self.__class__.__name__,
+            [(ipglob, rule_id) for ipglob, rule_id in
+             zip(self._globs, self._ids)])
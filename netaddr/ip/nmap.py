@@ -12,14 +12,14 @@ Based on nmap's Target Specification :-
 """
 
 from netaddr.core import AddrFormatError
-from netaddr.ip import IPAddress, IPNetwork
-from netaddr.compat import _iter_range, _is_str, _iter_next
+from netaddr.ip import IPAddress, IPNetwork, iprange_to_cidrs
+from netaddr.compat import _iter_range, _is_str, _int_type
 
 
-def _nmap_octet_target_values(spec):
-    #   Generates sequence of values for an individual octet as defined in the
-    #   nmap Target Specification.
-    values = set()
+def _nmap_octet_target_intervals(spec):
+    #   Generates a sorted list of merged (low, high) value intervals for an
+    #   individual octet as defined in the nmap Target Specification.
+    intervals = []
 
     for element in spec.split(','):
         if '-' in element:
@@ -34,57 +34,243 @@ def _nmap_octet_target_values(spec):
                 raise ValueError('octet value overflow for spec %s!' % spec)
             if low > high:
                 raise ValueError('left side of hyphen must be <= right %r' % element)
-            for octet in _iter_range(low, high + 1):
-                values.add(octet)
+            intervals.append((low, high))
         else:
             octet = int(element)
             if not (0 <= octet <= 255):
                 raise ValueError('octet value overflow for spec %s!' % spec)
-            values.add(octet)
+            intervals.append((octet, octet))
 
-    return sorted(values)
+    intervals.sort()
+    merged = [intervals[0]]
+    for low, high in intervals[1:]:
+        last_low, last_high = merged[-1]
+        if low <= last_high + 1:
+            merged[-1] = (last_low, max(last_high, high))
+        else:
+            merged.append((low, high))
+
+    return merged
+
+
+class NmapTarget(object):
+    """
+    A compiled nmap Target Specification.
+
+    The specification is parsed once into per-octet integer ranges (or
+    address boundaries for CIDR and IPv6 targets). Its size, membership
+    tests and CIDR summarization are then calculated arithmetically without
+    enumerating or string formatting any addresses.
+
+    """
+    __slots__ = ('_spec', '_version', '_first', '_last', '_octets',
+        '_octet_masks')
+
+    def __init__(self, target_spec):
+        """
+        Constructor.
+
+        :param target_spec: an nmap-style IP range target specification.
+        """
+        if not _is_str(target_spec):
+            raise TypeError('string expected, not %s' % type(target_spec))
+
+        self._spec = target_spec
+        self._octets = None
+        self._octet_masks = None
+
+        if '/' in target_spec:
+            _, prefix = target_spec.split('/', 1)
+            if not (0 < int(prefix) < 33):
+                raise AddrFormatError('CIDR prefix expected, not %s' % prefix)
+            net = IPNetwork(target_spec)
+            if net.version != 4:
+                raise AddrFormatError('CIDR only support for IPv4!')
+            self._version = 4
+            self._first = net.first
+            self._last = net.last
+        elif ':' in target_spec:
+            #   nmap only currently supports IPv6 addresses without prefixes.
+            addr = IPAddress(target_spec)
+            self._version = addr.version
+            self._first = self._last = addr.value
+        else:
+            if not target_spec:
+                raise ValueError('nmap target specification cannot be blank!')
+
+            tokens = target_spec.split('.')
+            if len(tokens) != 4:
+                raise AddrFormatError('invalid nmap range: %s' % target_spec)
+
+            self._version = 4
+            self._octets = tuple([_nmap_octet_target_intervals(token)
+                for token in tokens])
 
+            #   One 256 bit mask per octet for constant time lookups.
+            masks = []
+            for intervals in self._octets:
+                mask = 0
+                for low, high in intervals:
+                    mask |= ((1 << (high - low + 1)) - 1) << low
+                masks.append(mask)
+            self._octet_masks = tuple(masks)
 
-def _generate_nmap_octet_ranges(nmap_target_spec):
-    #   Generate 4 lists containing all octets defined by a given nmap Target
-    #   specification.
-    if not _is_str(nmap_target_spec):
-        raise TypeError('string expected, not %s' % type(nmap_target_spec))
+            self._first = ((self._octets[0][0][0] << 24) |
+                (self._octets[1][0][0] << 16) |
+                (self._octets[2][0][0] << 8) | self._octets[3][0][0])
+            self._last = ((self._octets[0][-1][1] << 24) |
+                (self._octets[1][-1][1] << 16) |
+                (self._octets[2][-1][1] << 8) | self._octets[3][-1][1])
+
+    @property
+    def spec(self):
+        """The nmap target specification this object was compiled from."""
+        return self._spec
+
+    @property
+    def version(self):
+        """The IP protocol version of addresses in this target."""
+        return self._version
+
+    @property
+    def size(self):
+        """The number of IP addresses matched by this target."""
+        if self._octets is None:
+            return self._last - self._first + 1
+        size = 1
+        for intervals in self._octets:
+            size *= sum([high - low + 1 for low, high in intervals])
+        return size
+
+    def __len__(self):
+        """:return: the number of IP addresses matched by this target."""
+        return self.size
+
+    def _intervals(self):
+        #   Returns a sorted list of disjoint, non-adjacent (first, last)
+        #   integer intervals covering all addresses in this target.
+        if self._octets is None:
+            return [(self._first, self._last)]
+
+        #   Work from the least significant octet upwards. While everything
+        #   to the right of an octet is a single full-width block, whole
+        #   octet ranges can be kept as one interval.
+        intervals = list(self._octets[3])
+        span = 256
+        for octet_intervals in (self._octets[2], self._octets[1],
+                                self._octets[0]):
+            if len(intervals) == 1 and intervals[0] == (0, span - 1):
+                intervals = [(low * span, (high + 1) * span - 1)
+                    for low, high in octet_intervals]
+            else:
+                expanded = []
+                for low, high in octet_intervals:
+                    for octet in _iter_range(low, high + 1):
+                        base = octet * span
+                        for first, last in intervals:
+                            expanded.append((base + first, base + last))
+                intervals = expanded
+            span <<= 8
+
+        merged = [intervals[0]]
+        for first, last in intervals[1:]:
+            if first == merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], last)
+            else:
+                merged.append((first, last))
+        return merged
+
+    def iter_ints(self):
+        """
+        :return: an iterator producing the unsigned integer value of each
+            IP address in this target, in ascending order.
+        """
+        if self._octets is None:
+            #   IPv6 values are too big for xrange() on Python 2.x.
+            value = self._first
+            last = self._last
+            while value <= last:
+                yield value
+                value += 1
+            return
+
+        def values(intervals, shift):
+            result = []
+            for low, high in intervals:
+                result.extend([octet << shift
+                    for octet in _iter_range(low, high + 1)])
+            return result
+
+        octets = self._octets
+        w_values = values(octets[0], 24)
+        x_values = values(octets[1], 16)
+        y_values = values(octets[2], 8)
+        z_values = values(octets[3], 0)
+        for w in w_values:
+            for x in x_values:
+                wx = w | x
+                for y in y_values:
+                    wxy = wx | y
+                    for z in z_values:
+                        yield wxy | z
+
+    def __iter__(self):
+        """
+        :return: an iterator producing `IPAddress` objects for each IP
+            address in this target, in ascending order.
+        """
+        version = self._version
+        for value in self.iter_ints():
+            yield IPAddress(value, version)
+
+    def __contains__(self, addr):
+        """
+        :param addr: an IP address.
+
+        :return: ``True`` if ``addr`` is matched by this target, ``False``
+            otherwise.
+        """
+        if isinstance(addr, _int_type):
+            addr = IPAddress(addr, self._version)
+        else:
+            addr = IPAddress(addr)
+        if addr.version != self._version:
+            return False
+        value = addr.value
 
-    if not nmap_target_spec:
-        raise ValueError('nmap target specification cannot be blank!')
+        if self._octet_masks is None:
+            return self._first <= value <= self._last
 
-    tokens = nmap_target_spec.split('.')
+        masks = self._octet_masks
+        return bool((masks[0] >> (value >> 24)) & 1 and
+            (masks[1] >> ((value >> 16) & 0xff)) & 1 and
+            (masks[2] >> ((value >> 8) & 0xff)) & 1 and
+            (masks[3] >> (value & 0xff)) & 1)
 
-    if len(tokens) != 4:
-        raise AddrFormatError('invalid nmap range: %s' % nmap_target_spec)
+    def cidrs(self):
+        """
+        :return: the smallest list of `IPNetwork` objects that covers
+            exactly the IP addresses in this target.
+        """
+        version = self._version
+        cidr_list = []
+        for first, last in self._intervals():
+            cidr_list.extend(iprange_to_cidrs(IPAddress(first, version),
+                IPAddress(last, version)))
+        return cidr_list
 
-    return (_nmap_octet_target_values(tokens[0]),
-            _nmap_octet_target_values(tokens[1]),
-            _nmap_octet_target_values(tokens[2]),
-            _nmap_octet_target_values(tokens[3]))
+    def ipset(self):
+        """:return: an `IPSet` containing the IP addresses in this target."""
+        from netaddr.ip.sets import IPSet
+        return IPSet(self.cidrs())
 
+    def __str__(self):
+        """:return: the nmap target specification of this object."""
+        return self._spec
 
-def _parse_nmap_target_spec(target_spec):
-    if '/' in target_spec:
-        _, prefix = target_spec.split('/', 1)
-        if not (0 < int(prefix) < 33):
-            raise AddrFormatError('CIDR prefix expected, not %s' % prefix)
-        net = IPNetwork(target_spec)
-        if net.version != 4:
-            raise AddrFormatError('CIDR only support for IPv4!')
-        for ip in net:
-            yield ip
-    elif ':' in target_spec:
-        #   nmap only currently supports IPv6 addresses without prefixes.
-        yield IPAddress(target_spec)
-    else:
-        octet_ranges = _generate_nmap_octet_ranges(target_spec)
-        for w in octet_ranges[0]:
-            for x in octet_ranges[1]:
-                for y in octet_ranges[2]:
-                    for z in octet_ranges[3]:
-                        yield IPAddress("%d.%d.%d.%d" % (w, x, y, z), 4)
+    def __repr__(self):
+        """:return: Python statement to create an equivalent object"""
+        return "%s('%s')" % (self.__class__.__name__, self._spec)
 
 
 def valid_nmap_range(target_spec):
@@ -94,7 +280,7 @@ def valid_nmap_range(target_spec):
     :return: ``True`` if IP range target spec is valid, ``False`` otherwise.
     """
     try:
-        _iter_next(_parse_nmap_target_spec(target_spec))
+        NmapTarget(target_spec)
         return True
     except (TypeError, ValueError, AddrFormatError):
         pass
@@ -113,5 +299,5 @@ def iter_nmap_range(*nmap_target_spec):
     :return: an iterator producing IPAddress objects for each IP in the target spec(s).
     """
     for target_spec in nmap_target_spec:
-        for addr in _parse_nmap_target_spec(target_spec):
+        for addr in NmapTarget(target_spec):
             yield addr
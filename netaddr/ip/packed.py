@@ -0,0 +1,327 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+Bulk conversion between IP addresses and packed (network byte order) binary
+records held in buffers.
+"""
+import struct as _struct
+
+from netaddr.ip import IPAddress
+from netaddr.strategy import ipv4 as _ipv4, ipv6 as _ipv6
+from netaddr.compat import _iter_range, _int_type, _iter_next
+
+#   The number of records decoded or encoded per struct call.
+_BLOCK_SIZE = 1024
+
+_MASK64 = (1 << 64) - 1
+
+#   struct codes for each IP version. IPv6 addresses are handled as two
+#   64-bit halves.
+_RECORD_CODES = {4: 'I', 6: 'QQ'}
+
+
+def _version_module(version):
+    if version == 4:
+        return _ipv4
+    elif version == 6:
+        return _ipv6
+    raise ValueError('unsupported IP version %r!' % version)
+
+
+def _byte_view(buf):
+    #   A memoryview of buf indexed by byte (so len() is its size in bytes).
+    try:
+        view = memoryview(buf)
+    except NameError:
+        #   Python 2.6 and earlier.
+        return buffer(buf)
+    except TypeError:
+        #   Python 2.x objects only supporting the old buffer protocol, such
+        #   as array and mmap objects.
+        try:
+            return buffer(buf)
+        except NameError:
+            raise TypeError('%s does not support the buffer protocol!'
+                % type(buf).__name__)
+    if view.itemsize != 1:
+        view = view.cast('B')
+    return view
+
+
+class _RecordLayout(object):
+    """Compiled struct formats for blocks of fixed size, strided records."""
+    __slots__ = ('module', 'width', 'stride', '_record', '_pad', '_structs')
+
+    def __init__(self, version, stride):
+        self.module = _version_module(version)
+        self.width = self.module.width // 8
+        if stride is None:
+            stride = self.width
+        elif stride < self.width:
+            raise ValueError('stride %d smaller than an IPv%d address!'
+                % (stride, version))
+        self.stride = stride
+        self._record = _RECORD_CODES[version]
+        self._pad = self._record
+        if stride > self.width:
+            self._pad += '%dx' % (stride - self.width)
+        self._structs = {}
+
+    def block_struct(self, count):
+        """
+        :return: a `struct.Struct` covering count consecutive records,
+            without the padding following the last one (which may lie
+            beyond the end of the buffer).
+        """
+        packer = self._structs.get(count)
+        if packer is None:
+            fmt = '>' + self._pad * (count - 1) + self._record
+            packer = self._structs[count] = _struct.Struct(fmt)
+        return packer
+
+    def record_struct(self):
+        """:return: a `struct.Struct` covering a single record."""
+        return self.block_struct(1)
+
+
+def _unpack_block(layout, view, offset, count):
+    values = layout.block_struct(count).unpack_from(view, offset)
+    if layout.module is _ipv6:
+        return [(values[i] << 64) | values[i + 1]
+            for i in _iter_range(0, len(values), 2)]
+    return list(values)
+
+
+class PackedAddressView(object):
+    """
+    A lazy, read only sequence of IP addresses stored as fixed size packed
+    records in a buffer.
+
+    Records are decoded straight from the underlying buffer on demand, a
+    block at a time when iterating, so no copies or slices of the buffer
+    are made.
+    """
+    __slots__ = ('_view', '_layout', '_offset', '_count')
+
+    def __init__(self, view, layout, offset, count):
+        """
+        Constructor. See `from_packed_buffer`.
+        """
+        self._view = view
+        self._layout = layout
+        self._offset = offset
+        self._count = count
+
+    @property
+    def version(self):
+        """The IP version of the addresses in this sequence."""
+        return self._layout.module.version
+
+    @property
+    def stride(self):
+        """The distance in bytes between the start of consecutive records."""
+        return self._layout.stride
+
+    def __len__(self):
+        """:return: the number of IP addresses in this sequence."""
+        return self._count
+
+    def _value(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('index out of range for packed addresses!')
+        return _unpack_block(self._layout, self._view,
+            self._offset + index * self._layout.stride, 1)[0]
+
+    def __getitem__(self, index):
+        """
+        :param index: the position of a record in this sequence.
+
+        :return: the `IPAddress` stored at that position.
+        """
+        return IPAddress(self._value(index), self._layout.module.version)
+
+    def _iter_blocks(self):
+        stride = self._layout.stride
+        offset = self._offset
+        remaining = self._count
+        while remaining > 0:
+            count = min(remaining, _BLOCK_SIZE)
+            yield _unpack_block(self._layout, self._view, offset, count)
+            offset += count * stride
+            remaining -= count
+
+    def __iter__(self):
+        """:return: an iterator over the IP addresses in this sequence."""
+        version = self._layout.module.version
+        for values in self._iter_blocks():
+            for value in values:
+                yield IPAddress(value, version)
+
+    def iter_ints(self):
+        """
+        :return: an iterator over the addresses in this sequence as
+            unsigned integers.
+        """
+        for values in self._iter_blocks():
+            for value in values:
+                yield value
+
+    def ints(self):
+        """
+        :return: a list of the addresses in this sequence as unsigned
+            integers.
+        """
+        values = []
+        for block in self._iter_blocks():
+            values.extend(block)
+        return values
+
+    def __repr__(self):
+        """:return: a summary of this sequence."""
+        return '<%s IPv%d x %d (stride %d)>' % (self.__class__.__name__,
+            self._layout.module.version, self._count, self._layout.stride)
+
+
+def from_packed_buffer(buf, version, stride=None, offset=0, count=None):
+    """
+    Reads IP addresses stored as packed records (in network byte order)
+    from any object supporting the buffer protocol, such as ``bytes``,
+    ``bytearray``, ``mmap`` or ``array`` objects.
+
+    :param buf: the buffer holding the records.
+
+    :param version: the IP version (4 or 6) of the addresses.
+
+    :param stride: (optional) the distance in bytes between the start of
+        consecutive records, for addresses embedded in larger fixed size
+        records. Default: the size of a single address (4 or 16 bytes).
+
+    :param offset: (optional) the position in bytes of the first address
+        within the buffer. Default: 0
+
+    :param count: (optional) the number of records to read. Default: as
+        many complete addresses as fit in the buffer.
+
+    :return: a `PackedAddressView` sequence over the addresses. Use its
+        `ints` method for the addresses as a list of unsigned integers.
+    """
+    layout = _RecordLayout(version, stride)
+    view = _byte_view(buf)
+    if offset < 0:
+        raise ValueError('buffer offset cannot be negative!')
+
+    available = len(view) - offset
+    if available < layout.width:
+        max_count = 0
+    else:
+        max_count = (available - layout.width) // layout.stride + 1
+
+    if count is None:
+        count = max_count
+    elif not 0 <= count <= max_count:
+        raise ValueError('buffer too small for %d IPv%d records!'
+            % (count, version))
+
+    return PackedAddressView(view, layout, offset, count)
+
+
+def _iter_int_values(addrs, module):
+    version = module.version
+    max_int = module.max_int
+    for addr in addrs:
+        if isinstance(addr, _int_type):
+            value = addr
+            if not 0 <= value <= max_int:
+                raise ValueError('%r is not a valid IPv%d address!'
+                    % (addr, version))
+        else:
+            if not isinstance(addr, IPAddress):
+                addr = IPAddress(addr, version)
+            elif addr._module is not module:
+                raise ValueError('%s is not an IPv%d address!'
+                    % (addr, version))
+            value = addr._value
+        yield value
+
+
+def to_packed_buffer(addrs, version, stride=None, buf=None, offset=0):
+    """
+    Writes IP addresses as packed records (in network byte order), the
+    inverse of `from_packed_buffer`.
+
+    :param addrs: an iterable of IP addresses (`IPAddress` objects,
+        unsigned integers or strings) of the given version.
+
+    :param version: the IP version (4 or 6) of the addresses.
+
+    :param stride: (optional) the distance in bytes between the start of
+        consecutive records. Bytes between addresses are left untouched in
+        an existing buffer and zeroed in a new one. Default: the size of a
+        single address (4 or 16 bytes).
+
+    :param buf: (optional) a writable buffer, such as a ``bytearray`` or
+        ``mmap``, to write the records into. Default: a new ``bytearray``
+        of exactly the required size.
+
+    :param offset: (optional) the position in bytes of the first record
+        within buf. Default: 0
+
+    :return: the buffer written to.
+    """
+    layout = _RecordLayout(version, stride)
+    module = layout.module
+    if not hasattr(addrs, '__len__'):
+        addrs = list(addrs)
+    count = len(addrs)
+    if offset < 0:
+        raise ValueError('buffer offset cannot be negative!')
+
+    size = offset
+    if count:
+        size += (count - 1) * layout.stride + layout.width
+
+    if buf is None:
+        buf = bytearray(size)
+        #   Pad bytes are written as zeros, already the content of a new
+        #   buffer, so whole blocks can be packed at once.
+        blockwise = True
+    else:
+        if len(_byte_view(buf)) < size:
+            raise ValueError('buffer too small for %d IPv%d records!'
+                % (count, version))
+        #   Only pack whole blocks where that will not overwrite the data
+        #   between records.
+        blockwise = layout.stride == layout.width
+
+    values = _iter_int_values(addrs, module)
+    if module is _ipv6:
+        def split(values):
+            for value in values:
+                yield value >> 64
+                yield value & _MASK64
+        values = split(values)
+
+    per_record = len(_RECORD_CODES[module.version])
+    if blockwise:
+        remaining = count
+        while remaining > 0:
+            block = min(remaining, _BLOCK_SIZE)
+            args = [_iter_next(values)
+                for _ in _iter_range(block * per_record)]
+            layout.block_struct(block).pack_into(buf, offset, *args)
+            offset += block * layout.stride
+            remaining -= block
+    else:
+        pack_into = layout.record_struct().pack_into
+        stride = layout.stride
+        for _ in _iter_range(count):
+            pack_into(buf, offset,
+                *[_iter_next(values) for _ in _iter_range(per_record)])
+            offset += stride
+
+    return buf
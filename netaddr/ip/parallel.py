@@ -0,0 +1,168 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+Building IP sets and merging CIDRs from very large inputs using several
+processes.
+"""
+import heapq as _heapq
+import itertools as _itertools
+import multiprocessing as _multiprocessing
+
+from netaddr.ip import IPAddress, IPNetwork, iprange_to_cidrs
+from netaddr.ip.sets import IPSet
+from netaddr.compat import _int_type
+
+#: The default number of IP addresses and subnets parsed per worker task.
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def _merge_intervals(intervals):
+    """
+    Merge overlapping and adjacent intervals.
+
+    :param intervals: a sorted iterable of (version, first, last) tuples.
+
+    :return: a sorted list of disjoint, non-adjacent (version, first, last)
+        tuples.
+    """
+    merged = []
+    for version, first, last in intervals:
+        if merged:
+            prev_version, prev_first, prev_last = merged[-1]
+            if prev_version == version and first <= prev_last + 1:
+                if last > prev_last:
+                    merged[-1] = (version, prev_first, last)
+                continue
+        merged.append((version, first, last))
+    return merged
+
+
+def _parse_chunk(chunk, flags=0):
+    """
+    Parse a chunk of IP addresses and subnets (in a worker process).
+
+    :return: the merged integer intervals covered by the chunk. These are
+        much cheaper to send between processes than `IPNetwork` objects.
+    """
+    intervals = []
+    for addr in chunk:
+        if isinstance(addr, _int_type):
+            addr = IPAddress(addr, flags=flags)
+        cidr = IPNetwork(addr)
+        intervals.append((cidr._module.version, cidr.first, cidr.last))
+    intervals.sort()
+    return _merge_intervals(intervals)
+
+
+def _iter_chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(_itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parallel_intervals(iterable, flags, workers, chunk_size):
+    """
+    Parse an iterable of IP addresses and subnets in chunks, using a pool of
+    worker processes where available.
+
+    :return: the sorted, merged integer intervals covered by the iterable.
+    """
+    if not hasattr(iterable, '__iter__'):
+        raise ValueError('A sequence or iterator is expected!')
+    if chunk_size < 1:
+        raise ValueError('chunk size must be a positive integer!')
+
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+    except ImportError:
+        #   Python 2.x without the futures backport.
+        ProcessPoolExecutor = None
+
+    chunks = _iter_chunks(iterable, chunk_size)
+    results = []
+    if ProcessPoolExecutor is None or workers == 1:
+        for chunk in chunks:
+            results.append(_parse_chunk(chunk, flags))
+    else:
+        if workers is None:
+            workers = _multiprocessing.cpu_count()
+        executor = ProcessPoolExecutor(workers)
+        try:
+            #   Keep a bounded number of chunks in flight so the input is
+            #   not read into memory all at once.
+            max_pending = 2 * workers
+            pending = []
+            for chunk in chunks:
+                pending.append(executor.submit(_parse_chunk, chunk, flags))
+                if len(pending) >= max_pending:
+                    results.append(pending.pop(0).result())
+            for future in pending:
+                results.append(future.result())
+        finally:
+            executor.shutdown()
+
+    return _merge_intervals(_heapq.merge(*results))
+
+
+def _intervals_to_cidrs(intervals):
+    for version, first, last in intervals:
+        for cidr in iprange_to_cidrs(IPAddress(first, version),
+                IPAddress(last, version)):
+            yield cidr
+
+
+def parallel_cidr_merge(ip_addrs, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    A parallel version of `cidr_merge` for very large inputs. Chunks of the
+    input are parsed and merged in a pool of worker processes, which return
+    integer intervals for a final linear merge.
+
+    If ``concurrent.futures`` is unavailable, the chunks are processed in
+    the calling process instead.
+
+    :param ip_addrs: an iterable sequence of IP addresses and subnets.
+
+    :param workers: (optional) the number of worker processes to use.
+        Default: the number of processors on the machine.
+
+    :param chunk_size: (optional) the number of IP addresses and subnets
+        handed to a worker process at a time.
+
+    :return: a summarized list of `IPNetwork` objects.
+    """
+    return list(_intervals_to_cidrs(
+        _parallel_intervals(ip_addrs, 0, workers, chunk_size)))
+
+
+def parallel_ipset(iterable, flags=0, workers=None,
+        chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Builds an `IPSet` from a very large iterable using a pool of worker
+    processes (see `parallel_cidr_merge`). The result is equal to
+    ``IPSet(iterable, flags)``.
+
+    :param iterable: an iterable containing IP addresses and subnets.
+
+    :param flags: decides which rules are applied to the interpretation
+        of integer values. See the netaddr.core namespace documentation
+        for supported constant values.
+
+    :param workers: (optional) the number of worker processes to use.
+        Default: the number of processors on the machine.
+
+    :param chunk_size: (optional) the number of IP addresses and subnets
+        handed to a worker process at a time.
+
+    :return: an `IPSet`.
+    """
+    ipset = IPSet()
+    for cidr in _intervals_to_cidrs(
+            _parallel_intervals(iterable, flags, workers, chunk_size)):
+        ipset._cidrs[cidr] = True
+    return ipset
@@ -0,0 +1,184 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""Keyed pseudo-random permutations for visiting IP addresses out of order."""
+
+import random as _random
+
+from netaddr.core import num_bits
+from netaddr.compat import _iter_range
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value):
+    """The splitmix64 finalizer, a fast 64-bit integer hash."""
+    value = ((value ^ (value >> 30)) * 0xbf58476d1ce4e5b9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94d049bb133111eb) & _MASK64
+    return value ^ (value >> 31)
+
+
+class KeyedPermutation(object):
+    """
+    A keyed pseudo-random permutation of the integers 0 to size - 1.
+
+    Indices are encrypted with a small balanced Feistel network covering
+    the smallest even number of bits able to hold them. Results that fall
+    outside the range are encrypted again (cycle walking) until they land
+    inside it, so every position maps to a distinct value without any
+    table being stored.
+
+    This is *not* cryptographically secure. It is intended to spread work
+    evenly across an address space, not to hide the order from anyone.
+    """
+    __slots__ = ('_size', '_key', '_half_bits', '_half_mask', '_round_keys')
+
+    #:  The number of Feistel rounds applied per encryption.
+    ROUNDS = 4
+
+    def __init__(self, size, key=None):
+        """
+        Constructor.
+
+        :param size: the number of integers to be permuted.
+
+        :param key: (optional) a non-negative integer selecting the
+            permutation. Default: a random key.
+        """
+        if size < 0:
+            raise ValueError('permutation size cannot be negative!')
+        if key is None:
+            key = _random.getrandbits(64)
+        elif key < 0:
+            raise ValueError('permutation key cannot be negative!')
+
+        self._size = size
+        self._key = key
+        self._half_bits = (num_bits(max(size - 1, 1)) + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+
+        #   Derive independent round keys from (all bits of) the key.
+        state = 0
+        while True:
+            state = _mix64(state ^ (key & _MASK64))
+            key >>= 64
+            if not key:
+                break
+        self._round_keys = []
+        for _ in _iter_range(self.ROUNDS):
+            state = (state + 0x9e3779b97f4a7c15) & _MASK64
+            self._round_keys.append(_mix64(state))
+
+    @property
+    def size(self):
+        """The number of integers permuted."""
+        return self._size
+
+    @property
+    def key(self):
+        """The key selecting this permutation."""
+        return self._key
+
+    def _encrypt(self, value):
+        half_bits = self._half_bits
+        half_mask = self._half_mask
+        left = value >> half_bits
+        right = value & half_mask
+        for round_key in self._round_keys:
+            #   Hash halves wider than 64 bits a word at a time.
+            mixed = 0
+            word = right
+            while True:
+                mixed = _mix64(mixed ^ (word & _MASK64) ^ round_key)
+                word >>= 64
+                if not word:
+                    break
+            left, right = right, left ^ (mixed & half_mask)
+        return (left << half_bits) | right
+
+    def __getitem__(self, index):
+        """
+        :param index: a position between 0 and size - 1.
+
+        :return: the integer found at that position of the permutation.
+        """
+        if not 0 <= index < self._size:
+            raise IndexError('index out of range for permutation!')
+        value = self._encrypt(index)
+        while value >= self._size:
+            value = self._encrypt(value)
+        return value
+
+    def __len__(self):
+        """:return: the number of integers permuted."""
+        return self._size
+
+    def __iter__(self):
+        """:return: an iterator over the permuted integers."""
+        for index in _iter_range(self._size):
+            yield self[index]
+
+    def __repr__(self):
+        """:return: Python statement to create an equivalent object"""
+        return '%s(%d, key=%d)' % (self.__class__.__name__, self._size,
+            self._key)
+
+
+class PermutedIterator(object):
+    """
+    An iterator visiting each member of a group of IP addresses exactly
+    once, in the order given by a `KeyedPermutation`.
+
+    Iteration can be resumed later from the `key` and `position` of an
+    unfinished iterator.
+    """
+    __slots__ = ('_permutation', '_lookup', '_position')
+
+    def __init__(self, permutation, lookup, position=0):
+        """
+        Constructor.
+
+        :param permutation: a `KeyedPermutation` with the same size as the
+            group of IP addresses.
+
+        :param lookup: a callable returning the IP address at a given
+            position within the group (in sorted order).
+
+        :param position: (optional) the number of IP addresses already
+            visited. Default: 0
+        """
+        if not 0 <= position <= permutation.size:
+            raise ValueError('position %d out of range!' % position)
+        self._permutation = permutation
+        self._lookup = lookup
+        self._position = position
+
+    @property
+    def key(self):
+        """The key selecting the order of iteration."""
+        return self._permutation.key
+
+    @property
+    def position(self):
+        """The number of IP addresses visited so far."""
+        return self._position
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """:return: the next IP address."""
+        if self._position >= self._permutation.size:
+            raise StopIteration
+        addr = self._lookup(self._permutation[self._position])
+        self._position += 1
+        return addr
+
+    next = __next__     #   Python 2.x.
+
+    def __repr__(self):
+        """:return: a summary of this iterator."""
+        return '<%s key=%d position=%d of %d>' % (self.__class__.__name__,
+            self.key, self._position, self._permutation.size)
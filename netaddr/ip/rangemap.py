@@ -0,0 +1,279 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""Mapping of non-overlapping IP address ranges to values."""
+
+from bisect import bisect_right as _bisect_right
+
+from netaddr.core import AddrFormatError
+from netaddr.ip import IPAddress, IPNetwork, IPRange
+from netaddr.compat import _is_int, _is_str, _iter_range
+
+
+def _addr_to_int(addr, version=None):
+    #   :return: the (value, version) of an IP address, using version to
+    #   interpret integers.
+    if isinstance(addr, IPAddress):
+        return addr._value, addr._module.version
+    elif not _is_int(addr):
+        version = None
+    addr = IPAddress(addr, version)
+    return addr._value, addr._module.version
+
+
+def _key_to_bounds(key, version=None):
+    #   :return: the (first, last, version) of a range key, using version to
+    #   interpret integers.
+    if isinstance(key, (IPRange, IPNetwork)):
+        return key.first, key.last, key._module.version
+    elif isinstance(key, tuple) and len(key) == 2:
+        first, first_version = _addr_to_int(key[0], version)
+        last, last_version = _addr_to_int(key[1], version)
+        if first_version != last_version:
+            raise AddrFormatError('range bounds must be of the same IP '
+                'version!')
+        if first > last:
+            raise AddrFormatError('lower bound IP greater than upper bound!')
+        return first, last, first_version
+    elif isinstance(key, IPAddress) or _is_int(key):
+        value, version = _addr_to_int(key, version)
+        return value, value, version
+    elif _is_str(key) and '-' in key:
+        start, end = key.split('-', 1)
+        return _key_to_bounds((start.strip(), end.strip()))
+    return _key_to_bounds(IPNetwork(key))
+
+
+class IPRangeMap(object):
+    """
+    A mapping of non-overlapping IP address ranges to values, such as the
+    rows of a GeoIP or ASN database.
+
+    Range bounds are held in sorted lists of integers (one group per IP
+    version), so looking up the value for an IP address takes a single
+    binary search. Adjacent ranges mapped to equal values are merged to
+    save memory.
+    """
+    __slots__ = ('_tables', '_version')
+
+    def __init__(self, iterable=None, version=None):
+        """
+        Constructor.
+
+        :param iterable: (optional) an iterable of (key, value) or
+            (start, end, value) tuples. Each key is an `IPRange`,
+            `IPNetwork`, `IPAddress`, a (start, end) tuple or a string
+            holding a CIDR or a ``start-end`` range. Start and end addresses
+            may be `IPAddress` objects, strings or integers.
+
+        :param version: (optional) the IP version used to interpret integer
+            addresses (only). Default: IPv4 for values that fit in 32 bits,
+            otherwise IPv6.
+        """
+        #   Per IP version: a [firsts, lasts, values] list of lists.
+        self._tables = {}
+        self._version = version
+        if iterable is not None:
+            self.update(iterable)
+
+    def _table(self, version):
+        table = self._tables.get(version)
+        if table is None:
+            table = self._tables[version] = [[], [], []]
+        return table
+
+    def _bounds(self, item):
+        if len(item) == 3:
+            first, last, version = _key_to_bounds(tuple(item[0:2]),
+                self._version)
+            return first, last, version, item[2]
+        key, value = item
+        first, last, version = _key_to_bounds(key, self._version)
+        return first, last, version, value
+
+    def update(self, iterable):
+        """
+        Adds many ranges at once. This is much faster than calling `add`
+        for each of them.
+
+        Raises ``ValueError`` if any range overlaps another one.
+
+        :param iterable: an iterable of (key, value) or (start, end, value)
+            tuples (see `__init__` for the types accepted).
+        """
+        rows = {}
+        for version, (firsts, lasts, values) in self._tables.items():
+            rows[version] = list(zip(firsts, lasts, values))
+        for item in iterable:
+            first, last, version, value = self._bounds(item)
+            rows.setdefault(version, []).append((first, last, value))
+
+        tables = {}
+        for version, version_rows in rows.items():
+            version_rows.sort(key=lambda row: row[0])
+            firsts, lasts, values = tables[version] = [[], [], []]
+            for first, last, value in version_rows:
+                if lasts:
+                    if first <= lasts[-1]:
+                        raise ValueError('overlapping IPv%d ranges at %s!'
+                            % (version, IPAddress(first, version)))
+                    if first == lasts[-1] + 1 and value == values[-1]:
+                        lasts[-1] = last
+                        continue
+                firsts.append(first)
+                lasts.append(last)
+                values.append(value)
+        self._tables = tables
+
+    def add(self, key, value):
+        """
+        Adds a single range, merging it with adjacent ranges mapped to an
+        equal value.
+
+        Raises ``ValueError`` if the range overlaps an existing one.
+
+        :param key: an IP address range (see `__init__` for the types
+            accepted).
+
+        :param value: the value for IP addresses within the range.
+        """
+        first, last, version = _key_to_bounds(key, self._version)
+        firsts, lasts, values = self._table(version)
+        index = _bisect_right(firsts, first)
+        if (index > 0 and lasts[index - 1] >= first) or \
+                (index < len(firsts) and firsts[index] <= last):
+            raise ValueError('range %s-%s overlaps an existing range!'
+                % (IPAddress(first, version), IPAddress(last, version)))
+
+        merge_left = index > 0 and lasts[index - 1] + 1 == first \
+            and values[index - 1] == value
+        merge_right = index < len(firsts) and firsts[index] == last + 1 \
+            and values[index] == value
+        if merge_left and merge_right:
+            lasts[index - 1] = lasts[index]
+            del firsts[index], lasts[index], values[index]
+        elif merge_left:
+            lasts[index - 1] = last
+        elif merge_right:
+            firsts[index] = first
+        else:
+            firsts.insert(index, first)
+            lasts.insert(index, last)
+            values.insert(index, value)
+
+    def _find(self, value, version):
+        #   :return: the index of the range holding an address, or -1.
+        table = self._tables.get(version)
+        if table is not None:
+            index = _bisect_right(table[0], value) - 1
+            if index >= 0 and value <= table[1][index]:
+                return index
+        return -1
+
+    def lookup(self, addr, default=None):
+        """
+        :param addr: an IP address (`IPAddress`, string or integer).
+
+        :param default: (optional) the value returned for IP addresses not
+            within any range. Default: None
+
+        :return: the value mapped to the range holding the IP address.
+        """
+        value, version = _addr_to_int(addr, self._version)
+        index = self._find(value, version)
+        if index < 0:
+            return default
+        return self._tables[version][2][index]
+
+    def lookup_many(self, addrs, default=None):
+        """
+        Looks up the values for many IP addresses at once.
+
+        :param addrs: an iterable of IP addresses (`IPAddress` objects,
+            strings or integers).
+
+        :param default: (optional) the value returned for IP addresses not
+            within any range. Default: None
+
+        :return: a list of values, one for each IP address.
+        """
+        results = []
+        append = results.append
+        tables = self._tables
+        for addr in addrs:
+            if isinstance(addr, IPAddress):
+                value = addr._value
+                version = addr._module.version
+            else:
+                value, version = _addr_to_int(addr, self._version)
+            table = tables.get(version)
+            if table is not None:
+                index = _bisect_right(table[0], value) - 1
+                if index >= 0 and value <= table[1][index]:
+                    append(table[2][index])
+                    continue
+            append(default)
+        return results
+
+    def range_of(self, addr):
+        """
+        :param addr: an IP address (`IPAddress`, string or integer).
+
+        :return: the (possibly merged) `IPRange` holding the IP address, or
+            None if it is not within any range.
+        """
+        value, version = _addr_to_int(addr, self._version)
+        index = self._find(value, version)
+        if index < 0:
+            return None
+        table = self._tables[version]
+        return IPRange(IPAddress(table[0][index], version),
+            IPAddress(table[1][index], version))
+
+    def __getitem__(self, addr):
+        """
+        :param addr: an IP address (`IPAddress`, string or integer).
+
+        :return: the value mapped to the range holding the IP address.
+            Raises ``KeyError`` if it is not within any range.
+        """
+        value, version = _addr_to_int(addr, self._version)
+        index = self._find(value, version)
+        if index < 0:
+            raise KeyError(addr)
+        return self._tables[version][2][index]
+
+    def __contains__(self, addr):
+        """
+        :param addr: an IP address (`IPAddress`, string or integer).
+
+        :return: ``True`` if the IP address is within a range of this map,
+            ``False`` otherwise.
+        """
+        value, version = _addr_to_int(addr, self._version)
+        return self._find(value, version) >= 0
+
+    def __len__(self):
+        """:return: the number of (merged) ranges in this map."""
+        return sum([len(table[0]) for table in self._tables.values()])
+
+    def __iter__(self):
+        """
+        :return: an iterator over (`IPRange`, value) tuples, sorted with
+            IPv4 ranges first.
+        """
+        for version in sorted(self._tables):
+            firsts, lasts, values = self._tables[version]
+            for index in _iter_range(len(firsts)):
+                yield (IPRange(IPAddress(firsts[index], version),
+                    IPAddress(lasts[index], version)), values[index])
+
+    def items(self):
+        """:return: a list of (`IPRange`, value) tuples."""
+        return list(self)
+
+    def __repr__(self):
+        """:return: a summary of this map."""
+        return '<%s with %d ranges>' % (self.__class__.__name__, len(self))
@@ -6,11 +6,21 @@
 """Set based operations for IP addresses and subnets."""
 
 import itertools as _itertools
+import random as _random
+from array import array as _array
+from bisect import bisect_left as _bisect_left, bisect_right as _bisect_right, \
+    insort as _insort
 
+from netaddr.core import AddrFormatError, num_bits
 from netaddr.ip import (IPNetwork, IPAddress, IPRange, cidr_merge,
-    cidr_exclude, iprange_to_cidrs)
+    cidr_aggregate, cidr_exclude, iprange_to_cidrs, parse_ip_network)
+from netaddr.ip.permute import KeyedPermutation, PermutedIterator
+from netaddr.strategy import ipv4 as _ipv4, ipv6 as _ipv6
 
-from netaddr.compat import _sys_maxint, _dict_keys, _int_type
+from netaddr.compat import _sys_maxint, _dict_keys, _int_type, _iter_range, \
+    _is_str
+
+import netaddr.stats as _stats
 
 
 def _subtract(supernet, subnets, subnet_idx, ranges):
@@ -53,6 +63,61 @@ def _subtract(supernet, subnets, subnet_idx, ranges):
     return subnet_idx
 
 
+#   Set operations switch from a merge of both sorted CIDR lists to binary
+#   searches of the larger set once it has this many times more CIDRs.
+_ASYMMETRY_RATIO = 8
+
+
+def _overlapping(offsets, cidr):
+    """
+    Find the CIDRs of an IP set overlapping a given CIDR.
+
+    :param offsets: the sorted CIDRs of an IP set with their sort keys and
+        running size totals (see `IPSet._offset_index`).
+
+    :param cidr: an `IPNetwork` object.
+
+    :return: a (start, stop) tuple of indices into the sorted CIDRs. Either
+        a single CIDR containing cidr is found, or the CIDRs found are all
+        contained by it.
+    """
+    cidrs, keys = offsets[0:2]
+    version = cidr._module.version
+    first = cidr.first
+    start = _bisect_right(keys, (version, first)) - 1
+    if start < 0 or keys[start][0] != version or cidrs[start].last < first:
+        start += 1
+    stop = _bisect_right(keys, (version, cidr.last), start)
+    return start, stop
+
+
+def _sorted_cidrs(cidrs):
+    #   Sorting on precomputed keys is much faster than comparing IPNetwork
+    #   objects, and gives the same order.
+    return sorted(cidrs, key=_sort_key)
+
+
+def _sort_key(cidr):
+    return cidr.sort_key()
+
+
+def _contains(outer, inner):
+    return outer.first <= inner.first and inner.last <= outer.last
+
+
+def _overlap_size(offsets, cidr):
+    #   The number of IP addresses an IP set has in common with a CIDR.
+    start, stop = _overlapping(offsets, cidr)
+    if start == stop:
+        return 0
+    if _contains(offsets[0][start], cidr):
+        return cidr.size
+    totals = offsets[2]
+    if start:
+        return totals[stop - 1] - totals[start - 1]
+    return totals[stop - 1]
+
+
 def _iter_merged_ranges(sorted_ranges):
     """Iterate over sorted_ranges, merging where possible
 
@@ -82,13 +147,141 @@ def _iter_merged_ranges(sorted_ranges):
            IPAddress(current_stop, current_version))
 
 
+def _largest_block_prefix(start, end, width):
+    """
+    Return the prefix of the largest CIDR block that fits within the
+    integer range start..end (inclusive).
+    """
+    numbits = num_bits(end - start + 1) - 1
+    #   A range at least 2**numbits long always contains an aligned block of
+    #   2**(numbits - 1) addresses, so at most two sizes need checking.
+    while True:
+        aligned = ((start + (1 << numbits) - 1) >> numbits) << numbits
+        if aligned + (1 << numbits) - 1 <= end:
+            return width - numbits
+        numbits -= 1
+
+
+class _GapIndex(object):
+    """
+    An index of the unused address space (gaps) of one IP version in an
+    IPSet.
+
+    Gaps are kept as sorted parallel lists of start and end values. They
+    are also grouped by the prefix of the largest CIDR block each gap can
+    hold, so free blocks of a given size can be found with a bisect per
+    prefix length rather than a scan over all gaps.
+    """
+    __slots__ = ('_width', '_starts', '_ends', '_buckets')
+
+    def __init__(self, width, max_int, used):
+        """
+        Constructor.
+
+        :param width: the width in bits of the address space.
+
+        :param max_int: the largest value in the address space.
+
+        :param used: a sorted sequence of disjoint (first, last) tuples of
+            the address space in use.
+        """
+        self._width = width
+        self._starts = []
+        self._ends = []
+        self._buckets = [[] for _ in _iter_range(width + 1)]
+        position = 0
+        for first, last in used:
+            if first > position:
+                self._add(position, first - 1)
+            position = last + 1
+        if position <= max_int:
+            self._add(position, max_int)
+
+    def _add(self, start, end):
+        idx = _bisect_left(self._starts, start)
+        self._starts.insert(idx, start)
+        self._ends.insert(idx, end)
+        _insort(self._buckets[_largest_block_prefix(start, end, self._width)],
+            start)
+
+    def _delete(self, idx):
+        start = self._starts.pop(idx)
+        end = self._ends.pop(idx)
+        bucket = self._buckets[_largest_block_prefix(start, end, self._width)]
+        del bucket[_bisect_left(bucket, start)]
+
+    def fill(self, first, last):
+        """Mark the range first..last (inclusive) as in use."""
+        idx = _bisect_right(self._starts, last) - 1
+        while idx >= 0 and self._ends[idx] >= first:
+            start = self._starts[idx]
+            end = self._ends[idx]
+            self._delete(idx)
+            if end > last:
+                self._add(last + 1, end)
+            if start < first:
+                self._add(start, first - 1)
+            idx -= 1
+
+    def release(self, first, last):
+        """Mark the range first..last (inclusive) as unused."""
+        idx = _bisect_right(self._starts, last + 1) - 1
+        while idx >= 0 and self._ends[idx] >= first - 1:
+            first = min(first, self._starts[idx])
+            last = max(last, self._ends[idx])
+            self._delete(idx)
+            idx -= 1
+        self._add(first, last)
+
+    def find(self, prefixlen, low, high, best_fit=False):
+        """
+        :return: the first address of an aligned unused block with the
+            given prefix that lies within low..high (inclusive), or None.
+        """
+        width = self._width
+        starts = self._starts
+        ends = self._ends
+        candidates = []
+
+        #   A gap that starts before the search boundary.
+        idx = _bisect_right(starts, low) - 1
+        if idx >= 0 and ends[idx] >= low:
+            candidates.append((low, min(ends[idx], high)))
+
+        #   The first gap starting within the boundary for each size of
+        #   gap able to hold the block.
+        for bucket in self._buckets[:prefixlen + 1]:
+            bucket_idx = _bisect_left(bucket, low)
+            if bucket_idx < len(bucket) and bucket[bucket_idx] <= high:
+                start = bucket[bucket_idx]
+                end = ends[_bisect_left(starts, start)]
+                candidates.append((start, min(end, high)))
+
+        shift = width - prefixlen
+        found = None
+        for start, end in candidates:
+            block_prefixlen = _largest_block_prefix(start, end, width)
+            if block_prefixlen > prefixlen:
+                continue
+            aligned = ((start + (1 << shift) - 1) >> shift) << shift
+            if best_fit:
+                key = (-block_prefixlen, aligned)
+            else:
+                key = (aligned,)
+            if found is None or key < found:
+                found = key
+        if found is None:
+            return None
+        return found[-1]
+
+
 class IPSet(object):
     """
     Represents an unordered collection (set) of unique IP addresses and
     subnets.
 
     """
-    __slots__ = ('_cidrs',)
+    __slots__ = ('_cidrs', '_gaps', '_offsets')
 
     def __init__(self, iterable=None, flags=0):
         """
@@ -102,6 +295,10 @@ class IPSet(object):
             for supported constant values.
 
         """
+        if _stats.ENABLED:
+            _stats.incr('sets', 'IPSet')
+        self._gaps = None
+        self._offsets = None
         if isinstance(iterable, IPNetwork):
             self._cidrs = {iterable.cidr: True}
         elif isinstance(iterable, IPRange):
@@ -130,6 +327,8 @@ class IPSet(object):
         :param state: data used to unpickle a pickled ``IPSet`` object.
 
         """
+        self._gaps = None
+        self._offsets = None
         self._cidrs = dict.fromkeys(
             (IPNetwork((value, prefixlen), version=version)
              for value, prefixlen, version in state),
@@ -142,6 +341,8 @@ class IPSet(object):
         This allows to perform compaction much faster. added_network must
         already be present in self._cidrs.
         """
+        if _stats.ENABLED:
+            _stats.incr('sets', 'compact_single_network')
         added_first = added_network.first
         added_last = added_network.last
         added_version = added_network.version
@@ -177,6 +378,13 @@ class IPSet(object):
             for item in to_remove:
                 del self._cidrs[item]
 
+        self._merge_with_siblings(added_network)
+
+    def _merge_with_siblings(self, added_network):
+        """
+        Merge added_network, which must already be present in self._cidrs
+        and not overlap any other member, with its sibling networks.
+        """
         # Check if added_network can be merged with another network.
 
         # Note that merging can only happen between networks of the same
@@ -209,12 +417,248 @@ class IPSet(object):
             added_network._value = (added_network._value >> shift_width) << shift_width
             self._cidrs[added_network] = True
 
+    def _fill_gaps(self, addr):
+        #   Keep the gap index (if any) in step with newly added addresses.
+        if self._gaps is not None and addr._module.version in self._gaps:
+            self._gaps[addr._module.version].fill(addr.first, addr.last)
+
+    def _gap_index(self, version):
+        #   Return the gap index for an IP version, building it if needed.
+        if self._gaps is None:
+            self._gaps = {}
+        if version not in self._gaps:
+            module = _ipv4 if version == 4 else _ipv6
+            used = sorted([(cidr.first, cidr.last) for cidr in self._cidrs
+                if cidr._module.version == version])
+            self._gaps[version] = _GapIndex(module.width, module.max_int,
+                used)
+        return self._gaps[version]
+
+    def find_free(self, prefixlen, within, best_fit=False):
+        """
+        Finds an aligned block of addresses not in this IP set.
+
+        The first call builds an index of the gaps between members of this
+        set. The index is kept up to date by `add`, `remove` and `pop` so
+        repeated calls interleaved with these methods remain fast.
+
+        :param prefixlen: the CIDR prefix of the block required.
+
+        :param within: an IP subnet the block must be found in.
+
+        :param best_fit: (optional) if ``False``, return the block at the
+            lowest address. If ``True``, prefer a block from the smallest
+            gap able to hold it (leaving larger gaps intact), lowest address
+            first. Default: False
+
+        :return: an `IPNetwork` subnet, or None if there is no free block
+            of the requested size.
+        """
+        within = IPNetwork(within).cidr
+        if not 0 <= prefixlen <= within._module.width:
+            raise ValueError('CIDR prefix /%d invalid for IPv%d!'
+                % (prefixlen, within._module.version))
+        if prefixlen < within.prefixlen:
+            return None
+
+        gaps = self._gap_index(within._module.version)
+        value = gaps.find(prefixlen, within.first, within.last, best_fit)
+        if value is None:
+            return None
+        return IPNetwork((value, prefixlen), version=within._module.version)
+
+    def _offset_index(self):
+        #   Return the sorted CIDRs of this set together with their sort keys
+        #   and a running total of their sizes, building them if needed.
+        if self._offsets is None:
+            #   Members are disjoint, so (version, first) keys are unique and
+            #   sort them in the same order as their sort_key() values.
+            unsorted_cidrs = list(self._cidrs)
+            unsorted_keys = []
+            sizes = []
+            for cidr in unsorted_cidrs:
+                module = cidr._module
+                host_bits = module.width - cidr._prefixlen
+                unsorted_keys.append((module.version,
+                    cidr._value >> host_bits << host_bits))
+                sizes.append(1 << host_bits)
+            order = sorted(_iter_range(len(unsorted_cidrs)),
+                key=unsorted_keys.__getitem__)
+            cidrs = [unsorted_cidrs[i] for i in order]
+            keys = [unsorted_keys[i] for i in order]
+            totals = []
+            total = 0
+            for i in order:
+                total += sizes[i]
+                totals.append(total)
+            self._offsets = (cidrs, keys, totals)
+        return self._offsets
+
+    def __getitem__(self, index):
+        """
+        :param index: the position of an IP address within this IP set, in
+            sorted order (IPv4 addresses first). Negative values count from
+            the end.
+
+        :return: the IP address at that position. Only the sorted list of
+            subnets is searched so this is fast even for very large sets.
+        """
+        if not isinstance(index, _int_type):
+            raise TypeError('unsupported index type %r!' % index)
+
+        cidrs, keys, totals = self._offset_index()
+        size = totals[-1] if totals else 0
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('index out of range for IP set!')
+
+        i = _bisect_right(totals, index)
+        cidr = cidrs[i]
+        offset = index - (totals[i] - cidr.size)
+        return IPAddress(cidr.first + offset, cidr._module.version)
+
+    def index(self, ip):
+        """
+        The inverse of indexing, finding the position of an IP address
+        within this IP set (in sorted order).
+
+        Raises ``ValueError`` if the IP address is not a member of this set.
+
+        :param ip: an IP address.
+
+        :return: the position of the IP address within this IP set.
+        """
+        addr = IPAddress(ip)
+        cidrs, keys, totals = self._offset_index()
+        i = _bisect_right(keys, (addr._module.version, addr._value)) - 1
+        if i >= 0:
+            cidr = cidrs[i]
+            if (cidr._module.version == addr._module.version
+                    and addr._value <= cidr.last):
+                return totals[i] - cidr.size + addr._value - cidr.first
+        raise ValueError('%s is not in IP set!' % addr)
+
+    def sample(self, n, rng=None):
+        """
+        Chooses IP addresses from this IP set at random, without replacement.
+
+        Raises ``ValueError`` if n is larger than the size of this set.
+
+        :param n: the number of IP addresses to choose.
+
+        :param rng: (optional) a random number generator providing
+            ``sample`` and ``randrange`` methods, e.g. a ``random.Random``
+            instance. Default: the ``random`` module.
+
+        :return: a list of n distinct IP addresses, in selection order.
+        """
+        if rng is None:
+            rng = _random
+        size = self.size
+        if not 0 <= n <= size:
+            raise ValueError('sample size %d invalid for IP set of size %d!'
+                % (n, size))
+
+        if size <= _sys_maxint:
+            indices = rng.sample(_iter_range(size), n)
+        else:
+            #   Only small samples are possible from populations this large,
+            #   so collisions are vanishingly rare.
+            indices = []
+            seen = set()
+            while len(indices) < n:
+                index = rng.randrange(size)
+                if index not in seen:
+                    seen.add(index)
+                    indices.append(index)
+
+        return [self[index] for index in indices]
+
+    def iter_permuted(self, key=None, start=0):
+        """
+        Visits every IP address in this IP set exactly once, in a
+        pseudo-random order selected by a key, using constant memory.
+
+        The IP set must not be modified while it is being iterated.
+
+        :param key: (optional) a non-negative integer selecting the order.
+            Default: a random key.
+
+        :param start: (optional) the number of IP addresses to skip, used
+            with the key of an earlier iterator to resume from its
+            position. Default: 0
+
+        :return: a `PermutedIterator` of `IPAddress` objects.
+        """
+        return PermutedIterator(KeyedPermutation(self.size, key),
+            self.__getitem__, start)
+
+    def split(self, n):
+        """
+        Divides this IP set into disjoint IP sets of (almost) equal size.
+
+        Shard boundaries are calculated from the running total of subnet
+        sizes so no IP addresses are enumerated. Shards hold consecutive
+        IP addresses in sorted order (IPv4 addresses first) and their sizes
+        differ by at most one.
+
+        :param n: the number of IP sets to produce.
+
+        :return: a list of n `IPSet` objects whose union is this IP set.
+        """
+        if n < 1:
+            raise ValueError('cannot split an IP set into %d parts!' % n)
+
+        cidrs, keys, totals = self._offset_index()
+        size = totals[-1] if totals else 0
+
+        shards = []
+        cidr_idx = 0
+        offset = 0
+        for i in _iter_range(n):
+            remaining = (i + 1) * size // n - i * size // n
+            ranges = []
+            while remaining:
+                cidr = cidrs[cidr_idx]
+                count = min(remaining, cidr.size - offset)
+                first = cidr.first + offset
+                ranges.append((cidr._module.version, first, first + count - 1))
+                remaining -= count
+                offset += count
+                if offset == cidr.size:
+                    cidr_idx += 1
+                    offset = 0
+
+            shard = IPSet()
+            for start, stop in _iter_merged_ranges(ranges):
+                for cidr in iprange_to_cidrs(start, stop):
+                    shard._cidrs[cidr] = True
+            shards.append(shard)
+        return shards
+
+    def aggregate(self, max_prefixes):
+        """
+        Summarizes this IP set into at most max_prefixes CIDRs, covering as
+        few additional IP addresses as possible. See `cidr_aggregate`.
+
+        :param max_prefixes: the maximum number of CIDRs in the result.
+
+        :return: a (ipset, extra) tuple of a new `IPSet` containing this one
+            and the number of IP addresses it has in addition.
+        """
+        cidrs, extra = cidr_aggregate(self.iter_cidrs(), max_prefixes)
+        return IPSet(cidrs), extra
+
     def compact(self):
         """
         Compact internal list of `IPNetwork` objects using a CIDR merge.
         """
+        if _stats.ENABLED:
+            _stats.incr('sets', 'compact')
         cidrs = cidr_merge(self._cidrs)
         self._cidrs = dict.fromkeys(cidrs, True)
+        self._offsets = None
 
     def __hash__(self):
         """
@@ -283,6 +727,7 @@ class IPSet(object):
                 iprange_to_cidrs(addr[0], addr[-1]), True)
             self._cidrs.update(new_cidrs)
             self.compact()
+            self._fill_gaps(addr)
             return
         if isinstance(addr, IPNetwork):
             # Networks like 10.1.2.3/8 need to be normalized to 10.0.0.0/8
@@ -292,6 +737,8 @@ class IPSet(object):
         else:
             addr = IPNetwork(addr)
 
+        self._fill_gaps(addr)
+        self._offsets = None
         self._cidrs[addr] = True
         self._compact_single_network(addr)
 
@@ -315,9 +762,11 @@ class IPSet(object):
 
         """
         if isinstance(addr, IPRange):
-            cidrs = iprange_to_cidrs(addr[0], addr[-1])
-            for cidr in cidrs:
-                self.remove(cidr)
+            gaps = self._gaps
+            self.difference_update(IPSet(addr))
+            if gaps is not None and addr._module.version in gaps:
+                gaps[addr._module.version].release(addr.first, addr.last)
+                self._gaps = gaps
             return
 
         if isinstance(addr, _int_type):
@@ -345,12 +794,17 @@ class IPSet(object):
 
         #   Replace matching CIDR with remaining CIDR elements.
         if remainder is not None:
+            self._offsets = None
             del self._cidrs[matching_cidr]
             for cidr in remainder:
                 self._cidrs[cidr] = True
                 # No call to self.compact() is needed. Removing an IPNetwork cannot
                 # create mergable networks.
 
+        if self._gaps is not None and addr._module.version in self._gaps:
+            addr = IPNetwork(addr)
+            self._gaps[addr._module.version].release(addr.first, addr.last)
+
     def pop(self):
         """
         Removes and returns an arbitrary IP address or subnet from this IP
@@ -358,7 +812,11 @@ class IPSet(object):
 
         :return: An IP address or subnet.
         """
-        return self._cidrs.popitem()[0]
+        cidr = self._cidrs.popitem()[0]
+        self._offsets = None
+        if self._gaps is not None and cidr._module.version in self._gaps:
+            self._gaps[cidr._module.version].release(cidr.first, cidr.last)
+        return cidr
 
     def isdisjoint(self, other):
         """
@@ -368,8 +826,28 @@ class IPSet(object):
             or subnets) in common with other. Intersection *must* be an
             empty set.
         """
-        result = self.intersection(other)
-        return not result
+        small, big = self, other
+        if len(small._cidrs) > len(big._cidrs):
+            small, big = big, small
+        if not small._cidrs:
+            return True
+        offsets = big._offset_index()
+        for cidr in small._cidrs:
+            start, stop = _overlapping(offsets, cidr)
+            if start < stop:
+                return False
+        return True
+
+    def _intersection_size(self, other):
+        #   The number of IP addresses in common with another IP set,
+        #   searching the larger of the two sets for each CIDR of the other.
+        small, big = self, other
+        if len(small._cidrs) > len(big._cidrs):
+            small, big = big, small
+        if not small._cidrs:
+            return 0
+        offsets = big._offset_index()
+        return sum([_overlap_size(offsets, cidr) for cidr in small._cidrs])
 
     def copy(self):
         """:return: a shallow copy of this IP set."""
@@ -389,6 +867,8 @@ class IPSet(object):
             for supported constant values.
 
         """
+        self._gaps = None
+        self._offsets = None
         if isinstance(iterable, IPSet):
             self._cidrs = dict.fromkeys(
                 (ip for ip in cidr_merge(_dict_keys(self._cidrs)
@@ -415,6 +895,8 @@ class IPSet(object):
     def clear(self):
         """Remove all IP addresses and subnets from this IP set."""
         self._cidrs = {}
+        self._gaps = None
+        self._offsets = None
 
     def __eq__(self, other):
         """
@@ -459,10 +941,13 @@ class IPSet(object):
         :return: ``True`` if every IP address and subnet in this IP set
             is found within ``other``.
         """
-        for cidr in self._cidrs:
-            if cidr not in other:
-                return False
-        return True
+        if not hasattr(other, '_cidrs'):
+            for cidr in self._cidrs:
+                if cidr not in other:
+                    return False
+            return True
+
+        return self._intersection_size(other) == self.size
 
     __le__ = issubset
 
@@ -488,10 +973,7 @@ class IPSet(object):
         if not hasattr(other, '_cidrs'):
             return NotImplemented
 
-        for cidr in other._cidrs:
-            if cidr not in self:
-                return False
-        return True
+        return self._intersection_size(other) == other.size
 
     __ge__ = issuperset
 
@@ -508,17 +990,30 @@ class IPSet(object):
 
     __or__ = union
 
-    def intersection(self, other):
-        """
-        :param other: an IP set.
-
-        :return: the intersection of this IP set and another as a new IP set.
-            (IP addresses and subnets common to both sets).
-        """
+    def _intersection_cidrs(self, other):
+        #   The CIDRs of the intersection of this IP set and another.
         result_cidrs = {}
 
-        own_nets = sorted(self._cidrs)
-        other_nets = sorted(other._cidrs)
+        small, big = self, other
+        if len(small._cidrs) > len(big._cidrs):
+            small, big = big, small
+        if len(small._cidrs) * _ASYMMETRY_RATIO < len(big._cidrs):
+            #   Search the larger set for each CIDR of the smaller one.
+            offsets = big._offset_index()
+            big_nets = offsets[0]
+            for cidr in small._cidrs:
+                start, stop = _overlapping(offsets, cidr)
+                if start == stop:
+                    continue
+                if _contains(big_nets[start], cidr):
+                    result_cidrs[cidr] = True
+                else:
+                    for idx in _iter_range(start, stop):
+                        result_cidrs[big_nets[idx]] = True
+            return result_cidrs
+
+        own_nets = _sorted_cidrs(self._cidrs)
+        other_nets = _sorted_cidrs(other._cidrs)
         own_idx = 0
         other_idx = 0
         own_len = len(own_nets)
@@ -546,27 +1041,30 @@ class IPSet(object):
 
         # We ran out of networks in own_nets or other_nets. Either way, there
         # can be no further result_cidrs.
-        result = IPSet()
-        result._cidrs = result_cidrs
-        return result
+        return result_cidrs
 
-    __and__ = intersection
-
-    def symmetric_difference(self, other):
+    def intersection(self, other):
         """
         :param other: an IP set.
 
-        :return: the symmetric difference of this IP set and another as a new
-            IP set (all IP addresses and subnets that are in exactly one
-            of the sets).
+        :return: the intersection of this IP set and another as a new IP set.
+            (IP addresses and subnets common to both sets).
         """
+        result = IPSet()
+        result._cidrs = self._intersection_cidrs(other)
+        return result
+
+    __and__ = intersection
+
+    def _symmetric_difference_cidrs(self, other):
+        #   The CIDRs of the symmetric difference of this IP set and another.
         # In contrast to intersection() and difference(), we cannot construct
         # the result_cidrs easily. Some cidrs may have to be merged, e.g. for
         # IPSet(["10.0.0.0/32"]).symmetric_difference(IPSet(["10.0.0.1/32"])).
         result_ranges = []
 
-        own_nets = sorted(self._cidrs)
-        other_nets = sorted(other._cidrs)
+        own_nets = _sorted_cidrs(self._cidrs)
+        other_nets = _sorted_cidrs(other._cidrs)
         own_idx = 0
         other_idx = 0
         own_len = len(own_nets)
@@ -611,15 +1109,78 @@ class IPSet(object):
                                   other_cur.first, other_cur.last))
             other_idx += 1
 
-        result = IPSet()
+        result_cidrs = {}
         for start, stop in _iter_merged_ranges(result_ranges):
             cidrs = iprange_to_cidrs(start, stop)
             for cidr in cidrs:
-                result._cidrs[cidr] = True
+                result_cidrs[cidr] = True
+        return result_cidrs
+
+    def symmetric_difference(self, other):
+        """
+        :param other: an IP set.
+
+        :return: the symmetric difference of this IP set and another as a new
+            IP set (all IP addresses and subnets that are in exactly one
+            of the sets).
+        """
+        result = IPSet()
+        result._cidrs = self._symmetric_difference_cidrs(other)
         return result
 
     __xor__ = symmetric_difference
 
+    def _difference_cidrs(self, other, in_place=False):
+        #   The CIDRs of the difference between this IP set and another. If
+        #   in_place is True, the CIDRs of this set may be modified directly.
+        result_ranges = []
+        result_cidrs = {}
+
+        own_len = len(self._cidrs)
+        other_len = len(other._cidrs)
+        if own_len * _ASYMMETRY_RATIO < other_len:
+            #   Search the other (larger) set for each of our CIDRs.
+            offsets = other._offset_index()
+            other_nets = offsets[0]
+            for own_cur in _sorted_cidrs(self._cidrs):
+                start, stop = _overlapping(offsets, own_cur)
+                if start == stop:
+                    result_cidrs[own_cur] = True
+                elif not _contains(other_nets[start], own_cur):
+                    _subtract(own_cur, other_nets, start, result_ranges)
+        elif other_len * _ASYMMETRY_RATIO < own_len:
+            #   Search this (larger) set for each of the other's CIDRs,
+            #   replacing only the CIDRs they overlap.
+            if in_place:
+                result_cidrs = self._cidrs
+            else:
+                result_cidrs = self._cidrs.copy()
+            offsets = self._offset_index()
+            own_nets = offsets[0]
+            other_nets = _sorted_cidrs(other._cidrs)
+            other_idx = 0
+            while other_idx < other_len:
+                other_cur = other_nets[other_idx]
+                start, stop = _overlapping(offsets, other_cur)
+                if start < stop and own_nets[start] != other_cur \
+                        and _contains(own_nets[start], other_cur):
+                    own_cur = own_nets[start]
+                    del result_cidrs[own_cur]
+                    other_idx = _subtract(own_cur, other_nets, other_idx,
+                                          result_ranges)
+                    continue
+                for idx in _iter_range(start, stop):
+                    del result_cidrs[own_nets[idx]]
+                other_idx += 1
+        else:
+            self._merge_difference(other, result_cidrs, result_ranges)
+
+        for start, stop in _iter_merged_ranges(result_ranges):
+            for cidr in iprange_to_cidrs(start, stop):
+                result_cidrs[cidr] = True
+
+        return result_cidrs
+
     def difference(self, other):
         """
         :param other: an IP set.
@@ -628,11 +1189,120 @@ class IPSet(object):
             set (all IP addresses and subnets that are in this IP set but
             not found in the other.)
         """
-        result_ranges = []
-        result_cidrs = {}
+        result = IPSet()
+        result._cidrs = self._difference_cidrs(other)
+        return result
+
+    __sub__ = difference
+
+    def _replace_cidrs(self, cidrs):
+        self._cidrs = cidrs
+        self._gaps = None
+        self._offsets = None
+
+    def intersection_update(self, other):
+        """
+        Update this IP set, keeping only the IP addresses and subnets also
+        found in other, without creating an intermediate IP set.
+
+        :param other: an IP set or an iterable containing IP addresses and
+            subnets.
+        """
+        if not isinstance(other, IPSet):
+            other = IPSet(other)
+        self._replace_cidrs(self._intersection_cidrs(other))
 
-        own_nets = sorted(self._cidrs)
-        other_nets = sorted(other._cidrs)
+    def difference_update(self, other):
+        """
+        Update this IP set, removing all the IP addresses and subnets found
+        in other, without creating an intermediate IP set.
+
+        When other is much smaller than this set, only the subnets it
+        overlaps are replaced.
+
+        :param other: an IP set or an iterable containing IP addresses and
+            subnets.
+        """
+        if not isinstance(other, IPSet):
+            other = IPSet(other)
+        self._replace_cidrs(self._difference_cidrs(other, in_place=True))
+
+    def symmetric_difference_update(self, other):
+        """
+        Update this IP set, keeping only the IP addresses and subnets found
+        in exactly one of this set and other, without creating an
+        intermediate IP set.
+
+        :param other: an IP set or an iterable containing IP addresses and
+            subnets.
+        """
+        if not isinstance(other, IPSet):
+            other = IPSet(other)
+        if len(other._cidrs) * _ASYMMETRY_RATIO < len(self._cidrs):
+            #   Remove the overlapping subnets in place, then merge in the
+            #   (few) subnets only found in other.
+            added = other._difference_cidrs(self)
+            self.difference_update(other)
+            for cidr in added:
+                #   Merging modifies the network, which may belong to other.
+                cidr = IPNetwork(cidr)
+                self._cidrs[cidr] = True
+                self._merge_with_siblings(cidr)
+        else:
+            self._replace_cidrs(self._symmetric_difference_cidrs(other))
+
+    def __ior__(self, other):
+        """
+        :param other: an IP set.
+
+        :return: this IP set, updated with the union of itself and other.
+        """
+        if not hasattr(other, '_cidrs'):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        """
+        :param other: an IP set.
+
+        :return: this IP set, updated with the intersection of itself and
+            other.
+        """
+        if not hasattr(other, '_cidrs'):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        """
+        :param other: an IP set.
+
+        :return: this IP set, updated with the difference between itself
+            and other.
+        """
+        if not hasattr(other, '_cidrs'):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        """
+        :param other: an IP set.
+
+        :return: this IP set, updated with the symmetric difference of
+            itself and other.
+        """
+        if not hasattr(other, '_cidrs'):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+
+    def _merge_difference(self, other, result_cidrs, result_ranges):
+        #   The difference of two IP sets of similar sizes, walking both
+        #   sorted lists of CIDRs together.
+        own_nets = _sorted_cidrs(self._cidrs)
+        other_nets = _sorted_cidrs(other._cidrs)
         own_idx = 0
         other_idx = 0
         own_len = len(own_nets)
@@ -664,16 +1334,6 @@ class IPSet(object):
             result_cidrs[own_nets[own_idx]] = True
             own_idx += 1
 
-        for start, stop in _iter_merged_ranges(result_ranges):
-            for cidr in iprange_to_cidrs(start, stop):
-                result_cidrs[cidr] = True
-
-        result = IPSet()
-        result._cidrs = result_cidrs
-        return result
-
-    __sub__ = difference
-
     def __len__(self):
         """
         :return: the cardinality of this IP set (i.e. sum of individual IP \
@@ -693,6 +1353,9 @@ class IPSet(object):
         The cardinality of this IP set (based on the number of individual IP
         addresses including those implicitly defined in subnets).
         """
+        if self._offsets is not None:
+            totals = self._offsets[2]
+            return totals[-1] if totals else 0
         return sum([cidr.size for cidr in self._cidrs])
 
     def __repr__(self):
@@ -746,3 +1409,189 @@ class IPSet(object):
 
         for start, stop in _iter_merged_ranges(sorted_ranges):
             yield IPRange(start, stop)
+
+
+#   The array type code used to buffer IPv4 addresses (32 bits or more).
+_IPV4_TYPECODE = 'I'
+if _array(_IPV4_TYPECODE).itemsize < 4:
+    _IPV4_TYPECODE = 'L'
+
+
+def _iter_int_cidrs(first, last, width):
+    """
+    :return: an iterator over (value, prefixlen) tuples of the CIDRs exactly
+        covering the integer range first..last (inclusive).
+    """
+    while first <= last:
+        if first:
+            numbits = num_bits(first & -first) - 1
+        else:
+            numbits = width
+        span = num_bits(last - first + 1) - 1
+        if span < numbits:
+            numbits = span
+        yield first, width - numbits
+        first += 1 << numbits
+
+
+def _merge_int_ranges(ranges):
+    #   Merge sorted (first, last) tuples that overlap or are adjacent.
+    merged = []
+    for first, last in ranges:
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1][1] = last
+        else:
+            merged.append([first, last])
+    return merged
+
+
+class IPSetBuilder(object):
+    """
+    Collects many IP addresses and subnets to create an `IPSet` from.
+
+    Individual IP addresses are buffered as integers (IPv4 addresses in a
+    compact ``array``) and are only sorted, merged and turned into CIDRs
+    once, when `build` is called. This is much faster than calling
+    `IPSet.add` for each address, which compacts the set every time.
+    """
+    __slots__ = ('_hosts', '_ranges', '_flags', '_count')
+
+    def __init__(self, iterable=None, flags=0):
+        """
+        Constructor.
+
+        :param iterable: (optional) an iterable containing IP addresses and
+            subnets.
+
+        :param flags: decides which rules are applied to the interpretation
+            of IP address strings and integers. See the netaddr.core
+            namespace documentation for supported constant values.
+        """
+        self._flags = flags
+        self._hosts = {4: _array(_IPV4_TYPECODE), 6: []}
+        #   Per IP version: a list of (first, last) tuples of subnets and
+        #   ranges.
+        self._ranges = {4: [], 6: []}
+        self._count = 0
+        if iterable is not None:
+            self.extend(iterable)
+
+    def append(self, addr):
+        """
+        Adds an IP address or subnet.
+
+        :param addr: an IP address or subnet in string or object form, an
+            unsigned integer or an `IPRange` object.
+        """
+        if isinstance(addr, _int_type):
+            if 0 <= addr <= _ipv4.max_int:
+                self._hosts[4].append(addr)
+            elif _ipv4.max_int < addr <= _ipv6.max_int:
+                self._hosts[6].append(addr)
+            else:
+                raise AddrFormatError('failed to detect a valid IP address '
+                    'from %r' % addr)
+        elif isinstance(addr, IPAddress):
+            self._hosts[addr._module.version].append(addr._value)
+        elif isinstance(addr, (IPNetwork, IPRange)):
+            self._ranges[addr._module.version].append(
+                (addr.first, addr.last))
+        elif _is_str(addr):
+            #   Parsed by the same rules as IPNetwork (and so IPSet), just
+            #   without creating an object.
+            module = _ipv4
+            if ':' in addr:
+                module = _ipv6
+            try:
+                value, prefixlen = parse_ip_network(module, addr,
+                    flags=self._flags)
+            except AddrFormatError:
+                raise AddrFormatError('invalid IPNetwork %s' % addr)
+            if prefixlen == module.width:
+                self._hosts[module.version].append(value)
+            else:
+                first = value & module.prefix_to_netmask[prefixlen]
+                self._ranges[module.version].append(
+                    (first, first | module.prefix_to_hostmask[prefixlen]))
+        else:
+            addr = IPNetwork(addr, flags=self._flags)
+            self._ranges[addr._module.version].append(
+                (addr.first, addr.last))
+        self._count += 1
+
+    def extend(self, iterable):
+        """
+        Adds many IP addresses and subnets.
+
+        :param iterable: an iterable containing IP addresses and subnets (see
+            `append` for the types accepted).
+        """
+        append = self.append
+        ipv4_hosts = self._hosts[4]
+        max_int = _ipv4.max_int
+        for addr in iterable:
+            #   Fast path for the most common case, IPv4 integers.
+            if isinstance(addr, _int_type) and 0 <= addr <= max_int:
+                ipv4_hosts.append(addr)
+                self._count += 1
+            else:
+                append(addr)
+
+    def __len__(self):
+        """
+        :return: the number of IP addresses and subnets added, including
+            duplicates.
+        """
+        return self._count
+
+    def _merged_ranges(self, version):
+        #   :return: the sorted, merged [first, last] ranges of a version.
+        runs = []
+        start = last = None
+        for value in sorted(self._hosts[version]):
+            if last is not None and value <= last + 1:
+                last = value
+                continue
+            if last is not None:
+                runs.append((start, last))
+            start = last = value
+        if last is not None:
+            runs.append((start, last))
+
+        ranges = self._ranges[version]
+        if not ranges:
+            return [list(run) for run in runs]
+        runs.extend(ranges)
+        runs.sort()
+        return _merge_int_ranges(runs)
+
+    def build(self):
+        """
+        :return: a new, compacted `IPSet` of all IP addresses and subnets
+            added. The builder is left unchanged, so more addresses may be
+            added to build further IP sets.
+        """
+        cidrs = {}
+        for module in (_ipv4, _ipv6):
+            version = module.version
+            width = module.width
+            for first, last in self._merged_ranges(version):
+                if first == last:
+                    cidrs[IPNetwork((first, width), version=version)] = True
+                    continue
+                for value, prefixlen in _iter_int_cidrs(first, last, width):
+                    cidrs[IPNetwork((value, prefixlen), version=version)] = True
+        ipset = IPSet()
+        ipset._replace_cidrs(cidrs)
+        return ipset
+
+    def clear(self):
+        """Removes all IP addresses and subnets added."""
+        self._hosts = {4: _array(_IPV4_TYPECODE), 6: []}
+        self._ranges = {4: [], 6: []}
+        self._count = 0
+
+    def __repr__(self):
+        """:return: a summary of this builder."""
+        return '<%s with %d entries>' % (self.__class__.__name__, self._count)
@@ -0,0 +1,67 @@
+#-----------------------------------------------------------------------------
+#   Copyright (c) 2008-2016, David P. D. Moss. All rights reserved.
+#
+#   Released under the BSD license. See the LICENSE file for details.
+#-----------------------------------------------------------------------------
+"""
+Opt-in runtime counters for netaddr internals.
+
+Counting is disabled by default. Once enabled with `enable`, netaddr counts
+object constructions, IP version detection fallbacks, IEEE registry reads
+and IP set compactions, grouped by module. Use `snapshot` to read them.
+
+While disabled, instrumented code only pays for a single attribute check.
+"""
+
+#: ``True`` while counting is enabled. Use `enable` and `disable` to change.
+ENABLED = False
+
+_counters = {}
+
+
+def enable():
+    """Starts counting. Existing counts are kept (see `reset`)."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """Stops counting. Existing counts are kept (see `reset`)."""
+    global ENABLED
+    ENABLED = False
+
+
+def is_enabled():
+    """:return: ``True`` if counting is enabled, ``False`` otherwise."""
+    return ENABLED
+
+
+def reset():
+    """Sets all counts back to zero."""
+    _counters.clear()
+
+
+def incr(module, name, count=1):
+    """
+    Increments a counter. Callers should check `ENABLED` first so that
+    disabled counting costs as little as possible.
+
+    :param module: the name of the module the counter belongs to.
+
+    :param name: the name of the counter.
+
+    :param count: (optional) the amount to add. Default: 1
+    """
+    key = (module, name)
+    _counters[key] = _counters.get(key, 0) + count
+
+
+def snapshot():
+    """
+    :return: a dictionary of the current counts, keyed by module name then
+        counter name, e.g. ``{'ip': {'IPAddress': 3}}``.
+    """
+    counts = {}
+    for (module, name), count in _counters.items():
+        counts.setdefault(module, {})[name] = count
+    return counts
@@ -129,6 +129,95 @@ def str_to_int(addr, flags=0):
         raise AddrFormatError('%r is not a valid IPv4 address string!' % addr)
 
 
+#   Characters found in the IPv4 address strings inet_aton() accepts, other
+#   than those followed by whitespace (anything after it is ignored).
+_ATON_CHARS = frozenset('0123456789abcdefABCDEFxX.')
+
+#   Characters found in the IPv4 address strings inet_pton() accepts.
+_PTON_CHARS = frozenset('0123456789.')
+
+#   Characters that are never ignored by inet_aton() or int(). Strings made
+#   up of these alone are only valid if the stricter character sets match.
+_PLAIN_CHARS = frozenset('0123456789abcdefghijklmnopqrstuvwxyz'
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ.:/%')
+
+_unpack_int = _struct.Struct('>I').unpack
+
+
+def parse_str(addr, flags=0):
+    """
+    Like `str_to_int` but returns ``None`` for invalid input instead of
+    raising an exception.
+
+    The characters of the string are checked first so that most invalid
+    strings (including all IPv6 addresses) are rejected without calling
+    any conversion function.
+
+    :param addr: An IPv4 dotted decimal address in string form.
+
+    :param flags: decides which rules are applied to the interpretation of the
+        addr value. Supported constants are INET_PTON and ZEROFILL. See the
+        netaddr.core docs for details.
+
+    :return: The equivalent unsigned integer for a given IPv4 address, or
+        ``None`` if it is not a valid IPv4 address string.
+    """
+    if flags & ZEROFILL:
+        #   Rarely used, defer to the full implementation.
+        try:
+            return str_to_int(addr, flags)
+        except Exception:
+            return None
+
+    if flags & INET_PTON:
+        if not _PTON_CHARS.issuperset(addr):
+            return None
+        try:
+            return _unpack_int(_inet_pton(AF_INET, addr))[0]
+        except Exception:
+            return None
+
+    if not _ATON_CHARS.issuperset(addr) and _PLAIN_CHARS.issuperset(addr):
+        return None
+    try:
+        return _unpack_int(_inet_aton(addr))[0]
+    except Exception:
+        return None
+
+
+def parse_partial_str(addr):
+    """
+    Like `expand_partial_address` followed by `str_to_int` (with INET_PTON)
+    but returns ``None`` for invalid input instead of raising an exception.
+
+    :param addr: an partial or abbreviated IPv4 address
+
+    :return: the unsigned integer for the expanded address, or ``None`` if
+        addr is not a valid partial IPv4 address.
+    """
+    if not _PTON_CHARS.issuperset(addr):
+        if _PLAIN_CHARS.issuperset(addr):
+            return None
+        #   Tokens with whitespace, signs etc. are accepted by int().
+        try:
+            return str_to_int(expand_partial_address(addr), INET_PTON)
+        except Exception:
+            return None
+
+    tokens = addr.split('.')
+    if len(tokens) > 4:
+        return None
+    int_val = 0
+    for token in tokens:
+        if not token:
+            return None
+        octet = int(token)
+        if octet > max_word:
+            return None
+        int_val = (int_val << 8) | octet
+    return int_val << (8 * (4 - len(tokens)))
+
+
 def int_to_str(int_val, dialect=None):
     """
     :param int_val: An unsigned integer.
@@ -142,6 +142,37 @@ def str_to_int(addr, flags=0):
         raise AddrFormatError('%r is not a valid IPv6 address string!' % addr)
 
 
+#   Characters found in the IPv6 address strings inet_pton() accepts.
+_PTON_CHARS = frozenset('0123456789abcdefABCDEF:.')
+
+_unpack_longs = _struct.Struct('>QQ').unpack
+
+
+def parse_str(addr, flags=0):
+    """
+    Like `str_to_int` but returns ``None`` for invalid input instead of
+    raising an exception.
+
+    The characters of the string are checked first so that most invalid
+    strings are rejected without calling any conversion function.
+
+    :param addr: An IPv6 address in string form.
+
+    :param flags: decides which rules are applied to the interpretation of the
+        addr value. Future use - currently has no effect.
+
+    :return: The equivalent unsigned integer for a given IPv6 address, or
+        ``None`` if it is not a valid IPv6 address string.
+    """
+    if not _PTON_CHARS.issuperset(addr):
+        return None
+    try:
+        high, low = _unpack_longs(_inet_pton(AF_INET6, addr))
+    except Exception:
+        return None
+    return (high << 64) | low
+
+
 def int_to_str(int_val, dialect=None):
     """
     :param int_val: An unsigned integer.
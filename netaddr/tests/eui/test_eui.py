@@ -6,7 +6,8 @@ import pytest
 
 from netaddr import (EUI, mac_unix, mac_unix_expanded, mac_cisco,
     mac_bare, mac_pgsql, eui64_unix, eui64_unix_expanded,
-    eui64_cisco, eui64_bare, OUI, IAB, IPAddress)
+    eui64_cisco, eui64_bare, OUI, IAB, IPAddress, IPNetwork, slaac_ipv6,
+    AddrFormatError)
 
 
 def test_mac_address_properties():
@@ -217,6 +218,46 @@ def test_mac_to_ipv6_link_local():
     assert mac.eui64() == EUI('00-0F-1F-FF-FE-12-E7-33')
 
 
+def test_slaac_ipv6_link_local():
+    assert slaac_ipv6(['00-0F-1F-12-E7-33', 'c8:4c:75:3d:3b:2a']) == [
+        (IPAddress('fe80::20f:1fff:fe12:e733'),),
+        (IPAddress('fe80::ca4c:75ff:fe3d:3b2a'),),
+    ]
+
+
+def test_slaac_ipv6_matches_eui_ipv6():
+    rng = random.Random(43)
+    macs = [rng.getrandbits(48) for _ in range(200)]
+    macs += [rng.getrandbits(64) | (1 << 63) for _ in range(20)]
+    prefixes = ['2001:db8:1::/64', IPNetwork('2001:db8:2::/48'),
+        0xfd000000000000000000000000000000]
+    mac_inputs = [str(EUI(mac)) for mac in macs[:100]] + \
+        [EUI(mac, dialect=mac_cisco) for mac in macs[100:150]] + macs[150:]
+
+    results = slaac_ipv6(mac_inputs, prefixes)
+    int_results = slaac_ipv6(iter(mac_inputs), prefixes, as_int=True)
+    assert len(results) == len(int_results) == len(macs)
+    for mac, addrs, ints in zip(macs, results, int_results):
+        eui = EUI(mac)
+        expected = tuple([eui.ipv6(IPNetwork(prefix).first)
+            for prefix in prefixes[:2]] + [eui.ipv6(prefixes[2])])
+        assert addrs == expected
+        assert ints == tuple([int(addr) for addr in expected])
+
+
+def test_slaac_ipv6_invalid_arguments():
+    with pytest.raises(ValueError):
+        slaac_ipv6(['00-0F-1F-12-E7-33'], ['2001:db8::1:0:0/96'])
+    with pytest.raises(ValueError):
+        slaac_ipv6(['00-0F-1F-12-E7-33'], [1 << 128])
+    with pytest.raises(TypeError):
+        slaac_ipv6(['00-0F-1F-12-E7-33'], '2001:db8::/64')
+    with pytest.raises(AddrFormatError):
+        slaac_ipv6(['00-0F-1F-12-E7-3G'])
+    with pytest.raises(AddrFormatError):
+        slaac_ipv6([-1])
+
+
 def test_iab():
     eui = EUI('00-50-C2-05-C0-00')
 
@@ -1,7 +1,10 @@
+import itertools
 import random
 
+import pytest
+
 from netaddr import iprange_to_cidrs, IPNetwork, cidr_merge, cidr_exclude, largest_matching_cidr, smallest_matching_cidr, \
-    all_matching_cidrs
+    all_matching_cidrs, cidr_aggregate, IPSet
 
 
 def test_iprange_to_cidrs_worst_case_v4():
@@ -193,3 +196,86 @@ def test_cidr_matching_v4():
 #
 #
 # }}}
+
+
+def test_cidr_aggregate_v4():
+    cidrs = ['10.0.0.0/24', '10.0.2.0/24', '10.0.3.0/25', '192.0.2.0/24',
+        '192.0.2.0/25']
+    assert cidr_aggregate(cidrs, 4) == ([IPNetwork('10.0.0.0/24'),
+        IPNetwork('10.0.2.0/24'), IPNetwork('10.0.3.0/25'),
+        IPNetwork('192.0.2.0/24')], 0)
+    assert cidr_aggregate(cidrs, 3) == ([IPNetwork('10.0.0.0/24'),
+        IPNetwork('10.0.2.0/23'), IPNetwork('192.0.2.0/24')], 128)
+    assert cidr_aggregate(cidrs, 2) == ([IPNetwork('10.0.0.0/22'),
+        IPNetwork('192.0.2.0/24')], 384)
+    assert cidr_aggregate(cidrs, 1) == ([IPNetwork('0.0.0.0/0')],
+        2 ** 32 - 1024 + 128)
+    assert cidr_aggregate([], 1) == ([], 0)
+
+    with pytest.raises(ValueError):
+        cidr_aggregate(['10.0.0.0/8', '::/64'], 1)
+
+
+def test_cidr_aggregate_covers_input_v4():
+    rng = random.Random(49)
+    for _ in range(50):
+        cidrs = [IPNetwork((0x0a000000 | rng.getrandbits(14) << 4,
+            rng.randint(24, 32))).cidr for _ in range(rng.randint(1, 40))]
+        max_prefixes = rng.randint(1, 20)
+        result, extra = cidr_aggregate(cidrs, max_prefixes)
+        original = IPSet(cidrs)
+        aggregated = IPSet(result)
+        assert len(result) <= max_prefixes
+        assert sum([cidr.size for cidr in result]) == aggregated.size
+        assert original.issubset(aggregated)
+        assert aggregated.size - original.size == extra
+
+    ipset, extra = IPSet(['192.0.2.0/26', '192.0.2.128/26']).aggregate(1)
+    assert ipset == IPSet(['192.0.2.0/24'])
+    assert extra == 128
+
+
+def _brute_force_aggregate_costs(hosts, max_prefixes):
+    #   The fewest additional addresses covered by at most k CIDRs within a
+    #   /28 holding the hosts (a bit mask of its 16 addresses), for each k.
+    blocks = []
+    for numbits in range(5):
+        for first in range(0, 16, 1 << numbits):
+            blocks.append(((1 << (1 << numbits)) - 1) << first)
+    costs = []
+    for k in range(1, max_prefixes + 1):
+        cost = None
+        for chosen in itertools.combinations(blocks, k):
+            covered = 0
+            for block in chosen:
+                covered |= block
+            if covered & hosts == hosts:
+                extra = bin(covered).count('1') - bin(hosts).count('1')
+                if cost is None or extra < cost:
+                    cost = extra
+        costs.append(cost)
+    return costs
+
+
+def test_cidr_aggregate_is_optimal():
+    rng = random.Random(49)
+    for _ in range(60):
+        cidrs = []
+        costs = {}
+        for version in rng.choice([(4,), (6,), (4, 6)]):
+            hosts = rng.getrandbits(16) | 1
+            cidrs += [IPNetwork((0x0a000000 + bit, 32)) if version == 4
+                else IPNetwork(((0x20010db8 << 96) + bit, 128))
+                for bit in range(16) if hosts >> bit & 1]
+            costs[version] = _brute_force_aggregate_costs(hosts, 3)
+        for max_prefixes in range(len(costs), len(costs) + 3):
+            if len(costs) == 1:
+                expected = list(costs.values())[0][max_prefixes - 1]
+            else:
+                expected = min([costs[4][k - 1] +
+                    costs[6][max_prefixes - k - 1]
+                    for k in range(1, max_prefixes)])
+            result, extra = cidr_aggregate(cidrs, max_prefixes)
+            assert extra == expected
+            assert len(result) <= max_prefixes
+            assert IPSet(result).size - IPSet(cidrs).size == extra
@@ -1,4 +1,4 @@
-from netaddr import IPAddress
+from netaddr import IPAddress, IPNetwork
 
 
 def test_reverse_dns_v4():
@@ -9,3 +9,49 @@ def test_reverse_dns_v6():
     assert IPAddress('fe80::feeb:daed').reverse_dns == ('d.e.a.d.b.e.e.f.0.0.0.0.0.0.0.0.'
                                                        '0.0.0.0.0.0.0.0.0.0.0.0.0.8.e.f.'
                                                        'ip6.arpa.')
+
+
+def test_iter_reverse_dns_matches_reverse_dns():
+    for cidr in ('10.1.254.0/23', '192.0.2.64/30', '192.0.2.1/32',
+                 '2001:db8::ff00/119', '::/128'):
+        net = IPNetwork(cidr)
+        assert list(net.iter_reverse_dns()) == [ip.reverse_dns for ip in net]
+
+
+def test_iter_reverse_dns_classless_v4():
+    net = IPNetwork('192.0.2.64/30')
+    assert list(net.iter_reverse_dns(classless=True)) == [
+        '64.64/30.2.0.192.in-addr.arpa.',
+        '65.64/30.2.0.192.in-addr.arpa.',
+        '66.64/30.2.0.192.in-addr.arpa.',
+        '67.64/30.2.0.192.in-addr.arpa.',
+    ]
+    #   Only applies to subnets longer than /24.
+    net = IPNetwork('192.0.2.0/24')
+    assert next(net.iter_reverse_dns(classless=True)) == \
+        '0.2.0.192.in-addr.arpa.'
+
+
+def test_reverse_zones_v4():
+    assert IPNetwork('0.0.0.0/0').reverse_zones() == ['in-addr.arpa.']
+    assert IPNetwork('10.0.0.0/8').reverse_zones() == ['10.in-addr.arpa.']
+    assert IPNetwork('192.0.2.0/24').reverse_zones() == \
+        ['2.0.192.in-addr.arpa.']
+    assert IPNetwork('10.0.0.0/22').reverse_zones() == [
+        '0.0.10.in-addr.arpa.',
+        '1.0.10.in-addr.arpa.',
+        '2.0.10.in-addr.arpa.',
+        '3.0.10.in-addr.arpa.',
+    ]
+    assert IPNetwork('192.0.2.64/26').reverse_zones() == \
+        ['64/26.2.0.192.in-addr.arpa.']
+
+
+def test_reverse_zones_v6():
+    assert IPNetwork('::/0').reverse_zones() == ['ip6.arpa.']
+    assert IPNetwork('2001:db8::/32').reverse_zones() == \
+        ['8.b.d.0.1.0.0.2.ip6.arpa.']
+    assert IPNetwork('2001:db8::/47').reverse_zones() == [
+        '0.0.0.0.8.b.d.0.1.0.0.2.ip6.arpa.',
+        '1.0.0.0.8.b.d.0.1.0.0.2.ip6.arpa.',
+    ]
@@ -0,0 +1,102 @@
+import pickle
+
+import pytest
+
+from netaddr import IPAddress, IPNetwork, FrozenIPNetwork, IPSet
+
+
+def test_frozen_ipnetwork_v4():
+    net = FrozenIPNetwork('192.0.2.130/25')
+    assert net.value == IPAddress('192.0.2.130').value
+    assert net.prefixlen == 25
+    assert net.first == IPAddress('192.0.2.128').value
+    assert net.last == IPAddress('192.0.2.255').value
+    assert net.network == IPAddress('192.0.2.128')
+    assert net.broadcast == IPAddress('192.0.2.255')
+    assert net.netmask == IPAddress('255.255.255.128')
+    assert net.hostmask == IPAddress('0.0.0.127')
+    assert net.size == 128
+    assert net.cidr == IPNetwork('192.0.2.128/25')
+    assert str(net) == '192.0.2.130/25'
+    assert repr(net) == "FrozenIPNetwork('192.0.2.130/25')"
+
+
+def test_frozen_ipnetwork_v6():
+    net = FrozenIPNetwork('fe80::dead:beef/64')
+    assert net.first == IPAddress('fe80::').value
+    assert net.last == IPAddress('fe80::ffff:ffff:ffff:ffff').value
+    assert net.size == 2 ** 64
+    assert IPAddress('fe80::1') in net
+    assert IPAddress('fe81::1') not in net
+
+
+def test_frozen_ipnetwork_is_read_only():
+    net = FrozenIPNetwork('192.0.2.0/24')
+
+    with pytest.raises(AttributeError):
+        net.value = 0
+
+    with pytest.raises(AttributeError):
+        net.prefixlen = 16
+
+    original = net
+    net += 1
+    assert net == FrozenIPNetwork('192.0.3.0/24')
+    assert original == FrozenIPNetwork('192.0.2.0/24')
+
+    net -= 2
+    assert net == FrozenIPNetwork('192.0.1.0/24')
+    assert isinstance(net, FrozenIPNetwork)
+
+    with pytest.raises(IndexError):
+        FrozenIPNetwork('0.0.0.0/24').previous()
+
+    assert FrozenIPNetwork('192.0.2.0/24').next(2) == IPNetwork('192.0.4.0/24')
+
+
+def test_frozen_ipnetwork_interoperates_with_ipnetwork():
+    frozen = FrozenIPNetwork('192.0.2.0/24')
+    mutable = IPNetwork('192.0.2.0/24')
+
+    assert frozen == mutable
+    assert hash(frozen) == hash(mutable)
+    assert frozen.key() == mutable.key()
+    assert frozen.sort_key() == mutable.sort_key()
+    assert {mutable: True}[frozen]
+
+    assert sorted([FrozenIPNetwork('192.0.2.0/25'), IPNetwork('192.0.2.0/24'),
+                   FrozenIPNetwork('10.0.0.0/8')]) == [
+        IPNetwork('10.0.0.0/8'),
+        IPNetwork('192.0.2.0/24'),
+        IPNetwork('192.0.2.0/25'),
+    ]
+
+    assert IPSet([frozen]) == IPSet([mutable])
+    assert frozen in IPSet(['192.0.0.0/16'])
+
+
+def test_frozen_ipnetwork_subnet_and_supernet():
+    net = FrozenIPNetwork('192.0.2.0/24')
+
+    subnets = list(net.subnet(26))
+    assert subnets == [
+        IPNetwork('192.0.2.0/26'),
+        IPNetwork('192.0.2.64/26'),
+        IPNetwork('192.0.2.128/26'),
+        IPNetwork('192.0.2.192/26'),
+    ]
+    assert all(isinstance(subnet, FrozenIPNetwork) for subnet in subnets)
+
+    assert net.supernet(22) == [
+        IPNetwork('192.0.0.0/22'),
+        IPNetwork('192.0.2.0/23'),
+    ]
+
+
+def test_frozen_ipnetwork_pickling():
+    net = FrozenIPNetwork('fe80::/10')
+    restored = pickle.loads(pickle.dumps(net))
+    assert restored == net
+    assert isinstance(restored, FrozenIPNetwork)
+    assert hash(restored) == hash(net)
+    assert restored.last == net.last
@@ -0,0 +1,161 @@
+import random
+
+import pytest
+
+from netaddr import ACL, ACLRule, IPAddress, IPNetwork, IPRange, AddrFormatError
+
+
+def test_acl_rule_address_forms():
+    rule = ACLRule('permit', '10.0.0.0 0.0.0.255', 'host 192.0.2.1')
+    assert rule.source == '10.0.0.0/24'
+    assert rule.destination == '192.0.2.1/32'
+    assert rule.ports is None
+    assert repr(rule) == "ACLRule('permit', '10.0.0.0/24', '192.0.2.1/32')"
+
+    rule = ACLRule('deny', '192.0.2.1-192.0.2.10', IPNetwork('192.0.2.0/24'),
+        ports=(1024, 65535))
+    assert rule.source == '192.0.2.1-192.0.2.10'
+    assert rule.destination == '192.0.2.0/24'
+    assert rule.ports == (1024, 65535)
+
+    assert ACLRule('permit', '10.0.0.1 0.0.0.0').source == '10.0.0.1/32'
+    assert ACLRule('permit', '10.0.0.0 255.255.255.255').source == '0.0.0.0/0'
+    assert ACLRule('permit', '2001:db8:: ::ffff').source == '2001:db8::/112'
+
+    assert ACLRule('deny', ports=22).ports == (22, 22)
+    assert ACLRule('deny', IPAddress('::1')).source == '::1/128'
+    assert ACLRule('deny', IPRange('::', '::ff')).source == '::/120'
+
+
+def test_acl_rule_invalid():
+    with pytest.raises(ValueError):
+        ACLRule('allow')
+    with pytest.raises(ValueError):
+        ACLRule('permit', '10.0.0.0/8', '::/0')
+    with pytest.raises(ValueError):
+        ACLRule('permit', ports=(80, 79))
+    with pytest.raises(ValueError):
+        ACLRule('permit', ports=65536)
+    with pytest.raises(AddrFormatError):
+        ACLRule('permit', '10.0.0.0 0.0.0.255 extra')
+    with pytest.raises(AddrFormatError):
+        ACLRule('permit', '10.0.0.0 255.255.255.0')
+    with pytest.raises(AddrFormatError):
+        ACLRule('permit', '10.0.0.0 0.0.1.0')
+    with pytest.raises(AddrFormatError):
+        ACLRule('permit', '10.0.0.0 ::ff')
+    with pytest.raises(AddrFormatError):
+        ACLRule('permit', '10.0.0.0 24')
+    with pytest.raises(TypeError):
+        ACLRule('permit', 42)
+    with pytest.raises(ValueError):
+        ACL(default='reject')
+
+
+def test_acl_first_match():
+    acl = ACL([
+        ('deny', 'host 10.0.0.1'),
+        ('permit', '10.0.0.0 0.0.0.255', '192.0.2.0/24', (80, 80)),
+        ('permit', '10.0.0.0/8', '192.0.2.0/24', 443),
+        ('deny', '10.0.0.0/8'),
+        ('permit', 'any', '198.51.100.1'),
+    ])
+    assert len(acl) == 5
+    assert acl.default == 'deny'
+    assert acl.check('10.0.0.1', '192.0.2.1', 80) == 'deny'
+    assert acl.check('10.0.0.2', '192.0.2.1', 80) == 'permit'
+    assert acl.check('10.0.1.2', '192.0.2.1', 80) == 'deny'
+    assert acl.check('10.0.1.2', '192.0.2.1', 443) == 'permit'
+    assert acl.check('10.0.1.2', '198.51.100.1', 443) == 'deny'
+    assert acl.check('172.16.0.1', '198.51.100.1', 443) == 'permit'
+    assert acl.check('172.16.0.1', '198.51.100.2') == 'deny'
+    assert acl.match('172.16.0.1', '198.51.100.2') is None
+    assert acl.match('10.0.0.2', '192.0.2.1', 80) is acl.rules[1]
+
+    #   Packets without a destination or port only match rules for any.
+    assert acl.check('10.0.0.2', port=80) == 'deny'
+    assert acl.match('10.0.0.2', '192.0.2.1') is acl.rules[3]
+    assert acl.match('10.0.0.2') is acl.rules[3]
+
+
+def test_acl_versions_and_default():
+    acl = ACL([('deny', '2001:db8::/32'), ('permit', 'any', '::/0')],
+        default='permit')
+    assert acl.check('2001:db8::1', '::1') == 'deny'
+    assert acl.check('2001:db9::1', '::1') == 'permit'
+    assert acl.match('2001:db9::1', '::1') is acl.rules[1]
+    assert acl.match('192.0.2.1', '192.0.2.2') is None
+    assert acl.check('192.0.2.1', '192.0.2.2') == 'permit'
+    assert ACL().check('192.0.2.1') == 'deny'
+    with pytest.raises(ValueError):
+        acl.check('192.0.2.1', '::1')
+    with pytest.raises(ValueError):
+        acl.check('192.0.2.1', '192.0.2.2', -1)
+
+
+def test_acl_shadowed_rules():
+    acl = ACL([
+        ACLRule('permit', '10.0.0.0/9'),
+        ACLRule('deny', '10.128.0.0/9'),
+        ACLRule('deny', '10.1.0.0/16', ports=22),
+        ACLRule('permit', '10.0.0.0/8', '192.0.2.0/24'),
+        ACLRule('deny', '10.0.0.0/8', '192.0.2.0/24', ports=(1, 1024)),
+        ACLRule('deny', '172.16.0.0/12', 'any'),
+        ACLRule('permit', '172.16.0.0/12', '192.0.2.0/24'),
+    ])
+    assert acl.shadowed == [(2, [0]), (3, [0, 1]), (4, [0, 1]), (6, [5])]
+    assert ACL([('permit', '10.0.0.0/8')]).shadowed == []
+
+
+def _brute_force(rules, source, destination, port):
+    for rule in rules:
+        if rule._source is not None and not (rule._source[0] == source.version
+                and rule._source[1] <= int(source) <= rule._source[2]):
+            continue
+        if rule._destination is not None:
+            if destination is None or not (
+                    rule._destination[0] == destination.version and
+                    rule._destination[1] <= int(destination)
+                    <= rule._destination[2]):
+                continue
+        if rule._ports is not None:
+            if port is None or not (
+                    rule._ports[0] <= port <= rule._ports[1]):
+                continue
+        return rule
+    return None
+
+
+def test_acl_matches_brute_force():
+    rng = random.Random(47)
+
+    def random_network():
+        if rng.random() < 0.15:
+            return 'any'
+        prefixlen = rng.randint(20, 32)
+        return str(IPNetwork((0x0a000000 | rng.getrandbits(12) << 8
+            | rng.getrandbits(8), prefixlen)).cidr)
+
+    rules = []
+    for _ in range(150):
+        ports = None
+        if rng.random() < 0.4:
+            first = rng.randint(0, 100)
+            ports = (first, first + rng.randint(0, 20))
+        rules.append(ACLRule(rng.choice(['permit', 'deny']), random_network(),
+            random_network(), ports))
+    acl = ACL(rules)
+
+    for _ in range(3000):
+        source = IPAddress(0x0a000000 | rng.getrandbits(20))
+        destination = IPAddress(0x0a000000 | rng.getrandbits(20))
+        if rng.random() < 0.1:
+            destination = None
+        port = rng.choice([None, rng.randint(0, 130)])
+        expected = _brute_force(rules, source, destination, port)
+        assert acl.match(source, destination, port) is expected
+
+    shadowed = set([index for index, _ in acl.shadowed])
+    for index, shadows in acl.shadowed:
+        assert shadows and max(shadows) < index
+    assert len(shadowed) < len(rules)
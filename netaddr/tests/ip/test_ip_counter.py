@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from netaddr import IPAddress, IPNetwork, PrefixCounter
+
+
+def test_prefix_counter_exact_counts():
+    counter = PrefixCounter([8, 24, 32])
+    assert counter.prefixlens == [8, 24, 32]
+    assert counter.version == 4
+    counter.update(['192.0.2.1', IPAddress('192.0.2.1'), 0xc0000202,
+        '10.0.0.1'])
+    counter.add('192.0.2.1', count=2)
+    assert counter.total == 6
+
+    assert counter.most_common(32) == [(IPNetwork('192.0.2.1/32'), 4),
+        (IPNetwork('10.0.0.1/32'), 1), (IPNetwork('192.0.2.2/32'), 1)]
+    assert counter.most_common(24, 1) == [(IPNetwork('192.0.2.0/24'), 5)]
+    assert counter.most_common(8) == [(IPNetwork('192.0.0.0/8'), 5),
+        (IPNetwork('10.0.0.0/8'), 1)]
+    assert counter['192.0.2.0/24'] == 5
+    assert counter['198.51.100.0/24'] == 0
+    assert counter.error('192.0.2.0/24') == 0
+
+    counter.clear()
+    assert counter.total == 0
+    assert counter.most_common(8) == []
+
+
+def test_prefix_counter_ipv6_defaults():
+    counter = PrefixCounter(version=6)
+    assert counter.prefixlens == list(range(16, 65))
+    counter.update(['2001:db8::1', '2001:db8:0:1::1', 1])
+    assert counter.most_common(48, 1) == [(IPNetwork('2001:db8::/48'), 2)]
+    assert counter['2001:db8::/64'] == 1
+    assert counter['::/16'] == 1
+
+
+def test_prefix_counter_invalid():
+    with pytest.raises(ValueError):
+        PrefixCounter(version=5)
+    with pytest.raises(ValueError):
+        PrefixCounter([33])
+    with pytest.raises(ValueError):
+        PrefixCounter([])
+    with pytest.raises(ValueError):
+        PrefixCounter(capacity=0)
+
+    counter = PrefixCounter([16])
+    with pytest.raises(ValueError):
+        counter.add(1 << 32)
+    with pytest.raises(ValueError):
+        counter.update([0, -1])
+    with pytest.raises(ValueError):
+        counter.add(0, count=0)
+    with pytest.raises(ValueError):
+        counter.most_common(24)
+    with pytest.raises(ValueError):
+        counter['10.0.0.0/8']
+
+
+def test_prefix_counter_bounded_memory():
+    rng = random.Random(50)
+    hot = [0x0a000000, 0xc0000200, 0xc6336400]
+    addrs = []
+    for _ in range(20000):
+        if rng.random() < 0.3:
+            addrs.append(rng.choice(hot) | rng.getrandbits(8))
+        else:
+            addrs.append(rng.getrandbits(32))
+
+    counter = PrefixCounter([16, 24, 32], capacity=50)
+    counter.update(addrs[:10000])
+    for addr in addrs[10000:]:
+        counter.add(addr)
+    assert counter.total == len(addrs)
+
+    for prefixlen in (16, 24, 32):
+        exact = {}
+        for addr in addrs:
+            key = addr >> (32 - prefixlen)
+            exact[key] = exact.get(key, 0) + 1
+        results = counter.most_common(prefixlen)
+        assert len(results) <= 50
+        for network, count in results:
+            true_count = exact[network.first >> (32 - prefixlen)]
+            assert true_count <= count <= true_count + counter.error(network)
+            assert counter.error(network) <= len(addrs) // 50
+
+    assert sorted([network for network, _ in counter.most_common(24, 3)]) \
+        == [IPNetwork('10.0.0.0/24'), IPNetwork('192.0.2.0/24'),
+            IPNetwork('198.51.100.0/24')]
+
+
+def test_prefix_counter_update_stream_bounded():
+    counter = PrefixCounter([8, 16, 24, 32], capacity=16)
+    #   The most addresses read from the stream but not yet counted.
+    pending = []
+
+    def stream(n):
+        for value in range(n):
+            pending.append(value - counter.total)
+            yield value * 2654435761 % (1 << 32)
+
+    counter.update(stream(100000))
+    assert counter.total == 100000
+    assert max(pending) <= 4096
+    for prefixlen in counter.prefixlens:
+        assert len(counter.most_common(prefixlen)) <= 16
@@ -1,5 +1,7 @@
+import pytest
+
 from netaddr import IPGlob, IPNetwork, cidr_to_glob, glob_to_cidrs, glob_to_iptuple, iprange_to_globs, IPAddress, \
-    valid_glob
+    valid_glob, GlobMatcher, AddrFormatError
 
 
 def test_ipglob_basic():
@@ -42,3 +44,44 @@ def test_invalid_glob():
     assert not valid_glob('1.1.1.1/32')
     assert not valid_glob('1.1.1.a-b')
     assert not valid_glob('1.1.a-b.*')
+
+
+def test_glob_matcher():
+    matcher = GlobMatcher([
+        '10.*.3-9.*',
+        ('192.0.2.*', 'docs'),
+        ('10.1.5.7', 42),
+        '*.*.*.255',
+    ])
+    assert len(matcher) == 4
+
+    assert matcher.match('10.1.5.7') == ['10.*.3-9.*', 42]
+    assert matcher.match(IPAddress('10.200.9.255')) == ['10.*.3-9.*', '*.*.*.255']
+    assert matcher.match(int(IPAddress('192.0.2.1'))) == ['docs']
+    assert matcher.match('10.1.2.7') == []
+    assert matcher.match('fe80::1') == []
+
+    assert matcher.first_match('10.1.5.7') == '10.*.3-9.*'
+    assert matcher.first_match('192.0.2.255') == 'docs'
+    assert matcher.first_match('11.0.0.0') is None
+
+    assert '10.0.3.0' in matcher
+    assert '10.0.10.0' not in matcher
+
+
+def test_glob_matcher_agrees_with_ipglob():
+    globs = ['192.0.2.*', '192.0.2-3.*', '10.0.0.0-31', '*.*.*.*', '172.16.1.1']
+    matcher = GlobMatcher(globs)
+    for addr in ['192.0.2.1', '192.0.3.9', '10.0.0.31', '10.0.0.32',
+                 '172.16.1.1', '0.0.0.0']:
+        assert matcher.match(addr) == [g for g in globs if IPAddress(addr) in IPGlob(g)]
+
+
+def test_glob_matcher_invalid_globs():
+    matcher = GlobMatcher()
+    for invalid in ['10.*.*', '10.*.*.256', '10.9-3.*.*', '10.a.*.*']:
+        with pytest.raises(AddrFormatError):
+            matcher.add(invalid)
+    with pytest.raises(TypeError):
+        matcher.add(None)
+    assert len(matcher) == 0
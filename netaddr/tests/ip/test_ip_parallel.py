@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from netaddr import IPNetwork, IPSet, cidr_merge, INET_PTON
+from netaddr.ip.parallel import parallel_cidr_merge, parallel_ipset
+
+
+def _random_cidrs(count, seed):
+    rng = random.Random(seed)
+    cidrs = []
+    for _ in range(count):
+        if rng.random() < 0.8:
+            value = rng.randrange(2 ** 16) << 8 | 10 << 24
+            cidrs.append(str(IPNetwork((value + rng.randrange(256), rng.randint(22, 32)))))
+        else:
+            value = 0x20010db8 << 96 | rng.randrange(2 ** 12) << 80
+            cidrs.append(IPNetwork((value, rng.randint(40, 64)), version=6))
+    return cidrs
+
+
+def test_parallel_cidr_merge_matches_cidr_merge():
+    cidrs = _random_cidrs(3000, 1)
+    expected = [cidr.cidr for cidr in cidr_merge(cidrs)]
+    assert parallel_cidr_merge(cidrs, workers=2, chunk_size=250) == expected
+    assert parallel_cidr_merge(iter(cidrs), workers=1, chunk_size=7) == expected
+
+
+def test_parallel_ipset_matches_ipset():
+    cidrs = _random_cidrs(3000, 2) + [167772161]
+    expected = IPSet(cidrs)
+    assert parallel_ipset(cidrs, workers=2, chunk_size=500) == expected
+    assert parallel_ipset(cidrs, workers=1) == expected
+    assert parallel_ipset([], workers=2) == IPSet()
+    assert parallel_ipset([1, 2], flags=INET_PTON, workers=1) == IPSet(['0.0.0.1/32', '0.0.0.2/32'])
+
+
+def test_parallel_merge_adjacent_across_chunks():
+    cidrs = ['192.0.2.%d' % i for i in range(256)] + ['::/1', '8000::/1']
+    assert parallel_cidr_merge(cidrs, workers=2, chunk_size=3) == [
+        IPNetwork('192.0.2.0/24'), IPNetwork('::/0')]
+
+
+def test_parallel_invalid_arguments():
+    with pytest.raises(ValueError):
+        parallel_cidr_merge(None)
+    with pytest.raises(ValueError):
+        parallel_ipset(['192.0.2.0/24'], chunk_size=0)
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from netaddr import (IPRangeMap, IPAddress, IPNetwork, IPRange,
+    AddrFormatError)
+
+
+def test_ip_range_map_lookup():
+    rmap = IPRangeMap([
+        (IPNetwork('10.0.0.0/8'), 'private'),
+        (IPRange('192.0.2.10', '192.0.2.20'), 'doc'),
+        ('198.51.100.0-198.51.100.9', 'doc2'),
+        ((IPAddress('203.0.113.0'), 3405803903), 'doc3'),
+        ('2001:db8::', '2001:db8::ffff', 'v6'),
+    ])
+    assert len(rmap) == 5
+    assert rmap.lookup('10.1.2.3') == 'private'
+    assert rmap.lookup(IPAddress('192.0.2.10')) == 'doc'
+    assert rmap.lookup('192.0.2.20') == 'doc'
+    assert rmap.lookup('192.0.2.21') is None
+    assert rmap.lookup('192.0.2.9', 'none') == 'none'
+    assert rmap.lookup('198.51.100.9') == 'doc2'
+    assert rmap.lookup('203.0.113.127') == 'doc3'
+    assert rmap.lookup('2001:db8::1') == 'v6'
+    assert rmap.lookup('::ffff:10.0.0.1') is None
+    assert rmap['10.0.0.0'] == 'private'
+    with pytest.raises(KeyError):
+        rmap['11.0.0.0']
+    assert '10.255.255.255' in rmap
+    assert '11.0.0.0' not in rmap
+    assert rmap.range_of('10.1.1.1') == IPRange('10.0.0.0', '10.255.255.255')
+    assert rmap.range_of('11.0.0.0') is None
+
+
+def test_ip_range_map_integer_addresses():
+    rmap = IPRangeMap([(0, 255, 'low')])
+    assert rmap.lookup(10) == 'low'
+    assert rmap.lookup('0.0.0.10') == 'low'
+    assert rmap.lookup('::10') is None
+
+    rmap = IPRangeMap([(0, 255, 'low')], version=6)
+    assert rmap.lookup(10) == 'low'
+    assert rmap.lookup('::10') == 'low'
+    assert rmap.lookup('0.0.0.10') is None
+
+
+def test_ip_range_map_merges_adjacent_equal_values():
+    rmap = IPRangeMap([
+        ('192.0.2.0/25', 'a'),
+        ('192.0.2.128/25', 'a'),
+        ('192.0.3.0/24', 'b'),
+        ('192.0.4.0/24', 'a'),
+    ])
+    assert rmap.items() == [
+        (IPRange('192.0.2.0', '192.0.2.255'), 'a'),
+        (IPRange('192.0.3.0', '192.0.3.255'), 'b'),
+        (IPRange('192.0.4.0', '192.0.4.255'), 'a'),
+    ]
+
+    rmap = IPRangeMap()
+    rmap.add('192.0.2.0/26', 'a')
+    rmap.add('192.0.2.128/26', 'a')
+    rmap.add('192.0.2.64/26', 'a')
+    assert len(rmap) == 1
+    rmap.add('192.0.2.192/26', 'b')
+    rmap.add('192.0.1.0/24', 'a')
+    assert rmap.items() == [
+        (IPRange('192.0.1.0', '192.0.2.191'), 'a'),
+        (IPRange('192.0.2.192', '192.0.2.255'), 'b'),
+    ]
+
+
+def test_ip_range_map_overlaps():
+    rmap = IPRangeMap([('192.0.2.0/24', 'a')])
+    with pytest.raises(ValueError):
+        rmap.add('192.0.2.128/25', 'b')
+    with pytest.raises(ValueError):
+        rmap.add('192.0.0.0/16', 'b')
+    with pytest.raises(ValueError):
+        rmap.update([('192.0.2.255', '192.0.3.0', 'b')])
+    assert rmap.items() == [(IPRange('192.0.2.0', '192.0.2.255'), 'a')]
+    with pytest.raises(ValueError):
+        IPRangeMap([('10.0.0.0/8', 'a'), ('10.1.0.0/16', 'b')])
+    with pytest.raises(AddrFormatError):
+        IPRangeMap([('10.0.0.2', '10.0.0.1', 'a')])
+    with pytest.raises(AddrFormatError):
+        IPRangeMap([('10.0.0.2', '::1', 'a')])
+
+
+def test_ip_range_map_lookup_many_matches_linear_scan():
+    rng = random.Random(44)
+    rows = []
+    start = 0
+    for _ in range(500):
+        start += rng.randint(1, 1000)
+        end = start + rng.randint(0, 1000)
+        rows.append((start, end, rng.randint(0, 5)))
+        start = end + 1
+
+    rmap = IPRangeMap()
+    for row in rows[::2]:
+        rmap.add((row[0], row[1]), row[2])
+    rmap.update(rows[1::2])
+    assert len(rmap) <= len(rows)
+
+    queries = [rng.randint(0, start + 10) for _ in range(2000)]
+    expected = []
+    for query in queries:
+        for first, last, value in rows:
+            if first <= query <= last:
+                expected.append(value)
+                break
+        else:
+            expected.append(-1)
+    assert rmap.lookup_many(queries, -1) == expected
+    assert rmap.lookup_many([IPAddress(q) for q in queries], -1) == expected
+    assert [rmap.lookup(q, -1) for q in queries] == expected
@@ -179,9 +179,32 @@ def test_iprange_slicing():
     assert list(iprange[0:1024:512]) == [IPAddress('192.0.2.1')]
 
 
-def test_iprange_ipv6_unsupported_slicing():
-    with pytest.raises(TypeError):
-        IPRange('::ffff:192.0.2.1', '::ffff:192.0.2.254')[0:10:2]
+def test_iprange_ipv6_slicing():
+    assert list(IPRange('::ffff:192.0.2.1', '::ffff:192.0.2.254')[0:10:4]) == [
+        IPAddress('::ffff:192.0.2.1'),
+        IPAddress('::ffff:192.0.2.5'),
+        IPAddress('::ffff:192.0.2.9'),
+    ]
+
+
+def test_iprange_slice_views():
+    iprange = IPRange('192.0.2.1', '192.0.2.254')
+    view = iprange[10:]
+
+    assert len(view) == 244
+    assert view[0] == IPAddress('192.0.2.11')
+    assert IPAddress('192.0.2.11') in view
+    assert '192.0.2.10' not in view
+    assert view.index('192.0.2.20') == 9
+
+    nested = view[::10][2:4]
+    assert list(nested) == [IPAddress('192.0.2.31'), IPAddress('192.0.2.41')]
+    assert list(reversed(nested)) == [IPAddress('192.0.2.41'), IPAddress('192.0.2.31')]
+    assert list(nested.iter_ints()) == [3221226015, 3221226025]
+    assert list(nested.iter_ints(reverse=True)) == [3221226025, 3221226015]
+
+    assert len(iprange[5:2]) == 0
+    assert list(iprange[5:2]) == []
 
 
 def test_iprange_membership():
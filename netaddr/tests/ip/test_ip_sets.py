@@ -1,8 +1,10 @@
 import pickle
+import random
 
 import pytest
 
-from netaddr import IPAddress, IPNetwork, IPRange, IPSet, cidr_exclude
+from netaddr import (IPAddress, IPNetwork, IPRange, IPSet, IPSetBuilder,
+    AddrFormatError, ZEROFILL, cidr_exclude)
 from netaddr.compat import _sys_maxint
 
 
@@ -563,3 +565,345 @@ def test_ipset_converts_to_cidr_networks_v6():
         IPNetwork('fe80::/64'),
         IPNetwork('fe90::/64'),
     ]
+
+
+def test_ipset_find_free():
+    used = IPSet(['10.0.0.0/25', '10.0.0.192/26', '10.0.1.0/24', '10.0.3.0/30'])
+    pool = '10.0.0.0/22'
+
+    assert used.find_free(26, within=pool) == IPNetwork('10.0.0.128/26')
+    assert used.find_free(24, within=pool) == IPNetwork('10.0.2.0/24')
+    assert used.find_free(23, within=pool) is None
+    assert used.find_free(30, within=pool) == IPNetwork('10.0.0.128/30')
+    assert used.find_free(30, within=pool, best_fit=True) == IPNetwork('10.0.0.128/30')
+    assert used.find_free(30, within='10.0.3.0/24') == IPNetwork('10.0.3.4/30')
+    assert used.find_free(16, within=pool) is None
+    assert used.find_free(24, within='192.0.2.0/24') == IPNetwork('192.0.2.0/24')
+    assert used.find_free(64, within='2001:db8::/32') == IPNetwork('2001:db8::/64')
+
+    with pytest.raises(ValueError):
+        used.find_free(33, within=pool)
+
+
+def test_ipset_find_free_best_fit():
+    used = IPSet(['10.0.0.0/26', '10.0.0.128/25', '10.0.1.0/25', '10.0.1.192/26'])
+    # Free: 10.0.0.64/26 and 10.0.1.128/26 plus 10.0.2.0/23.
+    assert used.find_free(28, within='10.0.0.0/22') == IPNetwork('10.0.0.64/28')
+    assert used.find_free(28, within='10.0.0.0/22', best_fit=True) == IPNetwork('10.0.0.64/28')
+
+    used.add('10.0.0.64/27')
+    assert used.find_free(27, within='10.0.0.0/22') == IPNetwork('10.0.0.96/27')
+    assert used.find_free(26, within='10.0.0.0/22') == IPNetwork('10.0.1.128/26')
+
+    used.add('10.0.2.0/24')
+    assert used.find_free(25, within='10.0.0.0/22') == IPNetwork('10.0.3.0/25')
+    assert used.find_free(26, within='10.0.0.0/22', best_fit=True) == IPNetwork('10.0.1.128/26')
+
+
+def test_ipset_find_free_tracks_incremental_changes():
+    rng = random.Random(7)
+    used = IPSet()
+    pool = IPNetwork('10.0.0.0/20')
+    allocated = []
+
+    for _ in range(300):
+        if allocated and rng.random() < 0.3:
+            cidr = allocated.pop(rng.randrange(len(allocated)))
+            used.remove(cidr)
+        else:
+            prefixlen = rng.randint(24, 30)
+            best_fit = rng.random() < 0.5
+            cidr = used.find_free(prefixlen, within=pool, best_fit=best_fit)
+            free = [c for c in pool.subnet(prefixlen)
+                    if IPSet([c]).isdisjoint(used)]
+            if not free:
+                assert cidr is None
+                continue
+            if not best_fit:
+                assert cidr == free[0]
+            assert cidr in free
+            used.add(cidr)
+            allocated.append(cidr)
+
+    while allocated:
+        used.remove(allocated.pop())
+    assert used.find_free(20, within=pool) == pool
+
+
+def test_ipset_indexing():
+    s = IPSet(['192.0.2.0/30', '10.0.0.5', '192.0.2.8/31', '::/126'])
+    addrs = list(s)
+    assert len(addrs) == 11
+    for i, addr in enumerate(addrs):
+        assert s[i] == addr
+        assert s.index(addr) == i
+    assert s[-1] == IPAddress('::3')
+    assert s[-11] == IPAddress('10.0.0.5')
+
+    with pytest.raises(IndexError):
+        s[11]
+    with pytest.raises(IndexError):
+        s[-12]
+    with pytest.raises(IndexError):
+        IPSet()[0]
+    with pytest.raises(TypeError):
+        s['0']
+    with pytest.raises(ValueError):
+        s.index('192.0.2.4')
+    with pytest.raises(ValueError):
+        s.index('0.0.0.1')
+
+    s.add('192.0.2.4/30')
+    assert s[4] == IPAddress('192.0.2.3')
+    assert s[5] == IPAddress('192.0.2.4')
+    assert s.index('192.0.2.8') == 9
+    s.remove('10.0.0.5')
+    assert s[0] == IPAddress('192.0.2.0')
+    assert s.index('::3') == 13
+
+
+def test_ipset_indexing_ipv6_large():
+    s = IPSet(['2001:db8::/32', 'fe80::/10'])
+    size = 2 ** 96 + 2 ** 118
+    assert s.size == size
+    assert s[2 ** 96] == IPAddress('fe80::')
+    assert s[2 ** 96 - 1] == IPAddress('2001:db8:ffff:ffff:ffff:ffff:ffff:ffff')
+    assert s[-1] == IPAddress('febf:ffff:ffff:ffff:ffff:ffff:ffff:ffff')
+    assert s.index('fe80::1') == 2 ** 96 + 1
+
+
+def test_ipset_sample():
+    rng = random.Random(42)
+    s = IPSet(['192.0.2.0/28', '198.51.100.7', '2001:db8::/126'])
+
+    sample = s.sample(10, rng)
+    assert len(sample) == 10
+    assert len(set(sample)) == 10
+    assert all(addr in s for addr in sample)
+
+    assert sorted(s.sample(s.size, rng)) == list(s)
+    assert s.sample(0, rng) == []
+    with pytest.raises(ValueError):
+        s.sample(s.size + 1, rng)
+
+    big = IPSet(['2001:db8::/32'])
+    sample = big.sample(5, rng)
+    assert len(set(sample)) == 5
+    assert all(addr in big for addr in sample)
+
+    assert len(IPSet(['10.0.0.0/24']).sample(3)) == 3
+
+
+def test_ipset_split():
+    s = IPSet(['10.0.0.0/24', '10.0.2.0/30', '192.0.2.7', '2001:db8::/126'])
+    size = s.size
+    for n in (1, 2, 3, 7, 16, 300):
+        shards = s.split(n)
+        assert len(shards) == n
+        sizes = [shard.size for shard in shards]
+        assert sum(sizes) == size
+        assert max(sizes) - min(sizes) <= 1
+        union = IPSet()
+        for shard in shards:
+            assert union.isdisjoint(shard)
+            union |= shard
+        assert union == s
+        assert [addr for shard in shards for addr in shard] == list(s)
+
+    shards = IPSet(['192.0.2.0/24']).split(3)
+    assert shards == [
+        IPSet(['192.0.2.0/26', '192.0.2.64/28', '192.0.2.80/30',
+               '192.0.2.84/32']),
+        IPSet(['192.0.2.85/32', '192.0.2.86/31', '192.0.2.88/29',
+               '192.0.2.96/27', '192.0.2.128/27', '192.0.2.160/29',
+               '192.0.2.168/31']),
+        IPSet(['192.0.2.170/31', '192.0.2.172/30', '192.0.2.176/28',
+               '192.0.2.192/26']),
+    ]
+
+    assert IPSet().split(2) == [IPSet(), IPSet()]
+    with pytest.raises(ValueError):
+        s.split(0)
+
+
+def test_ipnetwork_and_iprange_split():
+    shards = IPNetwork('2001:db8::/32').split(3)
+    assert [shard.size for shard in shards] == [
+        2 ** 96 // 3, 2 ** 96 // 3, 2 ** 96 // 3 + 1]
+    assert shards[0].iprange().first == IPAddress('2001:db8::').value
+    assert shards[2].iprange().last == IPAddress('2001:db8:ffff:ffff:ffff:ffff:ffff:ffff').value
+
+    shards = IPRange('192.0.2.1', '192.0.2.10').split(4)
+    assert [shard.size for shard in shards] == [2, 3, 2, 3]
+    assert shards[0] == IPSet(['192.0.2.1', '192.0.2.2'])
+
+
+def test_ipset_operations_with_very_unequal_sizes():
+    rng = random.Random(45)
+    big = IPSet([IPNetwork((167772160 + rng.getrandbits(16) * 4, 30))
+        for _ in range(2000)] + ['2001:db8::/64', '2001:db8:1::1'])
+    small = IPSet(['10.0.0.0/20', '10.1.2.0/30', '10.255.0.0/16',
+        '11.0.0.0/8', '2001:db8::/32'])
+    small.add(list(big.iter_cidrs())[100])
+
+    expected_and = IPSet(cidr for cidr in big.iter_cidrs() if cidr in small)
+    expected_and.add('2001:db8::/64')
+    assert small & big == big & small == expected_and
+
+    expected_small_sub = IPSet(small)
+    for cidr in big.iter_cidrs():
+        expected_small_sub.remove(cidr)
+    assert small - big == expected_small_sub
+
+    expected_big_sub = IPSet(big)
+    for cidr in small.iter_cidrs():
+        expected_big_sub.remove(cidr)
+    assert big - small == expected_big_sub
+    assert (big - small) | (big & small) == big
+    assert (big - small).isdisjoint(small)
+    assert not big.isdisjoint(small)
+    assert IPSet(['192.0.2.0/24']).isdisjoint(big)
+    assert big.isdisjoint(IPSet())
+    assert IPSet().isdisjoint(IPSet())
+
+
+def test_ipset_subset_and_superset_by_size():
+    big = IPSet([IPNetwork((167772160 + i * 8, 29)) for i in range(0, 4000, 2)])
+    assert big <= IPSet(['10.0.0.0/8'])
+    assert big.issubset(IPSet(['10.0.0.0/8']))
+    assert IPSet(['10.0.0.0/8']) >= big
+    assert not big <= IPSet(['10.0.0.0/20'])
+    assert not IPSet(['10.0.0.0/20']) >= big
+    assert IPSet(['10.0.0.0/29', '10.0.0.16/29']) <= big
+    assert not IPSet(['10.0.0.0/28']) <= big
+    assert big >= IPSet(['10.0.0.16/30'])
+    assert IPSet() <= big
+    assert big >= IPSet()
+    assert not big <= IPSet()
+
+
+def test_ipset_in_place_operators():
+    s1 = IPSet(['192.0.2.0/24', '198.51.100.0/24', '2001:db8::/32'])
+    s2 = IPSet(['192.0.2.128/25', '203.0.113.0/24', '2001:db8::/48'])
+
+    s = s1.copy()
+    ref = s
+    s |= s2
+    assert s is ref
+    assert s == s1 | s2
+
+    s = s1.copy()
+    s &= s2
+    assert s is not s1 and s == IPSet(['192.0.2.128/25', '2001:db8::/48'])
+
+    s = s1.copy()
+    s -= s2
+    assert s == s1 - s2
+    assert '192.0.2.200' not in s
+
+    s = s1.copy()
+    s ^= s2
+    assert s == s1 ^ s2
+
+    #   Operands are left unchanged.
+    assert s2 == IPSet(['192.0.2.128/25', '203.0.113.0/24', '2001:db8::/48'])
+
+
+def test_ipset_update_methods():
+    s = IPSet(['192.0.2.0/24'])
+    s.intersection_update(['192.0.2.0/26', '10.0.0.0/8'])
+    assert s == IPSet(['192.0.2.0/26'])
+
+    s.symmetric_difference_update(['192.0.2.64/26'])
+    assert s == IPSet(['192.0.2.0/25'])
+
+    s.difference_update(IPSet(['192.0.2.0/26']))
+    assert s == IPSet(['192.0.2.64/26'])
+    assert s.size == 64
+
+
+def test_ipset_in_place_operators_with_very_unequal_sizes():
+    rng = random.Random(46)
+    big = IPSet([IPNetwork((167772160 + rng.getrandbits(16) * 4, 30))
+        for _ in range(2000)])
+    small = IPSet([list(big.iter_cidrs())[7].next(),
+        list(big.iter_cidrs())[8], '10.0.0.0/20', '11.0.0.0/30'])
+
+    for a, b in ((big, small), (small, big)):
+        for op, in_place_op in (('__and__', '__iand__'),
+                                ('__sub__', '__isub__'),
+                                ('__xor__', '__ixor__')):
+            result = a.copy()
+            getattr(result, in_place_op)(b)
+            expected = getattr(a, op)(b)
+            assert result == expected
+            assert result.size == expected.size
+            assert result == IPSet(result.iter_cidrs())
+
+
+def test_ipset_remove_iprange_keeps_find_free_index():
+    s = IPSet(['10.0.0.0/16'])
+    assert s.find_free(24, '10.0.0.0/8') == IPNetwork('10.1.0.0/24')
+    s.remove(IPRange('10.0.0.0', '10.0.1.255'))
+    assert s == IPSet(['10.0.2.0/23', '10.0.4.0/22', '10.0.8.0/21',
+        '10.0.16.0/20', '10.0.32.0/19', '10.0.64.0/18', '10.0.128.0/17'])
+    assert s.find_free(23, '10.0.0.0/8') == IPNetwork('10.0.0.0/23')
+
+
+def test_ipset_builder():
+    builder = IPSetBuilder(['192.0.2.1', 0xc0000202, IPAddress('192.0.2.3')])
+    builder.append('192.0.2.0')
+    builder.extend(['10.0.0.5/30', IPNetwork('10.0.0.4/31'),
+        IPRange('10.0.0.8', '10.0.0.9'), '::1', 2 ** 40, '192.0.2.1'])
+    assert len(builder) == 10
+    ipset = builder.build()
+    assert ipset == IPSet(['192.0.2.0/30', '10.0.0.4/30', '10.0.0.8/31',
+        '::1', '::100:0:0'])
+    assert ipset.iter_cidrs() == [IPNetwork('10.0.0.4/30'),
+        IPNetwork('10.0.0.8/31'), IPNetwork('192.0.2.0/30'),
+        IPNetwork('::1/128'), IPNetwork('::100:0:0/128')]
+
+    #   The builder can be reused after building.
+    builder.append('192.0.2.4')
+    assert IPNetwork('192.0.2.4/32') in builder.build().iter_cidrs()
+    builder.clear()
+    assert len(builder) == 0
+    assert builder.build() == IPSet()
+
+    with pytest.raises(AddrFormatError):
+        builder.append('192.0.2.300')
+    with pytest.raises(AddrFormatError):
+        builder.append(-1)
+
+
+def test_ipset_builder_matches_ipset():
+    rng = random.Random(48)
+    addrs = [rng.getrandbits(12) | 0x0a000000 for _ in range(5000)]
+    addrs += ['10.0.%d.0/%d' % (rng.randint(0, 15), rng.randint(22, 28))
+        for _ in range(20)]
+    addrs += [IPAddress(rng.getrandbits(8), 6) for _ in range(300)]
+    #   Strings are parsed by IPNetwork's rules, not IPAddress's.
+    addrs += ['010.1.2.3', '10', '192.168', ' 10.0.0.7', '10.0.0.8 ',
+        '010.000.001.002', '10.0.2', '10.0.3.0/255.255.255.0', '::ffff:1']
+    for octets in [rng.sample(range(256), 4) for _ in range(100)]:
+        addrs.append('%03d.%03d.%03d.%03d' % tuple(octets))
+        addrs.append('%d.%d' % tuple(octets[:2]))
+    ipset = IPSetBuilder(addrs).build()
+    assert ipset == IPSet(addrs)
+    assert ipset.iter_cidrs() == IPSet(addrs).iter_cidrs()
+    assert IPSetBuilder(addrs, flags=ZEROFILL).build() == IPSet(addrs,
+        flags=ZEROFILL)
+
+    for addr in ['167772161', '10.0.0.256', '10.0.0.0 0.0.0.255']:
+        with pytest.raises(AddrFormatError):
+            IPSet([addr])
+        with pytest.raises(AddrFormatError):
+            IPSetBuilder([addr])
+
+
+def test_ipset_builder_count_after_error():
+    builder = IPSetBuilder()
+    with pytest.raises(AddrFormatError):
+        builder.extend([1, 2, '192.0.2.1', 'bogus', 3])
+    assert len(builder) == 3
+    assert builder.build() == IPSet(['0.0.0.1', '0.0.0.2', '192.0.2.1'])
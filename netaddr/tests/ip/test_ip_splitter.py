@@ -72,3 +72,13 @@ def test_ip_splitter_remove_prefix_larger_than_input_range():
     assert s.available_subnets() == [IPNetwork('172.24.0.0/16')]
     assert s.extract_subnet(15, count=1) == []
     assert s.available_subnets() == [IPNetwork('172.24.0.0/16')]
+
+
+def test_ip_splitter_remove_subnet():
+    s = SubnetSplitter('172.24.0.0/16')
+    s.remove_subnet('172.24.0.0/17')
+    assert s.available_subnets() == [IPNetwork('172.24.128.0/17')]
+    with pytest.raises(KeyError):
+        s.remove_subnet('172.24.0.0/24')
+    with pytest.raises(KeyError):
+        s.remove_subnet('10.0.0.0/8')
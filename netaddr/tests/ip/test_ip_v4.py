@@ -1,10 +1,10 @@
 import pickle
-import types
 import random
 
 import pytest
 
 from netaddr import IPAddress, IPNetwork, INET_PTON, AddrFormatError, ZEROFILL, Z, P, NOHOST
+from netaddr.ip import AddressView
 
 
 def test_ipaddress_v4():
@@ -93,7 +93,7 @@ def test_ipnetwork_index_operations_v4():
 def test_ipnetwork_slice_operations_v4():
     ip = IPNetwork('192.0.2.16/29')
 
-    assert isinstance(ip[0:4], types.GeneratorType)
+    assert isinstance(ip[0:4], AddressView)
 
     assert list(ip[0:4]) == [
         IPAddress('192.0.2.16'),
@@ -61,8 +61,29 @@ def test_ipnetwork_slice_v6():
     assert ip[-1] == IPAddress('febf:ffff:ffff:ffff:ffff:ffff:ffff:ffff')
     assert ip.size == 332306998946228968225951765070086144
 
-    with pytest.raises(TypeError):
-        list(ip[0:5:1])
+    assert list(ip[0:5:2]) == [
+        IPAddress('fe80::'),
+        IPAddress('fe80::2'),
+        IPAddress('fe80::4'),
+    ]
+
+    tail = ip[-3:]
+    assert len(tail) == 3
+    assert list(tail.iter_ints()) == [ip.last - 2, ip.last - 1, ip.last]
+    assert IPAddress('febf:ffff:ffff:ffff:ffff:ffff:ffff:fffe') in tail
+    assert IPAddress('fe80::') not in tail
+
+    evens = ip[::2]
+    assert evens.size == ip.size // 2
+    assert evens[-1] == IPAddress('febf:ffff:ffff:ffff:ffff:ffff:ffff:fffe')
+    assert evens.index(IPAddress('fe80::1:0')) == 0x8000
+    assert IPAddress('fe80::1') not in evens
+
+    backwards = ip[:-4:-1]
+    assert list(backwards) == list(reversed(tail))
+    assert list(ip[-(2 ** 200):2]) == [IPAddress('fe80::'),
+        IPAddress('fe80::1')]
+    assert ip[2 ** 200:].size == 0
 
 
 def test_ip_network_membership_v6():
@@ -1,5 +1,7 @@
 import types
 
+import pytest
+
 from netaddr import IPNetwork, cidr_merge
 
 def test_ipnetwork_cidr_merge():
@@ -79,3 +81,77 @@ def test_supernetting():
         IPNetwork('192.0.2.112/30'),
         IPNetwork('192.0.2.114/31'),
     ]
+
+
+def test_subnetting_prefix_larger_than_network():
+    assert list(IPNetwork('172.24.0.0/16').subnet(15)) == []
+
+
+def test_subnet_view_v4():
+    ip = IPNetwork('172.24.0.0/23')
+    view = ip.subnet_view(28)
+
+    assert len(view) == 32
+    assert view.size == 32
+    assert view.prefixlen == 28
+    assert list(view) == list(ip.subnet(28))
+    assert list(reversed(view)) == list(ip.subnet(28))[::-1]
+
+    assert view[0] == IPNetwork('172.24.0.0/28')
+    assert view[17] == IPNetwork('172.24.1.16/28')
+    assert view[-1] == IPNetwork('172.24.1.240/28')
+
+    with pytest.raises(IndexError):
+        view[32]
+
+    with pytest.raises(IndexError):
+        view[-33]
+
+    assert view.index(IPNetwork('172.24.1.16/28')) == 17
+    assert view.index('172.24.0.32/28') == 2
+    assert IPNetwork('172.24.0.32/28') in view
+    assert IPNetwork('172.24.0.32/27') not in view
+    assert IPNetwork('172.24.2.0/28') not in view
+    assert IPNetwork('::/28') not in view
+
+    with pytest.raises(ValueError):
+        view.index('172.24.2.0/28')
+
+
+def test_subnet_view_slicing():
+    view = IPNetwork('192.0.2.0/24').subnet_view(28)
+
+    evens = view[::2]
+    assert len(evens) == 8
+    assert list(evens) == [view[i] for i in range(0, 16, 2)]
+    assert evens.index('192.0.2.64/28') == 2
+    assert '192.0.2.16/28' not in evens
+
+    nested = evens[1:5][::-1]
+    assert list(nested) == [
+        IPNetwork('192.0.2.128/28'),
+        IPNetwork('192.0.2.96/28'),
+        IPNetwork('192.0.2.64/28'),
+        IPNetwork('192.0.2.32/28'),
+    ]
+    assert nested.index('192.0.2.96/28') == 1
+
+    assert list(view[5:2]) == []
+    assert not view[5:2]
+
+
+def test_subnet_view_v6_large():
+    view = IPNetwork('2001:db8::/32').subnet_view(64)
+
+    assert view.size == 2 ** 32
+    assert view[0] == IPNetwork('2001:db8::/64')
+    assert view[-1] == IPNetwork('2001:db8:ffff:ffff::/64')
+    assert view[2 ** 31] == IPNetwork('2001:db8:8000::/64')
+    assert view.index('2001:db8:1234:5678::/64') == 0x12345678
+    assert view[1000:][::1000].index('2001:db8:0:7d0::/64') == 1
+
+    assert IPNetwork('2001:db8::/64').subnet_view(64)[0] == IPNetwork('2001:db8::/64')
+    assert IPNetwork('2001:db8::/64').subnet_view(48).size == 0
+
+    with pytest.raises(ValueError):
+        IPNetwork('2001:db8::/64').subnet_view(129)
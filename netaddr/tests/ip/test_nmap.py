@@ -1,5 +1,6 @@
 import pytest
-from netaddr import valid_nmap_range, iter_nmap_range, IPAddress, AddrFormatError
+from netaddr import (valid_nmap_range, iter_nmap_range, IPAddress, IPNetwork,
+    IPSet, NmapTarget, AddrFormatError)
 
 
 def test_valid_nmap_range_with_valid_target_specs():
@@ -84,3 +85,54 @@ def test_iter_nmap_range_invalid():
 
 def test_iter_nmap_range_remove_duplicates():
     assert list(iter_nmap_range('10.0.0.42,42-42')) == [IPAddress('10.0.0.42')]
+
+
+def test_nmap_target_size_and_iteration():
+    target = NmapTarget('192.168.3-5,7.1-3,10')
+    assert target.version == 4
+    assert target.size == 16
+    assert len(target) == 16
+    assert list(target) == list(iter_nmap_range('192.168.3-5,7.1-3,10'))
+    assert list(target.iter_ints()) == [int(ip) for ip in target]
+
+    assert NmapTarget('0-255.0-255.0-255.0-255').size == 2 ** 32
+    assert NmapTarget('10.0.0.0/8').size == 2 ** 24
+    assert NmapTarget('fe80::1').size == 1
+    assert list(NmapTarget('fe80::1')) == [IPAddress('fe80::1')]
+    assert repr(NmapTarget('10.0.0.1-2')) == "NmapTarget('10.0.0.1-2')"
+
+
+def test_nmap_target_membership():
+    target = NmapTarget('10.1-3,200.0-255.7-9')
+    assert '10.2.99.8' in target
+    assert IPAddress('10.200.0.7') in target
+    assert int(IPAddress('10.3.255.9')) in target
+    assert '10.4.0.8' not in target
+    assert '10.2.0.6' not in target
+    assert '11.2.0.8' not in target
+    assert 'fe80::1' not in target
+
+    assert '192.0.2.77' in NmapTarget('192.0.2.0/25')
+    assert '192.0.2.200' not in NmapTarget('192.0.2.0/25')
+    assert 'fe80::1' in NmapTarget('fe80::1')
+    assert 'fe80::2' not in NmapTarget('fe80::1')
+
+
+def test_nmap_target_cidrs():
+    assert NmapTarget('192.0.2.0-255').cidrs() == [IPNetwork('192.0.2.0/24')]
+    assert NmapTarget('10.0-255.0-255.0-255').cidrs() == [IPNetwork('10.0.0.0/8')]
+    assert NmapTarget('10,11.0-255.0-255.0-255').cidrs() == [IPNetwork('10.0.0.0/7')]
+    assert NmapTarget('192.0.2.1-3,10').cidrs() == [
+        IPNetwork('192.0.2.1/32'),
+        IPNetwork('192.0.2.2/31'),
+        IPNetwork('192.0.2.10/32'),
+    ]
+    assert NmapTarget('10.0.0-1.0-127').cidrs() == [
+        IPNetwork('10.0.0.0/25'),
+        IPNetwork('10.0.1.0/25'),
+    ]
+    assert NmapTarget('192.0.2.0/24').cidrs() == [IPNetwork('192.0.2.0/24')]
+
+    target = NmapTarget('172.16-17.4,6.0-63')
+    assert target.ipset() == IPSet(list(target))
+    assert target.ipset().size == target.size
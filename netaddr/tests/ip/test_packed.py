@@ -0,0 +1,121 @@
+import array
+import random
+import struct
+
+import pytest
+
+from netaddr import IPAddress
+from netaddr.ip.packed import from_packed_buffer, to_packed_buffer
+
+
+def test_from_packed_buffer_ipv4():
+    buf = struct.pack('>3I', 0xc0000201, 0xc0000202, 0xffffffff)
+    view = from_packed_buffer(buf, 4)
+    assert len(view) == 3
+    assert view.version == 4
+    assert view.stride == 4
+    assert list(view) == [IPAddress('192.0.2.1'), IPAddress('192.0.2.2'),
+        IPAddress('255.255.255.255')]
+    assert view[0] == IPAddress('192.0.2.1')
+    assert view[-1] == IPAddress('255.255.255.255')
+    assert view.ints() == [0xc0000201, 0xc0000202, 0xffffffff]
+    assert list(view.iter_ints()) == view.ints()
+    with pytest.raises(IndexError):
+        view[3]
+
+
+def test_from_packed_buffer_ipv6():
+    values = [0, 1, (1 << 128) - 1, 0x20010db8 << 96 | 0xdeadbeef]
+    buf = b''.join([struct.pack('>QQ', v >> 64, v & ((1 << 64) - 1))
+        for v in values])
+    view = from_packed_buffer(bytearray(buf), 6)
+    assert view.ints() == values
+    assert view[3] == IPAddress('2001:db8::dead:beef')
+    assert view[3].version == 6
+
+
+def test_from_packed_buffer_stride_offset_and_count():
+    #   NetFlow-like records: a 2 byte header, then 4 byte source address,
+    #   4 byte destination address and 2 byte port per record.
+    records = [(0x0a000001 + i, 0xc0000200 + i, 1000 + i) for i in range(5)]
+    buf = b'\xff\xff' + b''.join([struct.pack('>IIH', *rec)
+        for rec in records])
+    sources = from_packed_buffer(buf, 4, stride=10, offset=2)
+    destinations = from_packed_buffer(buf, 4, stride=10, offset=6)
+    assert sources.ints() == [rec[0] for rec in records]
+    assert destinations.ints() == [rec[1] for rec in records]
+    assert len(from_packed_buffer(buf, 4, stride=10, offset=2, count=2)) == 2
+    with pytest.raises(ValueError):
+        from_packed_buffer(buf, 4, stride=10, offset=2, count=6)
+
+
+def test_from_packed_buffer_memoryview_and_array():
+    values = [0xc0000201, 0x7f000001]
+    buf = bytearray(struct.pack('>2I', *values))
+    assert from_packed_buffer(memoryview(buf), 4).ints() == values
+    assert from_packed_buffer(array.array('B', buf), 4).ints() == values
+    #   Buffers with items wider than one byte are read bytewise too.
+    assert from_packed_buffer(array.array('H', bytes(buf)), 4).ints() \
+        == values
+
+
+def test_from_packed_buffer_partial_and_empty():
+    assert len(from_packed_buffer(b'', 4)) == 0
+    assert len(from_packed_buffer(b'\x00' * 7, 4)) == 1
+    assert len(from_packed_buffer(b'\x00' * 15, 6)) == 0
+
+
+def test_from_packed_buffer_invalid_arguments():
+    with pytest.raises(ValueError):
+        from_packed_buffer(b'', 5)
+    with pytest.raises(ValueError):
+        from_packed_buffer(b'', 6, stride=8)
+    with pytest.raises(ValueError):
+        from_packed_buffer(b'', 4, offset=-1)
+
+
+def test_to_packed_buffer():
+    buf = to_packed_buffer([IPAddress('192.0.2.1'), 0x7f000001,
+        '10.0.0.1'], 4)
+    assert isinstance(buf, bytearray)
+    assert bytes(buf) == struct.pack('>3I', 0xc0000201, 0x7f000001,
+        0x0a000001)
+    assert to_packed_buffer([], 6) == bytearray()
+
+    buf = to_packed_buffer(['::1', '2001:db8::'], 6, stride=20, offset=1)
+    assert len(buf) == 1 + 20 + 16
+    assert from_packed_buffer(buf, 6, stride=20, offset=1).ints() == [
+        1, 0x20010db8 << 96]
+
+
+def test_to_packed_buffer_existing_buffer_keeps_other_fields():
+    buf = bytearray(b'\xaa' * 24)
+    to_packed_buffer(iter(['192.0.2.1', '192.0.2.2']), 4, stride=8,
+        buf=buf, offset=2)
+    assert bytes(buf) == (b'\xaa\xaa\xc0\x00\x02\x01' + b'\xaa' * 4
+        + b'\xc0\x00\x02\x02' + b'\xaa' * 10)
+
+    with pytest.raises(ValueError):
+        to_packed_buffer(['::1', '::2'], 6, buf=bytearray(31))
+
+
+def test_to_packed_buffer_invalid_addresses():
+    with pytest.raises(ValueError):
+        to_packed_buffer([1 << 32], 4)
+    with pytest.raises(ValueError):
+        to_packed_buffer([-1], 6)
+    with pytest.raises(ValueError):
+        to_packed_buffer([IPAddress('::1')], 4)
+
+
+@pytest.mark.parametrize('version', [4, 6])
+def test_packed_buffer_round_trip(version):
+    rng = random.Random(version)
+    bits = 32 if version == 4 else 128
+    values = [rng.getrandbits(bits) for _ in range(3000)]
+    for stride in (None, bits // 8 + 3):
+        buf = to_packed_buffer(values, version, stride=stride)
+        view = from_packed_buffer(buf, version, stride=stride)
+        assert view.ints() == values
+        assert [int(addr) for addr in view] == values
+        assert int(view[2500]) == values[2500]
@@ -0,0 +1,90 @@
+import pytest
+
+from netaddr import IPAddress, IPNetwork, AddrFormatError, ZEROFILL, NOHOST
+from netaddr.ip import cache
+from netaddr.ip.cache import (ParseCache, enable_parse_cache,
+    disable_parse_cache, clear_parse_cache, parse_cache_info)
+
+
+@pytest.fixture
+def parse_cache():
+    enable_parse_cache(maxsize=4)
+    yield cache.PARSE_CACHE
+    disable_parse_cache()
+
+
+def test_parse_cache_disabled_by_default():
+    assert cache.PARSE_CACHE is None
+    assert parse_cache_info() is None
+    clear_parse_cache()
+
+
+def test_parse_cache_ipnetwork(parse_cache):
+    net1 = IPNetwork('192.0.2.1/24')
+    net2 = IPNetwork('192.0.2.1/24')
+    assert net1 == net2
+    assert net1 is not net2
+    net2.prefixlen = 16
+    assert IPNetwork('192.0.2.1/24').prefixlen == 24
+
+    info = parse_cache_info()
+    assert info['hits'] == 2
+    assert info['misses'] == 1
+    assert info['size'] == 1
+    assert info['maxsize'] == 4
+    assert info['hit_rate'] == pytest.approx(2 / 3.0)
+
+    #   Flags, version and implicit_prefix are part of the key.
+    assert IPNetwork('192.0.2.1/24', flags=NOHOST) == IPNetwork('192.0.2.0/24')
+    assert IPNetwork('192.0.2.1/24', flags=NOHOST).value == IPAddress('192.0.2.0').value
+    assert IPNetwork('10', implicit_prefix=True) == IPNetwork('10.0.0.0/8')
+    assert IPNetwork('10') == IPNetwork('10.0.0.0/32')
+
+    with pytest.raises(AddrFormatError):
+        IPNetwork('192.0.2.0/33')
+    with pytest.raises(AddrFormatError):
+        IPNetwork('192.0.2.0/33')
+
+
+def test_parse_cache_ipaddress(parse_cache):
+    assert IPAddress('192.0.2.1') == IPAddress('192.0.2.1')
+    assert IPAddress('::1').version == 6
+    assert IPAddress('::1', 6) == IPAddress('::1')
+    assert IPAddress('010.0.0.1') == IPAddress('8.0.0.1')
+    assert IPAddress('010.0.0.1', flags=ZEROFILL) == IPAddress('10.0.0.1')
+    with pytest.raises(AddrFormatError):
+        IPAddress('::1', 4)
+    assert parse_cache_info()['hits'] >= 1
+
+
+def test_parse_cache_eviction_is_lru():
+    lru = ParseCache(2)
+    lru.put('a', 1)
+    lru.put('b', 2)
+    assert lru.get('a') == 1
+    lru.put('c', 3)
+    assert lru.get('b') is None
+    assert lru.get('a') == 1
+    assert lru.get('c') == 3
+    assert len(lru) == 2
+    assert lru.info()['hits'] == 3
+    assert lru.info()['misses'] == 1
+
+    lru.clear()
+    assert len(lru) == 0
+    assert lru.info()['hit_rate'] == 0.0
+
+    with pytest.raises(ValueError):
+        ParseCache(0)
+
+
+def test_parse_cache_clear_and_disable(parse_cache):
+    for i in range(10):
+        IPNetwork('192.0.2.%d/32' % i)
+    assert parse_cache_info()['size'] == 4
+    clear_parse_cache()
+    assert parse_cache_info()['size'] == 0
+    assert parse_cache_info()['misses'] == 0
+    disable_parse_cache()
+    assert parse_cache_info() is None
+    assert IPNetwork('192.0.2.0/24').size == 256
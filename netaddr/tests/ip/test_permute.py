@@ -0,0 +1,91 @@
+import pytest
+
+from netaddr import IPAddress, IPNetwork, IPRange, IPSet
+from netaddr.ip.permute import KeyedPermutation, PermutedIterator
+
+
+def test_keyed_permutation_is_a_permutation():
+    for size in (0, 1, 2, 3, 7, 64, 100, 1000):
+        for key in (0, 1, 12345, 2 ** 80 + 3):
+            assert sorted(KeyedPermutation(size, key)) == list(range(size))
+
+
+def test_keyed_permutation_depends_on_key():
+    assert list(KeyedPermutation(100, 1)) == list(KeyedPermutation(100, 1))
+    assert list(KeyedPermutation(100, 1)) != list(KeyedPermutation(100, 2))
+    assert list(KeyedPermutation(100, 1)) != list(range(100))
+
+    perm = KeyedPermutation(10, 7)
+    assert len(perm) == 10
+    assert perm.size == 10
+    assert perm.key == 7
+    assert repr(perm) == 'KeyedPermutation(10, key=7)'
+
+    with pytest.raises(IndexError):
+        perm[10]
+    with pytest.raises(ValueError):
+        KeyedPermutation(-1)
+    with pytest.raises(ValueError):
+        KeyedPermutation(10, -1)
+
+    assert KeyedPermutation(10).key >= 0
+
+
+def test_keyed_permutation_huge():
+    perm = KeyedPermutation(2 ** 128, 99)
+    values = [perm[i] for i in range(1000)]
+    assert len(set(values)) == 1000
+    assert all(0 <= value < 2 ** 128 for value in values)
+
+
+def test_ipnetwork_iter_permuted():
+    net = IPNetwork('192.0.2.0/24')
+    addrs = list(net.iter_permuted(key=42))
+    assert sorted(addrs) == list(net)
+    assert addrs != list(net)
+    assert addrs == list(net.iter_permuted(key=42))
+
+    rng = IPRange('192.0.2.10', '192.0.2.20')
+    addrs = list(rng.iter_permuted(key=1))
+    assert sorted(addrs) == list(rng)
+
+    addrs = list(IPNetwork('2001:db8::/120').iter_permuted(key=3))
+    assert sorted(addrs) == list(IPNetwork('2001:db8::/120'))
+
+    it = IPNetwork('2001:db8::/32').iter_permuted(key=5)
+    first = [next(it) for _ in range(100)]
+    assert len(set(first)) == 100
+    assert all(addr in IPNetwork('2001:db8::/32') for addr in first)
+
+
+def test_iter_permuted_resume():
+    net = IPNetwork('10.0.0.0/26')
+    it = net.iter_permuted()
+    assert isinstance(it, PermutedIterator)
+    head = [next(it) for _ in range(20)]
+    assert it.position == 20
+
+    resumed = net.iter_permuted(key=it.key, start=it.position)
+    tail = list(resumed)
+    assert resumed.position == 64
+    assert sorted(head + tail) == list(net)
+    assert head + tail == list(net.iter_permuted(key=it.key))
+
+    with pytest.raises(ValueError):
+        net.iter_permuted(key=1, start=65)
+    assert list(net.iter_permuted(key=1, start=64)) == []
+
+
+def test_ipset_iter_permuted():
+    s = IPSet(['192.0.2.0/28', '10.0.0.1', '2001:db8::/124', '198.51.100.0/30'])
+    addrs = list(s.iter_permuted(key=11))
+    assert len(addrs) == s.size
+    assert sorted(addrs) == list(s)
+    assert addrs[:10] != list(s)[:10]
+
+    it = s.iter_permuted(key=11, start=10)
+    assert list(it) == addrs[10:]
+    assert repr(it) == '<PermutedIterator key=11 position=37 of 37>'
+
+    assert list(IPSet().iter_permuted(key=1)) == []
+    assert IPAddress('10.0.0.1') in addrs
@@ -0,0 +1,153 @@
+import json
+import random
+
+import pytest
+
+from netaddr import IPNetwork, IPSet
+from netaddr.contrib.subnet_allocator import SubnetAllocator
+
+
+def test_subnet_allocator_allocate_and_free():
+    allocator = SubnetAllocator('192.0.2.0/24')
+    assert allocator.base == IPNetwork('192.0.2.0/24')
+    assert allocator.available_subnets() == [IPNetwork('192.0.2.0/24')]
+
+    assert allocator.allocate(26) == IPNetwork('192.0.2.0/26')
+    assert allocator.allocate(28) == IPNetwork('192.0.2.64/28')
+    assert allocator.allocate(26) == IPNetwork('192.0.2.128/26')
+    assert allocator.available_subnets() == [
+        IPNetwork('192.0.2.80/28'),
+        IPNetwork('192.0.2.96/27'),
+        IPNetwork('192.0.2.192/26'),
+    ]
+    assert allocator.free_size == 16 + 32 + 64
+
+    allocator.free('192.0.2.64/28')
+    assert allocator.available_subnets() == [
+        IPNetwork('192.0.2.64/26'),
+        IPNetwork('192.0.2.192/26'),
+    ]
+
+    allocator.free('192.0.2.0/26')
+    allocator.free('192.0.2.128/26')
+    assert allocator.available_subnets() == [IPNetwork('192.0.2.0/24')]
+    assert allocator.allocated_subnets() == []
+
+
+def test_subnet_allocator_errors():
+    allocator = SubnetAllocator('192.0.2.0/30')
+    with pytest.raises(ValueError):
+        allocator.allocate(29)
+    with pytest.raises(ValueError):
+        allocator.allocate(33)
+
+    for _ in range(4):
+        allocator.allocate(32)
+    with pytest.raises(ValueError):
+        allocator.allocate(32)
+
+    with pytest.raises(ValueError):
+        allocator.free('192.0.2.0/31')
+    with pytest.raises(ValueError):
+        allocator.free('10.0.0.0/32')
+    with pytest.raises(ValueError):
+        allocator.allocate_specific('192.0.2.1/32')
+    with pytest.raises(ValueError):
+        allocator.allocate_specific('192.0.3.0/32')
+
+
+def test_subnet_allocator_allocate_specific():
+    allocator = SubnetAllocator('2001:db8::/32')
+    assert allocator.allocate_specific('2001:db8:1234::/48') == IPNetwork('2001:db8:1234::/48')
+    with pytest.raises(ValueError):
+        allocator.allocate_specific('2001:db8:1234:5678::/64')
+    with pytest.raises(ValueError):
+        allocator.allocate_specific('2001:db8:1200::/40')
+
+    #   The smallest free block is preferred over the lowest address.
+    assert allocator.allocate(48) == IPNetwork('2001:db8:1235::/48')
+    assert allocator.free_size == 2 ** 96 - 2 * 2 ** 80
+    assert len(allocator.available_subnets()) == 48 - 32 - 1
+
+    allocator.free('2001:db8:1234::/48')
+    allocator.free('2001:db8:1235::/48')
+    assert allocator.available_subnets() == [IPNetwork('2001:db8::/32')]
+
+
+def test_subnet_allocator_allocate_many():
+    allocator = SubnetAllocator('10.0.0.0/16')
+    assert allocator.allocate(24) == IPNetwork('10.0.0.0/24')
+    assert allocator.allocate_many(28, count=3) == [
+        IPNetwork('10.0.1.0/28'),
+        IPNetwork('10.0.1.16/28'),
+        IPNetwork('10.0.1.32/28'),
+    ]
+    assert allocator.available_subnets() == [
+        IPNetwork('10.0.1.48/28'),
+        IPNetwork('10.0.1.64/26'),
+        IPNetwork('10.0.1.128/25'),
+        IPNetwork('10.0.2.0/23'),
+        IPNetwork('10.0.4.0/22'),
+        IPNetwork('10.0.8.0/21'),
+        IPNetwork('10.0.16.0/20'),
+        IPNetwork('10.0.32.0/19'),
+        IPNetwork('10.0.64.0/18'),
+        IPNetwork('10.0.128.0/17'),
+    ]
+
+    #   Without a count, the whole smallest free block is split up.
+    assert allocator.allocate_many(30) == [
+        IPNetwork('10.0.1.48/30'),
+        IPNetwork('10.0.1.52/30'),
+        IPNetwork('10.0.1.56/30'),
+        IPNetwork('10.0.1.60/30'),
+    ]
+
+    with pytest.raises(ValueError):
+        allocator.allocate_many(17, count=2)
+    with pytest.raises(ValueError):
+        allocator.allocate_many(24, count=0)
+    with pytest.raises(ValueError):
+        allocator.allocate_many(15)
+
+    for subnet in allocator.allocated_subnets():
+        allocator.free(subnet)
+    assert allocator.available_subnets() == [IPNetwork('10.0.0.0/16')]
+
+
+def test_subnet_allocator_random_operations():
+    rng = random.Random(42)
+    allocator = SubnetAllocator('10.0.0.0/16')
+    allocated = []
+    for _ in range(500):
+        if allocated and rng.random() < 0.4:
+            allocator.free(allocated.pop(rng.randrange(len(allocated))))
+        else:
+            try:
+                allocated.append(allocator.allocate(rng.randint(20, 30)))
+            except ValueError:
+                pass
+
+        assert sorted(allocated) == allocator.allocated_subnets()
+        free = IPSet(allocator.available_subnets())
+        assert free.isdisjoint(IPSet(allocated))
+        assert (free | IPSet(allocated)) == IPSet(['10.0.0.0/16'])
+
+    for subnet in allocated:
+        allocator.free(subnet)
+    assert allocator.available_subnets() == [IPNetwork('10.0.0.0/16')]
+
+
+def test_subnet_allocator_snapshot_and_restore():
+    allocator = SubnetAllocator('10.0.0.0/8')
+    allocator.allocate(16)
+    allocator.allocate(24)
+    allocator.allocate_specific('10.128.0.0/9')
+
+    snapshot = json.loads(json.dumps(allocator.snapshot()))
+    restored = SubnetAllocator.restore(snapshot)
+
+    assert restored.base == allocator.base
+    assert restored.allocated_subnets() == allocator.allocated_subnets()
+    assert restored.available_subnets() == allocator.available_subnets()
+    assert restored.allocate(24) == allocator.allocate(24)
@@ -2,7 +2,7 @@ import sys
 
 import pytest
 
-from netaddr import INET_PTON, AddrFormatError
+from netaddr import INET_PTON, ZEROFILL, AddrFormatError
 from netaddr.strategy import ipv4
 
 
@@ -81,3 +81,28 @@ def test_strategy_inet_pton_behaviour():
         ipv4.str_to_int('0177.1', flags=INET_PTON)
 
     assert ipv4.str_to_int('127.0.0.1', flags=INET_PTON) == 2130706433
+
+
+def test_strategy_ipv4_parse_str():
+    assert ipv4.parse_str('192.0.2.1') == 3221225985
+    assert ipv4.parse_str('192.0.2.1', INET_PTON) == 3221225985
+    assert ipv4.parse_str('127.1') == 2130706433
+    assert ipv4.parse_str('0x7f.1') == 2130706433
+    assert ipv4.parse_str('192.0.2.1 trailing') == 3221225985
+    assert ipv4.parse_str('010.000.000.001', ZEROFILL) == 167772161
+
+    for addr in ('', 'foo', '::1', '192.0.2.256', '127.1/8', '192.0.2.1.'):
+        assert ipv4.parse_str(addr) is None
+    for addr in ('127.1', '010.0.0.1', '0x7f.0.0.1', '192.0.2.1 '):
+        assert ipv4.parse_str(addr, INET_PTON) is None
+
+
+def test_strategy_ipv4_parse_partial_str():
+    assert ipv4.parse_partial_str('10') == 167772160
+    assert ipv4.parse_partial_str('10.1') == 167837696
+    assert ipv4.parse_partial_str('192.0.2.1') == 3221225985
+    assert ipv4.parse_partial_str('010.1') == 167837696
+    assert ipv4.parse_partial_str(' 10') == 167772160
+
+    for addr in ('', '10..1', '1.2.3.4.5', '256', 'foo', '::'):
+        assert ipv4.parse_partial_str(addr) is None
@@ -158,3 +158,15 @@ def test_strategy_ipv6_str_to_int_behaviour_legacy_mode():
         ipv6.str_to_int('::0177.1')
 
     assert ipv6.str_to_int('::127.0.0.1') == 2130706433
+
+
+def test_strategy_ipv6_parse_str():
+    assert ipv6.parse_str('::') == 0
+    assert ipv6.parse_str('::1') == 1
+    assert ipv6.parse_str('::ffff:192.0.2.1') == 0xffffc0000201
+    assert ipv6.parse_str('2001:DB8::ffff') == 0x20010db8 << 96 | 0xffff
+    assert ipv6.parse_str('ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff') == ipv6.max_int
+
+    for addr in ('', '192.0.2.1', ':::', '1::2::3', 'fe80::1%eth0',
+            '2001:db8::/32', '::g', ' ::1'):
+        assert ipv6.parse_str(addr) is None
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from netaddr.benchmarks import (run_benchmarks, save_results, load_results,
+    compare_results, format_result)
+from netaddr.benchmarks.suite import BENCHMARKS
+from netaddr.benchmarks.__main__ import main
+
+
+def test_run_benchmarks():
+    names = [name for name, func in BENCHMARKS]
+    results = run_benchmarks(scales=[10], repeat=1)
+    assert results['format'] == 1
+    assert [r['name'] for r in results['results']] == names
+    for result in results['results']:
+        assert result['scale'] == 10
+        assert result['ops'] == 10
+        assert result['seconds'] >= 0
+        assert format_result(result).startswith(result['name'])
+
+    with pytest.raises(ValueError):
+        run_benchmarks(['no_such_benchmark'])
+
+
+def test_benchmark_results_json(tmpdir):
+    path = str(tmpdir.join('results.json'))
+    results = run_benchmarks(['ipset_build', 'ipaddress_parse_ipv4'],
+        scales=[10, 20], repeat=1, memory=False)
+    save_results(results, path)
+    assert load_results(path) == json.loads(json.dumps(results))
+
+    comparison = compare_results(load_results(path), results)
+    assert [(name, scale) for name, scale, old, new, speedup in comparison] == [
+        ('ipaddress_parse_ipv4', 10), ('ipset_build', 10),
+        ('ipaddress_parse_ipv4', 20), ('ipset_build', 20)]
+    assert all(speedup == 1 for name, scale, old, new, speedup in comparison)
+
+    assert main(['-s', '10', '-r', '1', '--no-memory', '-c', path,
+        'ipset_build']) == 0
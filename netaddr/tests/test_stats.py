@@ -0,0 +1,72 @@
+import pytest
+
+from netaddr import IPAddress, IPNetwork, IPRange, IPSet, EUI, OUI, IAB
+import netaddr.stats as stats
+
+
+@pytest.fixture
+def counting():
+    stats.reset()
+    stats.enable()
+    yield stats
+    stats.disable()
+    stats.reset()
+
+
+def test_stats_disabled_by_default():
+    assert not stats.is_enabled()
+    stats.reset()
+    IPAddress('192.0.2.1')
+    IPSet(['192.0.2.0/24'])
+    assert stats.snapshot() == {}
+
+
+def test_stats_ip_counters(counting):
+    IPAddress('192.0.2.1')
+    IPAddress('::1')
+    IPAddress(1)
+    IPNetwork('fe80::/10')
+    IPRange('192.0.2.1', '192.0.2.10')
+
+    IPAddress('192.0.2.1 ::')
+
+    counts = stats.snapshot()['ip']
+    assert counts['version_fallback'] == 1
+    assert counts['IPNetwork'] == 1
+    assert counts['IPRange'] == 1
+    assert counts['IPAddress'] >= 6
+
+    stats.disable()
+    IPAddress('192.0.2.1 ::')
+    assert stats.snapshot()['ip']['version_fallback'] == 1
+
+    stats.reset()
+    assert stats.snapshot() == {}
+
+
+def test_stats_partial_address_fallback(counting):
+    IPNetwork('10/8')
+    assert stats.snapshot()['ip']['partial_address_fallback'] == 1
+
+
+def test_stats_set_compactions(counting):
+    s = IPSet(['192.0.2.0/25'])
+    s.add('192.0.2.128/25')
+    s.update(['198.51.100.0/24'])
+    counts = stats.snapshot()['sets']
+    assert counts['IPSet'] == 1
+    assert counts['compact_single_network'] == 1
+    assert counts['compact'] == 1
+
+
+def test_stats_registry_reads(counting):
+    OUI('00-1B-77')
+    IAB('00-50-C2-00-00-00')
+    EUI('00-1B-77-49-54-FD')
+    counts = stats.snapshot()['eui']
+    assert counts['OUI'] == 1
+    assert counts['IAB'] == 1
+    assert counts['EUI'] == 1
+    assert counts['registry_opens'] == 2
+    assert counts['registry_reads'] >= 2
+    assert counts['registry_bytes'] > 0
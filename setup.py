@@ -27,6 +27,7 @@ packages = [
     'netaddr.eui',
     'netaddr.strategy',
     'netaddr.contrib',
+    'netaddr.benchmarks',
 ]
 
 #   Required by distutils only.